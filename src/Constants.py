@@ -29,6 +29,24 @@ RESERVED_MEMORY = "reserved-memory"
 NUM_OF_NODES = "num-of-nodes"
 TASK_FLAG = True
 MODEL_NAME = 'model-name' 
+POWER_LUT_RESOLUTION = "power-lut-resolution"
+NODE_LEVEL_UTILIZATION = "node-level-utilization"
+SCENARIOS = "scenarios"
+METRICS = "metrics"
+METRIC_INTENSITY = "intensity"
+ONSITE_FACTOR = "onsite-factor"
+
+# TemporalInterrupt Constants
+SHIFT_MODE = "shift-mode"
+INTERRUPT = "interrupt"  # lowest CI slots, overhead charged afterwards
+OPTIMAL = "optimal"  # overhead-aware interruptions
+CONTIGUOUS = "contiguous"  # delay whole workflows
+SPATIAL = "spatial"  # move and delay whole workflows across regions
+FLEXIBILITY = "flexibility"
+DEFAULT_FLEXIBILITY = [6, 12, 24, 48, 96]  # periods of CI data the workflow may run over after its original start
+MAX_INTERRUPTIONS = "max-interruptions"
+REGIONS = "regions"
+WORKERS = "workers"
 
 # FetchCarbonIntensity Constants
 NG_BASE_URL = "https://api.carbonintensity.org.uk/"
@@ -0,0 +1,159 @@
+from dataclasses import dataclass, field
+from typing import Dict, Union
+
+import numpy as np
+
+from src.models.TimeSeries import TimeSeries
+
+@dataclass
+class CarbonIntensitySeries:
+    """Carbon intensity (or any other per-kWh intensity) sampled at a fixed period.
+
+    Value i covers [start_timestamp + i * period, start_timestamp + (i + 1) * period).
+    Periods without data are NaN. Because every period is addressed by its offset
+    from start_timestamp, lookups are O(1) and data may span several years.
+    Prefix sums over the periods give the exact time-weighted mean over any
+    span in O(1) as well (mean_between).
+
+    Attributes:
+      period: Sampling period in ms. Must be > 0.
+      start_timestamp: Start of the first period (epoch ms, UTC).
+      values: float64 array with one intensity value per period.
+    """
+    period: int
+    start_timestamp: int
+    values: np.ndarray
+    _prefix: np.ndarray = field(init=False, repr=False, compare=False, default=None)
+    _gaps: np.ndarray = field(init=False, repr=False, compare=False, default=None)
+
+    def __post_init__(self):
+        if self.period <= 0:
+            raise ValueError("period must be positive")
+        self.values = np.asarray(self.values, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def end_timestamp(self) -> int:
+        """End of the last period (epoch ms, exclusive)."""
+        return self.start_timestamp + len(self.values) * self.period
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the values and, once built, the prefix sums of mean_between."""
+        return sum(array.nbytes for array in (self.values, self._prefix, self._gaps) if array is not None)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Start of every period (epoch ms)."""
+        return self.start_timestamp + np.arange(len(self.values), dtype=np.int64) * self.period
+
+    def index_of(self, ms: Union[int, np.ndarray]) -> Union[int, np.ndarray]:
+        """Index of the period containing ms (may fall outside the series)."""
+        if isinstance(ms, np.ndarray):
+            return (ms.astype(np.int64) - self.start_timestamp) // self.period
+        return (int(ms) - self.start_timestamp) // self.period
+
+    def value_at(self, ms: int) -> float:
+        """Intensity of the period containing ms; raises KeyError if there is no data."""
+        i = self.index_of(ms)
+        if not 0 <= i < len(self.values) or np.isnan(self.values[i]):
+            raise KeyError(f"No intensity value for timestamp {ms}")
+        return float(self.values[i])
+
+    def values_at(self, ms: np.ndarray) -> np.ndarray:
+        """Intensity of the periods containing each timestamp; raises KeyError if any has no data."""
+        i = self.index_of(np.asarray(ms))
+        inside = (i >= 0) & (i < len(self.values))
+        values = self.values[np.where(inside, i, 0)] if len(self.values) else np.full(len(i), np.nan)
+        missing = ~inside | np.isnan(values)
+        if missing.any():
+            raise KeyError(f"No intensity value for timestamp {int(np.asarray(ms)[missing][0])}")
+        return values
+
+    def mean_between(self, start: Union[int, np.ndarray], end: Union[int, np.ndarray]) -> Union[float, np.ndarray]:
+        """Exact time-weighted mean intensity over [start, end), for scalars or arrays.
+
+        Each period contributes in proportion to its overlap with the span; a span
+        within a single period (including an empty one) returns that period's value.
+        Raises KeyError if the span is not fully covered by data. The prefix sums are
+        built on first use, so values must not be modified afterwards.
+        """
+        scalar = np.ndim(start) == 0 and np.ndim(end) == 0
+        start = np.atleast_1d(np.asarray(start, dtype=np.int64))
+        end = np.maximum(np.atleast_1d(np.asarray(end, dtype=np.int64)), start)
+        if not len(self.values):
+            raise KeyError("No intensity values in series")
+        if self._prefix is None:
+            self._build_prefix_sums()
+
+        first = self.index_of(start)
+        last = self.index_of(np.maximum(end - 1, start))
+        inside = (first >= 0) & (last < len(self.values))
+        first_c, last_c = np.where(inside, first, 0), np.where(inside, last, 0)
+        covered = inside & (self._gaps[last_c + 1] == self._gaps[first_c])
+        if not covered.all():
+            raise KeyError(f"No intensity value for span starting at {int(start[~covered][0])}")
+
+        means = self.values[first_c]
+        spans = last_c > first_c
+        if spans.any():
+            means[spans] = (self._integral(end[spans], last_c[spans]) - self._integral(start[spans], first_c[spans])) / (end[spans] - start[spans])
+        return float(means[0]) if scalar else means
+
+    def to_dict(self) -> Dict[str, float]:
+        """Legacy view keyed by 'MM/DD-HH:MM', as returned by parse_ci_intervals.
+
+        Keys carry no year, so for multi-year data later years overwrite earlier ones.
+        """
+        keys = np.datetime_as_string(self.timestamps.astype('datetime64[ms]'), unit='m')
+        return {
+            f"{key[5:7]}/{key[8:10]}-{key[11:16]}": float(value)
+            for key, value in zip(keys.tolist(), self.values.tolist())
+            if value == value
+        }
+
+    def to_time_series(self, ts_type: str = 'ci') -> TimeSeries:
+        return TimeSeries.from_iterable(self.period, self.start_timestamp, self.values.tolist(), ts_type)
+
+    def _build_prefix_sums(self) -> None:
+        """Cumulative intensity (value x ms) and cumulative gap count at every period boundary."""
+        gaps = np.isnan(self.values)
+        self._prefix = np.concatenate(([0.0], np.cumsum(np.where(gaps, 0.0, self.values) * self.period)))
+        self._gaps = np.concatenate(([0], np.cumsum(gaps)))
+
+    def _integral(self, ms: np.ndarray, index: np.ndarray) -> np.ndarray:
+        """Integral of the intensity from start_timestamp up to ms, which lies in period index."""
+        offset = ms - (self.start_timestamp + index * self.period)
+        return self._prefix[index] + offset * self.values[index]
+
+    @staticmethod
+    def constant(value: float, start_timestamp: int, end_timestamp: int, period: int) -> 'CarbonIntensitySeries':
+        """Series holding the same value over [start_timestamp, end_timestamp)."""
+        count = max(0, -(-(end_timestamp - start_timestamp) // period))
+        return CarbonIntensitySeries(period, start_timestamp, np.full(count, float(value)))
+
+    @staticmethod
+    def from_timestamps(timestamps: np.ndarray, values: np.ndarray, period: int = None) -> 'CarbonIntensitySeries':
+        """Build a series from (timestamp, value) samples, e.g. the rows of a CI file.
+
+        The period defaults to the smallest gap between consecutive samples. Missing
+        periods become NaN and duplicate timestamps keep the last value.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        if len(timestamps) == 0:
+            return CarbonIntensitySeries(period or 1, 0, np.empty(0))
+        if period is None:
+            gaps = np.diff(np.unique(timestamps))
+            if len(gaps) == 0:
+                raise ValueError("period is required for a series with a single timestamp")
+            period = int(gaps.min())
+        start = int(timestamps.min())
+        offsets = timestamps - start
+        if np.any(offsets % period):
+            raise ValueError(f"Timestamps are not aligned to a period of {period}ms")
+        series = np.full(int(offsets.max() // period) + 1, np.nan)
+        series[offsets // period] = values
+        return CarbonIntensitySeries(period, start, series)
@@ -0,0 +1,81 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from src.models.IchnosTrace import IchnosTrace
+
+@dataclass(slots=True)
+class ClippedTask:
+    """A lightweight view of an IchnosTrace task clipped to part of its runtime.
+
+    Tasks that cross interval boundaries are represented by a view holding the
+    originating task, its position in the source task list and the clipped
+    start/end, rather than a full copy of the record. All other IchnosTrace fields
+    are read through from the originating task, so the view can be consumed
+    wherever an IchnosTrace is expected. A real IchnosTrace is only built on
+    request through to_ichnos_trace().
+
+    Fields:
+      - task: the originating (unclipped) IchnosTrace record
+      - index: position of the originating task in the source task list
+      - start: clipped start timestamp (same unit as the task)
+      - end: clipped end timestamp (same unit as the task)
+    """
+    task: IchnosTrace
+    index: int
+    start: int
+    end: int
+
+    @property
+    def id(self) -> str:
+        return self.task.id
+
+    @property
+    def name(self) -> str:
+        return self.task.name
+
+    @property
+    def cpu_count(self) -> int:
+        return self.task.cpu_count
+
+    @property
+    def avg_cpu_usage(self) -> float:
+        return self.task.avg_cpu_usage
+
+    @property
+    def cpu_model(self) -> str:
+        return self.task.cpu_model
+
+    @property
+    def memory(self) -> float:
+        return self.task.memory
+
+    @property
+    def hostname(self) -> str:
+        return self.task.hostname
+
+    @property
+    def rapl_timeseries(self) -> Optional[str]:
+        return self.task.rapl_timeseries
+
+    @property
+    def cpu_usage_timeseries(self) -> Optional[str]:
+        return self.task.cpu_usage_timeseries
+
+    def to_ichnos_trace(self) -> IchnosTrace:
+        """Materialize the clipped view as a standalone IchnosTrace record."""
+        return IchnosTrace(
+            id=self.id,
+            name=self.name,
+            start=self.start,
+            end=self.end,
+            cpu_count=self.cpu_count,
+            avg_cpu_usage=self.avg_cpu_usage,
+            cpu_model=self.cpu_model,
+            memory=self.memory,
+            hostname=self.hostname,
+            rapl_timeseries=self.rapl_timeseries,
+            cpu_usage_timeseries=self.cpu_usage_timeseries
+        )
+
+    def to_dict(self) -> dict:
+        return self.to_ichnos_trace().to_dict()
@@ -0,0 +1,32 @@
+from dataclasses import dataclass
+from typing import Union
+
+import numpy as np
+
+from src.utils.MathModels import evaluate_polynomial
+
+@dataclass(frozen=True, eq=False)
+class CompiledPowerModel:
+    """Power model of one node, compiled to polynomial coefficients.
+
+    Calling the model evaluates the dynamic power draw (W) for a utilization (%)
+    or a whole array of utilizations with Horner's method. The static draw is
+    kept separately, as it is only attributed while the node is busy.
+
+    Attributes:
+      node_id: node identifier in the node config
+      model_name: power model name, e.g. 'default_minmax'
+      coefficients: read-only array [a_n, ..., a_0] of the dynamic power model
+      static_watts: static (idle) power draw of the node (W)
+    """
+    node_id: str
+    model_name: str
+    coefficients: np.ndarray
+    static_watts: float
+
+    @property
+    def degree(self) -> int:
+        return len(self.coefficients) - 1
+
+    def __call__(self, utilization: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        return evaluate_polynomial(self.coefficients, utilization)
@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+@dataclass
+class ContiguousShiftResult:
+    """
+    Outcome of moving a whole workflow to a later start without interrupting it.
+
+    Offsets are counted in periods of the carbon intensity series; offset 0 is the
+    original schedule. Offsets for which the intensity data has gaps have a NaN
+    footprint.
+
+    Attributes:
+      best_offset: offset (periods) with the lowest operational carbon
+      best_offset_ms: the same offset in ms
+      best_emissions: operational carbon at the best offset (gCO2e)
+      original_emissions: operational carbon of the original schedule (gCO2e)
+      emissions: operational carbon for every offset 0..max_offset (gCO2e)
+    """
+    best_offset: int
+    best_offset_ms: int
+    best_emissions: float
+    original_emissions: float
+    emissions: np.ndarray
+
+    @property
+    def savings(self) -> np.ndarray:
+        """Savings curve: reduction of operational carbon per offset, in % of the original."""
+        return (self.original_emissions - self.emissions) / self.original_emissions * 100
+
+    @property
+    def best_saving(self) -> float:
+        return (self.original_emissions - self.best_emissions) / self.original_emissions * 100
@@ -1,6 +1,10 @@
 import csv
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional
+
+from src.utils.Compression import open_text
+
+DEFAULT_CHUNK_SIZE = 10000
 
 @dataclass
 class IchnosTrace:
@@ -55,14 +59,15 @@ class IchnosTrace:
         ]
 
     @staticmethod
-    def to_csv(traces: List['IchnosTrace'], filepath: str):
+    def to_csv(traces: List['IchnosTrace'], filepath: str, compression: Optional[str] = None):
+        """Write records to a CSV; compressed when compression ('gz', 'xz', 'bz2') is given or implied by the extension."""
         if not traces:
             # still create an empty file with header for schema visibility
-            with open(filepath, 'w', newline='') as csvfile:
+            with open_text(filepath, 'w', newline='', compression=compression) as csvfile:
                 writer = csv.DictWriter(csvfile, fieldnames=IchnosTrace.fieldnames())
                 writer.writeheader()
             return
-        with open(filepath, 'w', newline='') as csvfile:
+        with open_text(filepath, 'w', newline='', compression=compression) as csvfile:
             writer = csv.DictWriter(csvfile, fieldnames=IchnosTrace.fieldnames())
             writer.writeheader()
             for t in traces:
@@ -71,7 +76,7 @@ class IchnosTrace:
     @staticmethod
     def from_csv(filepath: str) -> List['IchnosTrace']:
         traces: List[IchnosTrace] = []
-        with open(filepath, newline='') as csvfile:
+        with open_text(filepath, newline='') as csvfile:
             reader = csv.DictReader(csvfile)
             for row in reader:
                 if not row.get('id'):
@@ -101,50 +106,94 @@ class IchnosTrace:
         Missing numeric fields default to 0; missing strings to ''.
         """
         traces: List[IchnosTrace] = []
-        with open(filepath, newline='') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                task_id = row.get('id') or row.get('task_id') or row.get('hash')
-                if not task_id:
-                    continue
-                # Prefer explicit process/task header as name; fallback to id
-                name = row.get('process') or row.get('task') or row.get('name') or task_id
-                start = int(row.get('start') or 0)
-                end = int(row.get('complete') or row.get('end') or 0)
-                cpus_raw = row.get('cpus') or row.get('cpu') or 0
-                try:
-                    cpu_count = int(float(cpus_raw))
-                except ValueError:
-                    cpu_count = 0
-                cpu_usage_raw = row.get('%cpu') or row.get('cpu_usage') or row.get('cpuUsage') or 0.0
-                try:
-                    avg_cpu_usage = float(cpu_usage_raw)
-                except ValueError:
-                    avg_cpu_usage = 0.0
-                cpu_model = row.get('cpu_model') or row.get('cpuModel') or ''
-                memory_raw = row.get('memory') or row.get('rss') or 0.0
-                # Nextflow memory may be strings like '123 MB' - attempt to parse numeric prefix
-                if isinstance(memory_raw, str):
-                    mem_tokens = memory_raw.strip().split()
-                    try:
-                        memory_val = float(mem_tokens[0])
-                    except (ValueError, IndexError):
-                        memory_val = 0.0
-                else:
-                    try:
-                        memory_val = float(memory_raw)
-                    except ValueError:
-                        memory_val = 0.0
-                hostname = row.get('hostname') or row.get('host') or row.get('node') or ''
-                traces.append(IchnosTrace(
-                    id=task_id,
-                    name=name or '',
-                    start=start,
-                    end=end,
-                    cpu_count=cpu_count,
-                    avg_cpu_usage=avg_cpu_usage,
-                    cpu_model=cpu_model,
-                    memory=memory_val,
-                    hostname=hostname
-                ))
+        for chunk in iter_nextflow_trace(filepath):
+            traces.extend(chunk)
         return traces
+
+    @staticmethod
+    def from_nextflow_row(row: dict) -> Optional['IchnosTrace']:
+        """Convert one Nextflow trace CSV row (as read by csv.DictReader) into an IchnosTrace.
+
+        Returns None for rows without a task identifier.
+        """
+        task_id = row.get('id') or row.get('task_id') or row.get('hash')
+        if not task_id:
+            return None
+        # Prefer explicit process/task header as name; fallback to id
+        name = row.get('process') or row.get('task') or row.get('name') or task_id
+        start = int(row.get('start') or 0)
+        end = int(row.get('complete') or row.get('end') or 0)
+        cpus_raw = row.get('cpus') or row.get('cpu') or 0
+        try:
+            cpu_count = int(float(cpus_raw))
+        except ValueError:
+            cpu_count = 0
+        cpu_usage_raw = row.get('%cpu') or row.get('cpu_usage') or row.get('cpuUsage') or 0.0
+        try:
+            avg_cpu_usage = float(cpu_usage_raw)
+        except ValueError:
+            avg_cpu_usage = 0.0
+        cpu_model = row.get('cpu_model') or row.get('cpuModel') or ''
+        memory_raw = row.get('memory') or row.get('rss') or 0.0
+        # Nextflow memory may be strings like '123 MB' - attempt to parse numeric prefix
+        if isinstance(memory_raw, str):
+            mem_tokens = memory_raw.strip().split()
+            try:
+                memory_val = float(mem_tokens[0])
+            except (ValueError, IndexError):
+                memory_val = 0.0
+        else:
+            try:
+                memory_val = float(memory_raw)
+            except ValueError:
+                memory_val = 0.0
+        hostname = row.get('hostname') or row.get('host') or row.get('node') or ''
+        return IchnosTrace(
+            id=task_id,
+            name=name or '',
+            start=start,
+            end=end,
+            cpu_count=cpu_count,
+            avg_cpu_usage=avg_cpu_usage,
+            cpu_model=cpu_model,
+            memory=memory_val,
+            hostname=hostname
+        )
+
+    @staticmethod
+    def to_csv_chunks(chunks: Iterable[List['IchnosTrace']], filepath: str, compression: Optional[str] = None) -> int:
+        """Write chunks of records to a CSV as they arrive, so memory stays bounded by one chunk.
+
+        Always writes the header, even when no chunk is produced. Returns the number of rows written.
+        """
+        rows = 0
+        with open_text(filepath, 'w', newline='', compression=compression) as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=IchnosTrace.fieldnames())
+            writer.writeheader()
+            for chunk in chunks:
+                writer.writerows(t.to_dict() for t in chunk)
+                rows += len(chunk)
+        return rows
+
+
+def iter_nextflow_trace(filepath: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[IchnosTrace]]:
+    """Stream a Nextflow trace CSV as chunks of at most chunk_size IchnosTrace records.
+
+    Only one chunk is held in memory at a time, so arbitrarily large traces can be
+    processed in constant memory (see NFTracesToIchnos).
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    with open_text(filepath, newline='') as csvfile:
+        reader = csv.DictReader(csvfile)
+        chunk: List[IchnosTrace] = []
+        for row in reader:
+            trace = IchnosTrace.from_nextflow_row(row)
+            if trace is None:
+                continue
+            chunk.append(trace)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
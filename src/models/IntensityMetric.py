@@ -0,0 +1,23 @@
+from dataclasses import dataclass
+from typing import Dict, Union
+
+from src.models.CarbonIntensitySeries import CarbonIntensitySeries
+
+@dataclass(frozen=True)
+class IntensityMetric:
+    """
+    A per-kWh environmental metric of electricity use, e.g. carbon (gCO2e/kWh),
+    water (L/kWh) or land use (m2/kWh).
+
+    The footprint of a task is energy_exc_pue * onsite_factor + energy_inc_pue * intensity,
+    where the onsite factor covers the data centre itself (e.g. WUE or LUE) and the
+    intensity the electricity supply (e.g. CI, EWIF or ELIF).
+
+    Attributes:
+      name: metric name, used as key of the totals (e.g. 'carbon', 'water')
+      intensity: supply intensity as a constant, a CarbonIntensitySeries or a dict keyed by interval start
+      onsite_factor: onsite intensity per kWh (exc. PUE)
+    """
+    name: str
+    intensity: Union[float, Dict[Union[int, str], float], CarbonIntensitySeries]
+    onsite_factor: float = 0.0
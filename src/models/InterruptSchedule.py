@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+@dataclass
+class InterruptSchedule:
+    """
+    A schedule that runs the intervals of a workflow in order, in chosen slots
+    (periods) of a carbon intensity window, possibly interrupting it between them.
+
+    Every interruption redoes the work lost at that point (the overhead): its
+    energy is charged at the intensity of the slot the workflow resumes in, and
+    its time adds to the embodied carbon.
+
+    Attributes:
+      slots: window slot of every interval, strictly increasing
+      operational_emissions: operational carbon of the intervals and the redone work (gCO2e)
+      overhead_embodied_emissions: embodied carbon of the overhead time (gCO2e)
+      overhead_ms: total overhead time (ms)
+      interruptions: number of interruptions
+    """
+    slots: np.ndarray
+    operational_emissions: float
+    overhead_embodied_emissions: float
+    overhead_ms: float
+    interruptions: int
+
+    @property
+    def total_emissions(self) -> float:
+        """Operational carbon plus the embodied carbon of the overhead (gCO2e)."""
+        return self.operational_emissions + self.overhead_embodied_emissions
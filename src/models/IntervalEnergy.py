@@ -0,0 +1,27 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+@dataclass
+class IntervalEnergy:
+    """
+    Energy of a workflow per accounting interval (kWh), for the intervals that have
+    tasks. Operational carbon with one intensity value per interval is linear in
+    these: carbon = sum(carbon_weights * ci_per_interval).
+
+    Attributes:
+      interval_starts: start of each interval (epoch ms)
+      dynamic_energy_pue: task core and memory energy, inc. PUE
+      static_cpu_energy: static CPU energy of the busy hosts, exc. PUE (as in calculate_carbon_footprint_ccf)
+    """
+    interval_starts: np.ndarray
+    dynamic_energy_pue: np.ndarray
+    static_cpu_energy: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.interval_starts)
+
+    @property
+    def carbon_weights(self) -> np.ndarray:
+        """Energy multiplying each interval's carbon intensity (kWh)."""
+        return self.dynamic_energy_pue + self.static_cpu_energy
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Union
 from src.models.ProcessedTrace import ProcessedTrace
+from src.models.ProcessedTraceTable import ProcessedTraceTable
 
 @dataclass
 class OperationalCarbonResult:
@@ -17,5 +18,10 @@ class OperationalCarbonResult:
     static_cpu_energy_per_host: Dict[str, float]
     static_mem_energy: float
     static_mem_emissions: float
-    # List of processed trace (per interval or per original task instance)
-    records: List[ProcessedTrace]
+    # List of processed trace (per interval or per original task instance),
+    # or a ProcessedTraceTable building them on demand when requested lazily
+    records: Union[List[ProcessedTrace], ProcessedTraceTable]
+    # Max deviation (W) of the sampled power models when lookup tables are used
+    power_model_max_error: float = None
+    # Total footprint per metric ('carbon' exc. static energy, 'water', 'land' and any extra metrics)
+    metric_totals: Dict[str, float] = None
@@ -0,0 +1,83 @@
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.utils.MathModels import evaluate_polynomials
+
+@dataclass
+class PowerLookupTable:
+    """Sampled utilization-to-watts tables for one or more power models.
+
+    Each model is sampled every `resolution` percent from 0 up to at least
+    `max_utilization`; evaluation is a table lookup with linear interpolation, so
+    its cost does not depend on the degree of the model. Utilizations outside the
+    table fall back to the analytic model. `max_error` holds, per model, the
+    largest absolute deviation (W) from the analytic model inside the table.
+
+    Attributes:
+      resolution: sampling step in utilization percent
+      max_utilization: utilization covered by the table (%)
+      watts: sampled power draw, shape (models, samples)
+      coefficients: analytic models [a_n, ..., a_0], shape (models, n + 1)
+      max_error: max absolute interpolation error per model (W)
+    """
+    resolution: float
+    max_utilization: float
+    watts: np.ndarray
+    coefficients: np.ndarray
+    max_error: np.ndarray
+
+    def evaluate(self, codes: np.ndarray, utilization: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the tables of the given models.
+
+        :param codes: Index of the model (row of watts) for every element.
+        :param utilization: Utilization (%) for every element.
+        :return: Power draw (W) for every element.
+        """
+        utilization = np.asarray(utilization, dtype=np.float64)
+        position = utilization / self.resolution
+        last = self.watts.shape[1] - 1
+        index = np.clip(np.floor(position), 0, last - 1).astype(np.intp)
+        fraction = position - index
+        result = self.watts[codes, index] * (1 - fraction) + self.watts[codes, index + 1] * fraction
+
+        outside = (utilization < 0) | (utilization > last * self.resolution)
+        if outside.any():
+            result[outside] = evaluate_polynomials(self.coefficients[codes[outside]], utilization[outside])
+        return result
+
+    @staticmethod
+    def from_coefficients(coefficients: np.ndarray, resolution: float = 1.0, max_utilization: float = 100.0, error_samples: int = 16) -> 'PowerLookupTable':
+        """
+        Sample polynomial power models into a lookup table.
+
+        :param coefficients: Models [a_n, ..., a_0], shape (models, n + 1).
+        :param resolution: Sampling step in utilization percent.
+        :param max_utilization: Utilization the table must cover (%).
+        :param error_samples: Points per table step at which the error is measured.
+        :return: The PowerLookupTable.
+        """
+        if resolution <= 0:
+            raise ValueError("resolution must be positive")
+        coefficients = np.atleast_2d(np.asarray(coefficients, dtype=np.float64))
+        n_models = coefficients.shape[0]
+        samples = math.ceil(max_utilization / resolution) + 1
+        grid = np.arange(max(samples, 2), dtype=np.float64) * resolution
+        watts = _evaluate_rows(coefficients, grid)
+
+        table = PowerLookupTable(resolution, float(max_utilization), watts, coefficients, np.zeros(n_models))
+        probe = np.linspace(0, grid[-1], (len(grid) - 1) * error_samples + 1)
+        codes = np.repeat(np.arange(n_models), len(probe))
+        interpolated = table.evaluate(codes, np.tile(probe, n_models)).reshape(n_models, len(probe))
+        table.max_error = np.abs(interpolated - _evaluate_rows(coefficients, probe)).max(axis=1)
+        return table
+
+
+def _evaluate_rows(coefficients: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """Evaluate every model at every point of x, shape (models, len(x))."""
+    result = np.zeros((coefficients.shape[0], len(x)))
+    for j in range(coefficients.shape[1]):
+        result = result * x + coefficients[:, j:j + 1]
+    return result
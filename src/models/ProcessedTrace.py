@@ -1,14 +1,16 @@
 import csv
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from src.models.IchnosTrace import IchnosTrace
+from src.models.ClippedTask import ClippedTask
 
 @dataclass
 class ProcessedTrace:
     """Processed trace with carbon/CI metrics.
 
-    Contains a reference to the originating UniversalTrace plus derived metrics:
+    Contains a reference to the originating IchnosTrace (or a ClippedTask view of it
+    when the task was split across intervals) plus derived metrics:
       - core_kwh: dynamic energy associated with core for the task
       - mem_kwh: dynamic energy associated with memory for the task
       - average_co2e: average (or total / averaged) operational CO2e for the task
@@ -22,7 +24,7 @@ class ProcessedTrace:
     """
     core_kwh: float
     mem_kwh: float
-    ichnos: IchnosTrace
+    ichnos: Union[IchnosTrace, ClippedTask]
     core_kwh: float
     mem_kwh: float
     average_co2e: float
@@ -0,0 +1,85 @@
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Union
+
+import numpy as np
+
+from src.models.IchnosTrace import IchnosTrace
+from src.models.ClippedTask import ClippedTask
+from src.models.ProcessedTrace import ProcessedTrace
+
+@dataclass
+class ProcessedTraceTable:
+    """Columnar, NumPy-backed result of a carbon footprint calculation.
+
+    Holds the per-piece metrics as arrays next to the pieces they belong to.
+    ProcessedTrace records are only built on demand: indexing builds one row,
+    iterating or to_records() builds all of them. Callers that only need totals
+    (or a few rows) never allocate one record per piece. Columns that were not
+    computed (e.g. water without a WUE) are None.
+    """
+    tasks: List[Union[IchnosTrace, ClippedTask]]
+    core_kwh: np.ndarray
+    mem_kwh: np.ndarray
+    average_co2e: np.ndarray
+    avg_ci: np.ndarray
+    average_water: Optional[np.ndarray] = None  # in Liters
+    avg_ewif: Optional[np.ndarray] = None
+    average_land: Optional[np.ndarray] = None  # in square meters
+    avg_elif: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def __getitem__(self, index: int) -> ProcessedTrace:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ProcessedTraceTable index out of range")
+        return ProcessedTrace(
+            ichnos=self.tasks[index],
+            core_kwh=float(self.core_kwh[index]),
+            mem_kwh=float(self.mem_kwh[index]),
+            average_co2e=float(self.average_co2e[index]),
+            marginal_co2e=float(self.average_co2e[index]),
+            embodied_co2e=0.0,
+            avg_ci=float(self.avg_ci[index]),
+            average_water=_value(self.average_water, index),
+            avg_ewif=_value(self.avg_ewif, index),
+            average_land=_value(self.average_land, index),
+            avg_elif=_value(self.avg_elif, index),
+        )
+
+    def __iter__(self) -> Iterator[ProcessedTrace]:
+        return iter(self.to_records())
+
+    def to_records(self) -> List[ProcessedTrace]:
+        """Materialise every row as a ProcessedTrace record."""
+        n = len(self)
+        none = [None] * n
+        columns = [
+            column.tolist() if column is not None else none
+            for column in (self.average_water, self.avg_ewif, self.average_land, self.avg_elif)
+        ]
+        return [
+            ProcessedTrace(
+                ichnos=task,
+                core_kwh=core,
+                mem_kwh=mem,
+                average_co2e=footprint,
+                marginal_co2e=footprint,
+                embodied_co2e=0.0,
+                avg_ci=ci_val,
+                average_water=water_val, # in Liters
+                avg_ewif=ewif_val,
+                average_land=land_val, # in square meters
+                avg_elif=elif_val,
+            )
+            for task, core, mem, footprint, ci_val, water_val, ewif_val, land_val, elif_val in zip(
+                self.tasks, self.core_kwh.tolist(), self.mem_kwh.tolist(), self.average_co2e.tolist(), self.avg_ci.tolist(),
+                *columns
+            )
+        ]
+
+
+def _value(column: Optional[np.ndarray], index: int) -> Optional[float]:
+    return float(column[index]) if column is not None else None
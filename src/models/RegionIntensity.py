@@ -0,0 +1,64 @@
+import math
+from dataclasses import dataclass
+from functools import reduce
+from typing import List, Sequence, Union
+
+import numpy as np
+
+from src.models.CarbonIntensitySeries import CarbonIntensitySeries
+
+@dataclass
+class RegionIntensity:
+    """Carbon intensity of several regions on one shared timeline.
+
+    Row k holds the values of regions[k]; column i covers
+    [start_timestamp + i * period, start_timestamp + (i + 1) * period), as in
+    CarbonIntensitySeries. Periods a region has no data for are NaN.
+
+    Attributes:
+      regions: region (CI file) names, one per row
+      period: sampling period in ms
+      start_timestamp: start of the first period (epoch ms, UTC)
+      values: float64 array of shape (regions, periods)
+    """
+    regions: List[str]
+    period: int
+    start_timestamp: int
+    values: np.ndarray
+
+    def __len__(self) -> int:
+        return self.values.shape[1]
+
+    def index_of(self, ms: Union[int, np.ndarray]) -> Union[int, np.ndarray]:
+        """Index of the period containing ms (may fall outside the timeline)."""
+        if isinstance(ms, np.ndarray):
+            return (ms.astype(np.int64) - self.start_timestamp) // self.period
+        return (int(ms) - self.start_timestamp) // self.period
+
+    def series(self, region: Union[int, str]) -> CarbonIntensitySeries:
+        """The row of one region (by index or name) as a CarbonIntensitySeries; values are shared."""
+        k = region if isinstance(region, int) else self.regions.index(region)
+        return CarbonIntensitySeries(self.period, self.start_timestamp, self.values[k])
+
+    @staticmethod
+    def from_series(regions: Sequence[str], series: Sequence[CarbonIntensitySeries]) -> 'RegionIntensity':
+        """Lay several series out on one timeline.
+
+        The shared period is the greatest common divisor of the periods; coarser
+        series are repeated onto it, which keeps their values per instant. The
+        timeline spans all series and their starts must be aligned to the period.
+        """
+        if not series or len(regions) != len(series):
+            raise ValueError("One series is required per region")
+        period = reduce(math.gcd, (s.period for s in series))
+        start = min(s.start_timestamp for s in series)
+        end = max(s.end_timestamp for s in series)
+        if any((s.start_timestamp - start) % period for s in series):
+            raise ValueError(f"Carbon intensity series are not aligned to a period of {period}ms")
+
+        values = np.full((len(series), (end - start) // period), np.nan)
+        for k, s in enumerate(series):
+            first = (s.start_timestamp - start) // period
+            row = np.repeat(s.values, s.period // period)
+            values[k, first:first + len(row)] = row
+        return RegionIntensity(list(regions), period, start, values)
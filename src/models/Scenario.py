@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+from typing import Union
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    One combination of operational parameters to evaluate a trace under.
+
+    Attributes:
+      ci: carbon intensity, either a constant (gCO2e/kWh) or the name of a file in data/intensity
+      pue: power usage effectiveness
+      model_name: power model name, e.g. 'default_minmax'
+    """
+    ci: Union[float, str]
+    pue: float
+    model_name: str
+
+    @property
+    def label(self) -> str:
+        ci = str(int(self.ci)) if isinstance(self.ci, float) else self.ci
+        return f"{ci}-{self.model_name}-{self.pue}"
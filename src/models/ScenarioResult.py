@@ -0,0 +1,34 @@
+from dataclasses import dataclass, asdict
+from typing import List, Union
+
+@dataclass
+class ScenarioResult:
+    """
+    Operational footprint of a trace under one Scenario, i.e. one row of the
+    tidy results table written by the ScenarioMatrix script. Energies are in kWh
+    and emissions in gCO2e, with the same meaning as in OperationalCarbonResult.
+    """
+    trace: str
+    ci: Union[float, str]
+    pue: float
+    model_name: str
+    cpu_energy: float
+    cpu_energy_pue: float
+    memory_energy: float
+    memory_energy_pue: float
+    static_cpu_energy: float
+    static_mem_energy: float
+    static_mem_emissions: float
+    carbon_emissions: float
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @staticmethod
+    def fieldnames() -> List[str]:
+        return [
+            'trace', 'ci', 'pue', 'model_name', 'cpu_energy', 'cpu_energy_pue',
+            'memory_energy', 'memory_energy_pue', 'static_cpu_energy',
+            'static_mem_energy', 'static_mem_emissions', 'carbon_emissions'
+        ]
+
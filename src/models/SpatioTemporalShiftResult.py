@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+@dataclass
+class SpatioTemporalShiftResult:
+    """
+    Outcome of moving a whole workflow to another region and/or a later start.
+
+    Offsets are counted in periods of the (shared) carbon intensity timeline;
+    offset 0 in the first region is the original schedule. Region and offset
+    pairs for which the intensity data has gaps have a NaN footprint.
+
+    Attributes:
+      regions: region names, one per row of emissions
+      period: length of an offset (ms)
+      original_emissions: operational carbon of the original schedule (gCO2e)
+      emissions: operational carbon for every region and offset 0..max_offset (gCO2e), shape (regions, offsets)
+    """
+    regions: List[str]
+    period: int
+    original_emissions: float
+    emissions: np.ndarray
+
+    @property
+    def savings(self) -> np.ndarray:
+        """Reduction of operational carbon per region and offset, in % of the original."""
+        return (self.original_emissions - self.emissions) / self.original_emissions * 100
+
+    def best(self, max_offset: int = None) -> Tuple[int, int]:
+        """(region index, offset) with the lowest operational carbon among offsets 0..max_offset."""
+        window = self.emissions[:, :None if max_offset is None else max_offset + 1]
+        region, offset = np.unravel_index(np.nanargmin(window), window.shape)
+        return int(region), int(offset)
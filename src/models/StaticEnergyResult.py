@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+@dataclass
+class StaticEnergyResult:
+    """
+    Represents the static (idle) energy of the hosts while they are busy, per
+    accounting interval and host. Arrays have shape (intervals, hosts), indexed
+    like TaskPieces.interval_starts and TaskPieces.hosts.
+    """
+    busy_hours: np.ndarray
+    cpu_energy: np.ndarray  # kWh, exc. PUE
+    memory_energy: np.ndarray  # kWh, exc. PUE
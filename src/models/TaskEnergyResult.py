@@ -1,9 +1,13 @@
 from dataclasses import dataclass
+from typing import Union
+
+import numpy as np
 
 @dataclass
 class TaskEnergyResult:
     """
-    Represents the energy consumption result for a task.
+    Represents the energy consumption result for a task, or for many task pieces
+    at once as arrays when produced by the vectorized estimator.
     """
-    core_consumption: float
-    memory_consumption: float
+    core_consumption: Union[float, np.ndarray]
+    memory_consumption: Union[float, np.ndarray]
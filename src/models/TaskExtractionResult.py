@@ -1,7 +1,8 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Union
 from src.models.IchnosTrace import IchnosTrace
+from src.models.ClippedTask import ClippedTask
 from src.models.ProcessedTrace import ProcessedTrace
 
 @dataclass
@@ -9,8 +10,8 @@ class TaskExtractionResult:
     """
     Represents the result of extracting tasks by interval.
     """
-    # Mapping of interval bucket (epoch ms) -> list of IchnosTrace tasks (possibly sliced)
-    tasks_by_interval: Dict[datetime, List[IchnosTrace]]
+    # Mapping of interval bucket (epoch ms) -> list of IchnosTrace tasks, sliced tasks are ClippedTask views
+    tasks_by_interval: Dict[datetime, List[Union[IchnosTrace, ClippedTask]]]
     # All original ichnos trace records (unsliced)
     all_tasks: List[IchnosTrace]
     overhead_intervals: List[int]
@@ -0,0 +1,77 @@
+from dataclasses import dataclass, replace
+from typing import Dict, List, Mapping, Union
+
+import numpy as np
+
+from src.models.IchnosTrace import IchnosTrace
+from src.models.ClippedTask import ClippedTask
+
+@dataclass
+class TaskPieces:
+    """Columnar view of the task pieces of an interval grouping.
+
+    Every (interval, task) entry of a tasks-by-interval mapping becomes one piece.
+    Pieces are ordered by interval and then by their position in the interval's
+    task list, so index p of every array refers to the same piece as tasks[p].
+
+    Attributes:
+      interval_starts: start of each accounting interval (epoch ms), in mapping order
+      interval_index: index into interval_starts for each piece
+      start: (clipped) start of each piece (epoch ms)
+      end: (clipped) end of each piece (epoch ms)
+      avg_cpu_usage: avg_cpu_usage of the originating task
+      memory: memory of the originating task (bytes)
+      host_codes: index into hosts for each piece
+      hosts: distinct hostnames, in order of first appearance
+      tasks: the piece objects themselves (IchnosTrace or ClippedTask)
+    """
+    interval_starts: np.ndarray
+    interval_index: np.ndarray
+    start: np.ndarray
+    end: np.ndarray
+    avg_cpu_usage: np.ndarray
+    memory: np.ndarray
+    host_codes: np.ndarray
+    hosts: List[str]
+    tasks: List[Union[IchnosTrace, ClippedTask]]
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    @property
+    def duration_h(self) -> np.ndarray:
+        return (self.end - self.start) / 1000 / 3600
+
+    def shift(self, offset: int) -> 'TaskPieces':
+        """Pieces and intervals moved in time by offset ms; every other column is shared.
+
+        Equivalent to shifting the trace by a whole number of intervals and grouping
+        it again. The task objects are shared as well and keep their original times.
+        """
+        return replace(self, interval_starts=self.interval_starts + offset, start=self.start + offset, end=self.end + offset)
+
+    @staticmethod
+    def from_tasks_by_interval(tasks_grouped_by_interval: Mapping[int, List[Union[IchnosTrace, ClippedTask]]]) -> 'TaskPieces':
+        interval_starts: List[int] = []
+        interval_index: List[int] = []
+        tasks: List[Union[IchnosTrace, ClippedTask]] = []
+        for i, (group_interval, group_tasks) in enumerate(tasks_grouped_by_interval.items()):
+            interval_starts.append(int(group_interval))
+            interval_index.extend([i] * len(group_tasks))
+            tasks.extend(group_tasks)
+
+        host_lookup: Dict[str, int] = {}
+        host_codes = [host_lookup.setdefault(task.hostname, len(host_lookup)) for task in tasks]
+        n = len(tasks)
+
+        return TaskPieces(
+            interval_starts=np.asarray(interval_starts, dtype=np.int64),
+            interval_index=np.asarray(interval_index, dtype=np.int64),
+            start=np.fromiter((int(task.start) for task in tasks), dtype=np.int64, count=n),
+            end=np.fromiter((int(task.end) for task in tasks), dtype=np.int64, count=n),
+            avg_cpu_usage=np.fromiter((float(task.avg_cpu_usage) for task in tasks), dtype=np.float64, count=n),
+            memory=np.fromiter((float(task.memory or 0.0) for task in tasks), dtype=np.float64, count=n),
+            host_codes=np.asarray(host_codes, dtype=np.int32),
+            hosts=list(host_lookup),
+            tasks=tasks
+        )
@@ -1,11 +1,13 @@
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, List, Union
 from src.models.IchnosTrace import IchnosTrace
+from src.models.ClippedTask import ClippedTask
 
 @dataclass
 class TasksByTimeResult:
     """
     Represents the result of grouping tasks by a time interval, including overheads.
     """
-    tasks_by_time: Dict[int, List[IchnosTrace]]
+    # Mapping of bucket (epoch ms) -> tasks, clipped tasks are ClippedTask views
+    tasks_by_time: Dict[int, List[Union[IchnosTrace, ClippedTask]]]
     overheads: List[int]
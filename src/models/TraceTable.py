@@ -0,0 +1,231 @@
+import csv
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from src.models.IchnosTrace import IchnosTrace
+from src.utils.Compression import open_text
+
+@dataclass
+class EncodedStrings:
+    """Dictionary-encoded string column.
+
+    Each row stores an int32 code into `values`, so repeated strings (hostnames,
+    process names, CPU models) are only held once per table.
+    """
+    codes: np.ndarray
+    values: List[str]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> str:
+        return self.values[self.codes[index]]
+
+    def decode(self) -> List[str]:
+        values = self.values
+        return [values[code] for code in self.codes.tolist()]
+
+    @staticmethod
+    def encode(strings: Iterable[str]) -> 'EncodedStrings':
+        lookup: Dict[str, int] = {}
+        codes = [lookup.setdefault(s, len(lookup)) for s in strings]
+        return EncodedStrings(codes=np.asarray(codes, dtype=np.int32), values=list(lookup))
+
+
+class TraceRow:
+    """Zero-copy view of a single TraceTable row that reads like an IchnosTrace.
+
+    Field access returns Python scalars read straight from the table columns;
+    to_ichnos_trace() builds a standalone IchnosTrace when a real record is needed.
+    """
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table: 'TraceTable', index: int):
+        self.table = table
+        self.index = index
+
+    @property
+    def id(self) -> str:
+        return self.table.id[self.index]
+
+    @property
+    def name(self) -> str:
+        return self.table.name[self.index]
+
+    @property
+    def start(self) -> int:
+        return int(self.table.start[self.index])
+
+    @property
+    def end(self) -> int:
+        return int(self.table.end[self.index])
+
+    @property
+    def cpu_count(self) -> int:
+        return int(self.table.cpu_count[self.index])
+
+    @property
+    def avg_cpu_usage(self) -> float:
+        return float(self.table.avg_cpu_usage[self.index])
+
+    @property
+    def cpu_model(self) -> str:
+        return self.table.cpu_model[self.index]
+
+    @property
+    def memory(self) -> float:
+        return float(self.table.memory[self.index])
+
+    @property
+    def hostname(self) -> str:
+        return self.table.hostname[self.index]
+
+    @property
+    def rapl_timeseries(self) -> Optional[str]:
+        return self.table.rapl_timeseries[self.index] or None
+
+    @property
+    def cpu_usage_timeseries(self) -> Optional[str]:
+        return self.table.cpu_usage_timeseries[self.index] or None
+
+    def to_ichnos_trace(self) -> IchnosTrace:
+        return IchnosTrace(
+            id=self.id,
+            name=self.name,
+            start=self.start,
+            end=self.end,
+            cpu_count=self.cpu_count,
+            avg_cpu_usage=self.avg_cpu_usage,
+            cpu_model=self.cpu_model,
+            memory=self.memory,
+            hostname=self.hostname,
+            rapl_timeseries=self.rapl_timeseries,
+            cpu_usage_timeseries=self.cpu_usage_timeseries
+        )
+
+    def to_dict(self) -> dict:
+        return self.to_ichnos_trace().to_dict()
+
+    def __repr__(self) -> str:
+        return f"TraceRow({self.index}, id={self.id!r}, hostname={self.hostname!r})"
+
+
+@dataclass
+class TraceTable:
+    """Columnar, NumPy-backed representation of a list of IchnosTrace records.
+
+    Numeric fields are stored as arrays (int64 for start/end/cpu_count, float64 for
+    avg_cpu_usage/memory) and string fields are dictionary-encoded. Indexing or
+    iterating the table yields TraceRow views, so a TraceTable can be passed where
+    a List[IchnosTrace] is read (e.g. get_tasks_by_interval) without materialising
+    one object per task.
+    """
+    id: List[str]
+    name: EncodedStrings
+    start: np.ndarray
+    end: np.ndarray
+    cpu_count: np.ndarray
+    avg_cpu_usage: np.ndarray
+    cpu_model: EncodedStrings
+    memory: np.ndarray
+    hostname: EncodedStrings
+    rapl_timeseries: EncodedStrings
+    cpu_usage_timeseries: EncodedStrings
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    def __getitem__(self, index: int) -> TraceRow:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("TraceTable index out of range")
+        return TraceRow(self, index)
+
+    def __iter__(self) -> Iterator[TraceRow]:
+        for index in range(len(self)):
+            yield TraceRow(self, index)
+
+    def to_traces(self) -> List[IchnosTrace]:
+        """Materialise every row as an IchnosTrace record."""
+        names = self.name.decode()
+        cpu_models = self.cpu_model.decode()
+        hostnames = self.hostname.decode()
+        rapl = self.rapl_timeseries.decode()
+        cpu_ts = self.cpu_usage_timeseries.decode()
+        return [
+            IchnosTrace(
+                id=self.id[i],
+                name=names[i],
+                start=start,
+                end=end,
+                cpu_count=cpu_count,
+                avg_cpu_usage=avg_cpu_usage,
+                cpu_model=cpu_models[i],
+                memory=memory,
+                hostname=hostnames[i],
+                rapl_timeseries=rapl[i] or None,
+                cpu_usage_timeseries=cpu_ts[i] or None
+            )
+            for i, (start, end, cpu_count, avg_cpu_usage, memory) in enumerate(zip(
+                self.start.tolist(), self.end.tolist(), self.cpu_count.tolist(),
+                self.avg_cpu_usage.tolist(), self.memory.tolist()
+            ))
+        ]
+
+    def to_csv(self, filepath: str):
+        IchnosTrace.to_csv(list(self), filepath)
+
+    @staticmethod
+    def from_traces(traces: Iterable[IchnosTrace]) -> 'TraceTable':
+        traces = list(traces)
+        return TraceTable(
+            id=[t.id for t in traces],
+            name=EncodedStrings.encode(t.name or '' for t in traces),
+            start=np.fromiter((int(t.start) for t in traces), dtype=np.int64, count=len(traces)),
+            end=np.fromiter((int(t.end) for t in traces), dtype=np.int64, count=len(traces)),
+            cpu_count=np.fromiter((int(t.cpu_count or 0) for t in traces), dtype=np.int64, count=len(traces)),
+            avg_cpu_usage=np.fromiter((float(t.avg_cpu_usage or 0.0) for t in traces), dtype=np.float64, count=len(traces)),
+            cpu_model=EncodedStrings.encode(t.cpu_model or '' for t in traces),
+            memory=np.fromiter((float(t.memory or 0.0) for t in traces), dtype=np.float64, count=len(traces)),
+            hostname=EncodedStrings.encode(t.hostname or '' for t in traces),
+            rapl_timeseries=EncodedStrings.encode(t.rapl_timeseries or '' for t in traces),
+            cpu_usage_timeseries=EncodedStrings.encode(t.cpu_usage_timeseries or '' for t in traces)
+        )
+
+    @staticmethod
+    def from_csv(filepath: str) -> 'TraceTable':
+        """Load an IchnosTrace CSV (as written by IchnosTrace.to_csv) into columns.
+
+        Rows without an id are skipped and missing values default exactly as in
+        IchnosTrace.from_csv.
+        """
+        fields = IchnosTrace.fieldnames()
+        columns: Dict[str, list] = {field: [] for field in fields}
+        with open_text(filepath, newline='') as csvfile:
+            reader = csv.reader(csvfile)
+            header = next(reader, [])
+            positions = {field: header.index(field) for field in fields if field in header}
+            id_i = positions.get('id')
+            for row in (reader if id_i is not None else ()):
+                if id_i >= len(row) or not row[id_i]:
+                    continue
+                for field in fields:
+                    i = positions.get(field)
+                    columns[field].append(row[i] if i is not None and i < len(row) else '')
+
+        return TraceTable(
+            id=columns['id'],
+            name=EncodedStrings.encode(columns['name']),
+            start=np.array([int(v or 0) for v in columns['start']], dtype=np.int64),
+            end=np.array([int(v or 0) for v in columns['end']], dtype=np.int64),
+            cpu_count=np.array([int(v or 0) for v in columns['cpu_count']], dtype=np.int64),
+            avg_cpu_usage=np.array([float(v or 0.0) for v in columns['avg_cpu_usage']], dtype=np.float64),
+            cpu_model=EncodedStrings.encode(columns['cpu_model']),
+            memory=np.array([float(v or 0.0) for v in columns['memory']], dtype=np.float64),
+            hostname=EncodedStrings.encode(columns['hostname']),
+            rapl_timeseries=EncodedStrings.encode(columns['rapl_timeseries']),
+            cpu_usage_timeseries=EncodedStrings.encode(columns['cpu_usage_timeseries'])
+        )
@@ -1,11 +1,28 @@
 from src.external_apis.Boavizta import get_cpu_impact
 from src.models.ProcessedTrace import ProcessedTrace
 
-from typing import List
+from typing import Dict, List
 import sys
 
 DEFAULT_CPU_LIFETIME = 4.0 * 365.25 * 24  # 4 years in hours
 
+# embodied impact (kgCO2e) per CPU model, kept in memory once read from the (on-disk) Boavizta cache
+cpu_impacts: Dict[str, float] = {}
+
+
+def get_cpu_embodied_impact(cpu_model: str) -> float:
+    """
+    Embodied impact of a CPU model over its lifetime (kgCO2e), read from Boavizta once per process.
+
+    Processes forked after a model was looked up (e.g. Explorer sweep workers) inherit the value.
+    """
+    impact = cpu_impacts.get(cpu_model)
+    if impact is None:
+        impact = get_cpu_impact(cpu_model)
+        cpu_impacts[cpu_model] = impact
+    return impact
+
+
 def calculate_cpu_embodied_carbon(cpu_model: str, duration_used: float, lifetime: float = None, cpu_usage: float = 1.0) -> float:
     """
     Calculate the embodied carbon for a CPU model based on its usage duration and expected lifetime. Currently assumes 100% CPU utilisation of all cores.
@@ -20,7 +37,7 @@ def calculate_cpu_embodied_carbon(cpu_model: str, duration_used: float, lifetime
     float: The estimated embodied carbon in grams.
     """
     
-    cpu_lca = get_cpu_impact(cpu_model)
+    cpu_lca = get_cpu_embodied_impact(cpu_model)
     if lifetime is None:
         lifetime = DEFAULT_CPU_LIFETIME
     embodied_carbon_kg = cpu_lca * (duration_used / lifetime)
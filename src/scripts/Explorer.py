@@ -1,13 +1,25 @@
 # Imports
 from src.scripts.Convertor import convertor
-from src.scripts.IchnosCF import get_carbon_footprint
+from src.scripts.IchnosCF import get_carbon_footprint, calculate_footprint_for_tasks
 from src.utils.Usage import print_usage_exit_Explorer as print_usage_exit
-from typing import List, Tuple, Dict
+from src.scripts.EmbodiedCarbon import get_cpu_embodied_impact
+from typing import List, Optional, Tuple, Dict, Union
+from src.models.CarbonIntensitySeries import CarbonIntensitySeries
 from src.models.IchnosResult import IchnosResult
-from src.scripts.NFTracesToUniversal import convert_contains
-
+from src.models.TaskExtractionResult import TaskExtractionResult
+from src.scripts.NFTracesToIchnos import convert_contains
+from src.models.TaskPieces import TaskPieces
+from src.utils.NodeConfigModelReader import get_cpu_model
+from src.utils.Parsers import parse_arguments_with_config, pop_flag_value
+from src.utils.IntensityCatalog import intensity_catalog
+from src.utils.PowerModel import power_model_registry
+from src.utils.TimeUtils import extract_tasks_by_interval, shift_tasks_by_interval
+
+import multiprocessing
 import sys
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # Constants
 SHIFT_BY_12 = "00-12-00"
@@ -28,6 +40,8 @@ PUE = "pue"
 MEMORY_COEFFICIENT = "memory-coeff"
 MEMORY = "memory"
 NODES = "nodes"
+WORKERS = "workers"
+BOTH_DIRECTIONS = "both-directions"
 
 
 # Functions
@@ -130,15 +144,28 @@ def parse_arguments(arguments: List[str]) -> Dict[str, str]:
     """
     Parse command-line arguments for the Explorer script.
 
+    Besides the 9 positional arguments, '--workers N' sets the number of processes
+    (at least 1) and '--both-directions' also shifts the trace backward. Invalid
+    flags print the usage and exit.
+
     Args:
         arguments (List[str]): List of command-line arguments.
 
     Returns:
         Dict[str, str]: Parsed settings dictionary.
     """
-    if len(arguments) != 9:
+    arguments = list(arguments)
+    try:
+        workers = int(pop_flag_value(arguments, '--workers', print_usage_exit) or 1)
+    except ValueError:
+        print_usage_exit()
+    both_directions = '--both-directions' in arguments
+    arguments = [argument for argument in arguments if argument != '--both-directions']
+    if len(arguments) != 9 or workers < 1:
         print_usage_exit()
     return {
+        WORKERS: workers,
+        BOTH_DIRECTIONS: both_directions,
         TRACE: arguments[0].strip(),
         CI: arguments[1].strip(),
         SHIFT: int(arguments[2].strip()),
@@ -223,7 +250,7 @@ def shift_trace_forwards_by_h(trace: str, delim: str, shift_by: int, ci: str, mo
         (_, _, trace_fwd) = shift_trace(trace, delim, shift)
         forward_traces.append(trace_fwd)
     trace_dir= 'data/trace'
-    out_dir = 'data/universal_traces'
+    out_dir = 'data/ichnos_traces'
     convert_contains(trace_dir, out_dir, '-00')
     footprints: List[Tuple[str, IchnosResult]] = []
     footprints.append((trace, calculate_footprint(trace, ci, model_name, memory, nodes, interval, pue, memory_coeff)))
@@ -232,6 +259,124 @@ def shift_trace_forwards_by_h(trace: str, delim: str, shift_by: int, ci: str, mo
     return footprints
 
 
+def sweep_shifts_in_memory(trace: str, shifts: List[int], ci: str, model_name: str, interval: int, pue: float, memory_coeff: float, memory: int, nodes: int, workers: int = 1) -> List[Tuple[str, IchnosResult]]:
+    """
+    Calculate the footprints of a trace shifted by each of the given numbers of hours, without shifted trace files.
+
+    The trace and the CI data are parsed and the tasks grouped into intervals once,
+    and the node config, power models and embodied carbon factors are loaded before
+    any shift is evaluated. A shift by whole intervals keeps every task in the same
+    intervals, so it only offsets the time columns of the task pieces
+    (TaskPieces.shift); other shifts group the shifted tasks again
+    (shift_tasks_by_interval). Every footprint is computed with the IchnosCF
+    pipeline; no trace, summary or report file is written.
+
+    With workers > 1 the shifts are evaluated in a pool of forked processes, which
+    inherit all of the loaded data instead of reloading it. Progress is printed as
+    shifts complete, and the time each shift took is added to its summary.
+
+    Args:
+        trace (str): The base trace filename (an IchnosTrace in data/ichnos_traces).
+        shifts (List[int]): Shifts in hours, negative to shift backward.
+        ci (str): Carbon intensity file or value.
+        model_name (str): Power model name.
+        interval (int): Interval in minutes.
+        pue (float): Power Usage Effectiveness.
+        memory_coeff (float): Memory power coefficient.
+        memory (int): Memory in GB on each node.
+        nodes (int): Number of nodes allocated.
+        workers (int, optional): Number of processes. Defaults to 1.
+
+    Returns:
+        List[Tuple[str, IchnosResult]]: (trace, result) pairs in the order of shifts, named as shift_trace names them.
+    """
+    global _sweep
+    arguments = parse_arguments_with_config(f"{trace} {ci} {model_name} {interval} {pue} {memory_coeff} {memory} {nodes}".split(' '))
+    ci_data = intensity_catalog.resolve(arguments[CI])
+    extraction = extract_tasks_by_interval(trace, interval)
+    pieces = TaskPieces.from_tasks_by_interval(extraction.tasks_by_interval)
+
+    # warm the process-wide caches, so that no shift (or worker) reloads them
+    power_model_registry.get_many(pieces.hosts, model_name)
+    for cpu_model in {task.cpu_model if (task.cpu_model and task.cpu_model != 'None') else get_cpu_model(task.hostname) for task in extraction.all_tasks}:
+        get_cpu_embodied_impact(cpu_model)
+
+    _sweep = (arguments, ci_data, extraction, pieces)
+    started = time.perf_counter()
+    try:
+        if workers > 1 and len(shifts) > 1 and 'fork' in multiprocessing.get_all_start_methods():
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork')) as pool:
+                futures = {pool.submit(_evaluate_shift, hours): hours for hours in shifts}
+                evaluated = {}
+                for done, future in enumerate(as_completed(futures), start=1):
+                    evaluated[futures[future]] = future.result()
+                    _report_progress(done, len(shifts), futures[future], *evaluated[futures[future]])
+        else:
+            evaluated = {}
+            for done, hours in enumerate(shifts, start=1):
+                evaluated[hours] = _evaluate_shift(hours)
+                _report_progress(done, len(shifts), hours, *evaluated[hours])
+    finally:
+        _sweep = None
+    print(f"[Explorer] Evaluated {len(shifts)} shifts in {time.perf_counter() - started:.2f}s")
+
+    footprints: List[Tuple[str, IchnosResult]] = []
+    for hours in shifts:
+        result, seconds = evaluated[hours]
+        summary = result.summary + f"- Shift evaluated in: {seconds:.3f}s\n"
+        footprints.append((_shifted_name(trace, hours), IchnosResult(summary, result.operational_emissions, result.embodied_emissions)))
+    return footprints
+
+
+def shift_trace_forwards_in_memory_by_h(trace: str, shift_by: int, ci: str, model_name: str, interval: int, pue: float, memory_coeff: float, memory: int, nodes: int, workers: int = 1) -> List[Tuple[str, IchnosResult]]:
+    """
+    Calculate the footprints of a trace shifted forward by 0 to shift_by hours (see sweep_shifts_in_memory).
+    """
+    return sweep_shifts_in_memory(trace, list(range(0, shift_by + 1)), ci, model_name, interval, pue, memory_coeff, memory, nodes, workers)
+
+
+def shift_trace_both_directions_in_memory_by_h(trace: str, shift_by: int, ci: str, model_name: str, interval: int, pue: float, memory_coeff: float, memory: int, nodes: int, workers: int = 1) -> List[Tuple[str, IchnosResult]]:
+    """
+    Calculate the footprints of a trace shifted backward and forward by up to shift_by hours (see sweep_shifts_in_memory).
+
+    Results are ordered as by shift_trace_both_directions_by_h, from the furthest backward shift to the furthest forward one.
+    """
+    return sweep_shifts_in_memory(trace, list(range(-shift_by, shift_by + 1)), ci, model_name, interval, pue, memory_coeff, memory, nodes, workers)
+
+
+# state of the running sweep, inherited by forked workers
+_sweep: Optional[Tuple[Dict[str, Union[str, float, int]], Union[float, CarbonIntensitySeries], TaskExtractionResult, TaskPieces]] = None
+
+
+def _evaluate_shift(hours: int) -> Tuple[IchnosResult, float]:
+    """Footprint of the sweep's trace shifted by hours, and the seconds it took."""
+    arguments, ci_data, extraction, pieces = _sweep
+    interval = arguments[INTERVAL]
+    offset = hours * 3600000
+    started = time.perf_counter()
+    if offset % (interval * 60000) == 0 and 60 % interval == 0:
+        result, _ = calculate_footprint_for_tasks(arguments, extraction, ci_data, verbose=False, lazy_records=True, pieces=pieces.shift(offset))
+    else:
+        result, _ = calculate_footprint_for_tasks(arguments, shift_tasks_by_interval(extraction, offset, interval), ci_data, verbose=False, lazy_records=True)
+    return result, time.perf_counter() - started
+
+
+def _report_progress(done: int, total: int, hours: int, result: IchnosResult, seconds: float) -> None:
+    print(f"[Explorer] [{done}/{total}] Shift [{hours:+d}h]: Operational Carbon Emissions {result.operational_emissions}gCO2e ({seconds:.2f}s)")
+
+
+def _shifted_name(trace: str, hours: int) -> str:
+    """Name of the trace shifted by hours, as shift_trace names the shifted trace files."""
+    if hours == 0:
+        return trace
+    return f"{trace}~{FORWARD if hours > 0 else BACKWARD}{_shift_string(abs(hours))}"
+
+
+def _shift_string(hours: int) -> str:
+    """Shift as the dd-HH-MM string used in shifted trace names."""
+    return f"{str(hours // 24).zfill(2)}-{str(hours % 24).zfill(2)}-00"
+
+
 # Shift over 2x hour period
 if __name__ == "__main__":
     args = sys.argv[1:]
@@ -240,5 +385,6 @@ if __name__ == "__main__":
     output_folder = get_output_folder(settings[SHIFT], settings[TRACE], settings[CI])
     os.makedirs(output_folder, exist_ok=True)
 
-    footprints = shift_trace_forwards_by_h(settings[TRACE], ",", settings[SHIFT], settings[CI], settings[MODEL_NAME], settings[INTERVAL], settings[PUE], settings[MEMORY_COEFFICIENT], settings[MEMORY], settings[NODES])
+    sweep = shift_trace_both_directions_in_memory_by_h if settings[BOTH_DIRECTIONS] else shift_trace_forwards_in_memory_by_h
+    footprints = sweep(settings[TRACE], settings[SHIFT], settings[CI], settings[MODEL_NAME], settings[INTERVAL], settings[PUE], settings[MEMORY_COEFFICIENT], settings[MEMORY], settings[NODES], settings[WORKERS])
     report_summary(output_folder, settings, footprints)
@@ -1,7 +1,8 @@
 import logging
 from typing import Dict, List, Tuple, Union
 from src.utils.TimeUtils import to_timestamp, extract_tasks_by_interval
-from src.utils.Parsers import parse_ci_intervals, parse_arguments_with_config, parse_ichnos_trace_file
+from src.utils.Parsers import parse_arguments_with_config
+from src.utils.IntensityCatalog import intensity_catalog
 from src.utils.FileWriters import write_summary_file, write_task_trace_and_rank_report
 from src.utils.NodeConfigModelReader import get_memory_draw, get_cpu_model
 from src.Constants import *
@@ -9,8 +10,13 @@ from src.scripts.OperationalCarbon import calculate_carbon_footprint_ccf
 from src.scripts.EmbodiedCarbon import calculate_cpu_embodied_carbon
 from src.models.IchnosTrace import IchnosTrace
 from src.models.IchnosResult import IchnosResult
+from src.models.IntensityMetric import IntensityMetric
 from src.models.OperationalCarbonResult import OperationalCarbonResult
 from src.models.TaskExtractionResult import TaskExtractionResult
+from src.models.CarbonIntensitySeries import CarbonIntensitySeries
+from src.models.ProcessedTrace import ProcessedTrace
+from src.models.ProcessedTraceTable import ProcessedTraceTable
+from src.models.TaskPieces import TaskPieces
 
 import sys
 
@@ -21,31 +27,51 @@ def main(arguments: Dict[str, Union[str, float, int]]) -> IchnosResult:
     :param arguments: Argument dictionary parsed from command line.
     :return: An IchnosResult object containing the summary and emissions.
     """
+    workflow: str = arguments[TRACE]
+    model_name: str = arguments[MODEL_NAME]
+
+    task_extraction_result: TaskExtractionResult = extract_tasks_by_interval(workflow, arguments[INTERVAL])
+    ichnos_result, records_res = calculate_footprint_for_tasks(arguments, task_extraction_result)
+
+    # Report Summary
+    if isinstance(arguments[CI], float):
+        ci = str(int(arguments[CI]))
+    else:
+        ci = arguments[CI]
+
+    write_summary_file("output", workflow + "-" + ci + "-" + model_name, ichnos_result.summary)
+    write_task_trace_and_rank_report("output", workflow + "-" + ci + "-" + model_name, records_res)
+
+    return ichnos_result
+
+
+def calculate_footprint_for_tasks(arguments: Dict[str, Union[str, float, int]], task_extraction_result: TaskExtractionResult, ci: Union[float, CarbonIntensitySeries] = None, verbose: bool = True, lazy_records: bool = False, pieces: TaskPieces = None) -> Tuple[IchnosResult, Union[List[ProcessedTrace], ProcessedTraceTable]]:
+    """
+    Compute the carbon footprint of already extracted tasks, without writing any file.
 
+    :param arguments: Argument dictionary parsed from command line.
+    :param task_extraction_result: Tasks of the trace, e.g. from extract_tasks_by_interval or shift_tasks_by_interval.
+    :param ci: Carbon intensity constant or series; read as given by arguments if None.
+        Pass it to reuse one parsed series over many calls.
+    :param verbose: Print the results to stdout.
+    :param lazy_records: Return the per-task records as a ProcessedTraceTable.
+    :param pieces: TaskPieces to compute the operational footprint of instead of the grouping of
+        task_extraction_result, e.g. that grouping shifted with TaskPieces.shift.
+    :return: Tuple of the IchnosResult and the per-task records.
+    """
     # Data
-    workflow: str = arguments[TRACE]
     pue: float = arguments[PUE]
-    interval: int = arguments[INTERVAL]
     model_name: str = arguments[MODEL_NAME]
     memory_coefficient: float = arguments[MEMORY_COEFFICIENT]
 
     if memory_coefficient is None:
         memory_coefficient = DEFAULT_MEMORY_POWER_DRAW
 
-    task_extraction_result: TaskExtractionResult = extract_tasks_by_interval(workflow, interval)
     tasks_by_interval = task_extraction_result.tasks_by_interval
     unique_nodes = list({task.hostname for task in task_extraction_result.all_tasks})
 
-    ## Get raw IchnosTrace records for computing embodied carbon
-    filename: str = workflow
-    if len(filename.split(".")) > 1:
-        filename = filename.split(".")[-2]
-    try:
-        trace_records: List[IchnosTrace] = parse_ichnos_trace_file(f"data/ichnos_traces/{filename}.{FILE}")
-    except Exception as e:
-        logging.error("Failed to parse ichnos trace file %s: %s", f"data/ichnos_traces/{filename}.{FILE}", e)
-        trace_records = []
-    #################
+    ## Raw (unsliced) IchnosTrace records for computing embodied carbon
+    trace_records: List[IchnosTrace] = task_extraction_result.all_tasks
 
     summary: str = ""
     summary += "Carbon Footprint Trace:\n"
@@ -53,40 +79,38 @@ def main(arguments: Dict[str, Union[str, float, int]]) -> IchnosResult:
     summary += f"- power-usage-effectiveness: {pue}\n"
     summary += f"- power model selected: {model_name}\n"
     summary += f"- memory-power-draw: {memory_coefficient}\n"
+    if arguments.get(NODE_LEVEL_UTILIZATION):
+        summary += "- power model applied to node-level (concurrent) utilization\n"
 
-    if isinstance(arguments[CI], float):
-        ci = arguments[CI]
-    else:
-        ci_filename: str = f"data/intensity/{arguments[CI]}.{FILE}"
-        ci = parse_ci_intervals(ci_filename)
+    if ci is None:
+        ci = intensity_catalog.resolve(arguments[CI])
 
     ###################
     # Water footprint input parameters
     wue = arguments[WUE] if WUE in arguments else None
     ewif = None
     if wue and arguments[EWIF]:
-        if isinstance(arguments[EWIF], float):
-            ewif = arguments[EWIF]
-        else:
-            ewif_filename: str = f"data/intensity/{arguments[EWIF]}.{FILE}"
-            ewif = parse_ci_intervals(ewif_filename)
+        ewif = intensity_catalog.resolve(arguments[EWIF])
     # Land use footprint input parameters
     lue = arguments[LUE] if LUE in arguments else None
     elif_ = None
     if lue and arguments[ELIF]:
-        if isinstance(arguments[ELIF], float):
-            elif_ = arguments[ELIF]
-        else:
-            elif_filename: str = f"data/intensity/{arguments[ELIF]}.{FILE}"
-            elif_ = parse_ci_intervals(elif_filename)
+        elif_ = intensity_catalog.resolve(arguments[ELIF])
 
+    # Further metrics, each with an intensity file or constant and an optional onsite factor
+    metrics: List[IntensityMetric] = []
+    for metric_name, metric_config in (arguments.get(METRICS) or {}).items():
+        intensity = intensity_catalog.resolve(metric_config[METRIC_INTENSITY])
+        metrics.append(IntensityMetric(metric_name, intensity, float(metric_config.get(ONSITE_FACTOR, 0.0))))
     ###################
 
 
     check_reserved_memory_flag: bool = RESERVED_MEMORY in arguments
+    lut_resolution = float(arguments[POWER_LUT_RESOLUTION]) if arguments.get(POWER_LUT_RESOLUTION) else None
+    node_level = bool(arguments.get(NODE_LEVEL_UTILIZATION, False))
 
     op_carbon_result = calculate_carbon_footprint_ccf(
-        tasks_grouped_by_interval=tasks_by_interval, 
+        tasks_grouped_by_interval=tasks_by_interval if pieces is None else pieces, 
         ci=ci, 
         pue=pue, 
         model_name=model_name, 
@@ -95,7 +119,11 @@ def main(arguments: Dict[str, Union[str, float, int]]) -> IchnosResult:
         ewif=ewif, 
         wue=wue, 
         elif_=elif_, 
-        lue=lue
+        lue=lue,
+        lut_resolution=lut_resolution,
+        node_level=node_level,
+        metrics=metrics,
+        lazy_records=lazy_records
     )
     cpu_energy = op_carbon_result.cpu_energy
     cpu_energy_pue = op_carbon_result.cpu_energy_pue
@@ -140,23 +168,30 @@ def main(arguments: Dict[str, Union[str, float, int]]) -> IchnosResult:
     summary += f"- Operational Carbon Emissions: {op_carbon_emissions}gCO2e\n"
     summary += f"- Embodied Carbon Emissions: {emb_carbon_emissions}gCO2e\n"
     summary += f"- Total Carbon Emissions: {total_carbon_emissions}gCO2e\n"
-    
-    print(f"Energy Consumption (exc. PUE): {cpu_energy + static_energy}kWh")
-    print(f"Energy Consumption (inc. PUE): {cpu_energy_pue + (static_energy * pue)}kWh")
-    print(f"Task Memory Energy Consumption (exc. PUE): {mem_energy}kWh")
-    print(f"Task Memory Energy Consumption (inc. PUE): {mem_energy_pue}kWh")
+    if lut_resolution:
+        summary += f"- Power model lookup tables: every {lut_resolution}% utilization, max error {op_carbon_result.power_model_max_error}W\n"
 
-    print(f"Operational Carbon Emissions: {op_carbon_emissions}gCO2e")
-    print(f"Embodied Carbon Emissions: {emb_carbon_emissions}gCO2e")
-    print(f"Total Carbon Emissions: {total_carbon_emissions}gCO2e")
+    console: List[str] = []
+    console.append(f"Energy Consumption (exc. PUE): {cpu_energy + static_energy}kWh")
+    console.append(f"Energy Consumption (inc. PUE): {cpu_energy_pue + (static_energy * pue)}kWh")
+    console.append(f"Task Memory Energy Consumption (exc. PUE): {mem_energy}kWh")
+    console.append(f"Task Memory Energy Consumption (inc. PUE): {mem_energy_pue}kWh")
+
+    console.append(f"Operational Carbon Emissions: {op_carbon_emissions}gCO2e")
+    console.append(f"Embodied Carbon Emissions: {emb_carbon_emissions}gCO2e")
+    console.append(f"Total Carbon Emissions: {total_carbon_emissions}gCO2e")
 
     if wue:
         summary += f"- Total Water Footprint: {op_water_emissions}\n"
-        print(f"Total Water Footprint: {op_water_emissions} Liters")
+        console.append(f"Total Water Footprint: {op_water_emissions} Liters")
 
     if lue:
         summary += f"- Total Land Use Footprint: {op_land_emissions}\n"
-        print(f"Total Land Use Footprint: {op_land_emissions} square meters")
+        console.append(f"Total Land Use Footprint: {op_land_emissions} square meters")
+
+    for metric in metrics:
+        summary += f"- Total {metric.name} Footprint: {op_carbon_result.metric_totals[metric.name]}\n"
+        console.append(f"Total {metric.name} Footprint: {op_carbon_result.metric_totals[metric.name]}")
 
     if check_reserved_memory_flag:
         total_energy: float = cpu_energy + mem_energy
@@ -165,23 +200,18 @@ def main(arguments: Dict[str, Union[str, float, int]]) -> IchnosResult:
         # energy_split_report: str = f"% CPU [{((cpu_energy / total_energy) * 100):.2f}%] | % Memory [{((mem_energy / total_energy) * 100):.2f}%]"
         summary += f"\n{res_report}\n"
         # summary += f"{energy_split_report}\n"
-        print(res_report)
+        console.append(res_report)
         # print(energy_split_report)
 
-    # Report Summary
-    if isinstance(ci, float):
-        ci = str(int(ci))
-    else:
-        ci = arguments[CI]
-
-    write_summary_file("output", workflow + "-" + ci + "-" + model_name, summary)
-    write_task_trace_and_rank_report("output", workflow + "-" + ci + "-" + model_name, records_res)
+    if verbose:
+        print('\n'.join(console))
 
-    return IchnosResult(
+    ichnos_result = IchnosResult(
         summary=summary,
         operational_emissions=op_carbon_result.carbon_emissions,
         embodied_emissions=emb_carbon_emissions
     )
+    return ichnos_result, records_res
 
 
 def get_carbon_footprint(command: str) -> IchnosResult:
@@ -1,61 +1,163 @@
 #!/usr/bin/env python3
 """Batch convert all Nextflow trace CSV files under data/trace into IchnosTrace CSVs.
 
-For every *.csv in data/trace, we parse it using IchnosTrace.from_nextflow_trace_csv
-and output a corresponding CSV with the same filename into data/ichnos_traces.
-Existing files are overwritten. Empty outputs still contain a header.
+For every *.csv in data/trace (optionally compressed as .csv.gz, .csv.xz or
+.csv.bz2), we stream it through iter_nextflow_trace and output a corresponding
+CSV with the same filename into data/ichnos_traces. Empty outputs still contain
+a header. Use --compress gz|xz|bz2 to write compressed outputs.
+
+Conversion is incremental: the SHA-256 of every converted source is recorded in a
+manifest in the output folder, and a file is skipped when its output is newer than
+the source and the recorded hash still matches. Use --force to convert everything.
+Files can be converted in parallel with --workers N. Each file is streamed in
+chunks of --chunk-size records, so memory use does not grow with the trace size.
+
+Usage:
+  python -m src.scripts.NFTracesToIchnos [--workers N] [--force] [--chunk-size N] [--compress CODEC]
 """
+import argparse
+import json
 import os
 import glob
-from src.models.IchnosTrace import IchnosTrace
-import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from src.models.IchnosTrace import IchnosTrace, iter_nextflow_trace, DEFAULT_CHUNK_SIZE
+from src.utils.TraceCache import file_hash
+from src.utils.Compression import CODECS, detect_compression, strip_compression_suffix, with_compression_suffix
+
+MANIFEST_FILE = '.conversion-manifest.json'
+TRACE_PATTERNS = ['*.csv'] + [f'*.csv.{codec}' for codec in CODECS]
+
+
+@dataclass
+class ConversionResult:
+    source: str
+    dest: str
+    status: str  # 'converted', 'skipped' or 'failed'
+    rows: int = 0
+    size_bytes: int = 0
+    seconds: float = 0.0
+    source_hash: Optional[str] = None
+    error: Optional[str] = None
+
+
+def convert_file(src: str, dest: str, recorded_hash: Optional[str] = None, force: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE, compression: Optional[str] = None) -> ConversionResult:
+    """Convert one Nextflow trace to an IchnosTrace CSV unless its output is up to date.
+
+    The output is considered up to date when it is newer than the source and the
+    source hash matches recorded_hash. Compressed sources are decompressed while
+    streaming; the output is compressed with compression if given. The output is
+    written to a temporary file and replaces dest only if the conversion succeeds.
+    """
+    size_bytes = os.path.getsize(src)
+    source_hash = file_hash(src)
+    if not force and recorded_hash == source_hash and os.path.exists(dest) \
+            and os.path.getmtime(dest) >= os.path.getmtime(src):
+        return ConversionResult(src, dest, 'skipped', size_bytes=size_bytes, source_hash=source_hash)
 
+    started = time.perf_counter()
+    # write next to dest and move it into place only once the whole trace converted,
+    # so a failing row never leaves a truncated output behind
+    tmp_dest = f"{dest}.{os.getpid()}.tmp"
+    try:
+        rows = IchnosTrace.to_csv_chunks(iter_nextflow_trace(src, chunk_size), tmp_dest, compression or detect_compression(dest, check_magic=False))
+        os.replace(tmp_dest, dest)
+    except Exception as e:
+        if os.path.exists(tmp_dest):
+            os.remove(tmp_dest)
+        return ConversionResult(src, dest, 'failed', size_bytes=size_bytes, error=str(e))
+    return ConversionResult(src, dest, 'converted', rows=rows, size_bytes=size_bytes,
+                            seconds=time.perf_counter() - started, source_hash=source_hash)
 
-def convert_all(trace_dir: str, out_dir: str):
+
+def convert_files(csv_files: List[str], out_dir: str, workers: int = 1, force: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE, compression: Optional[str] = None) -> int:
+    """Convert the given Nextflow traces into out_dir, optionally with a process pool.
+
+    Prints a per-file throughput summary and returns the total number of rows written.
+    """
     os.makedirs(out_dir, exist_ok=True)
-    csv_files = sorted(glob.glob(os.path.join(trace_dir, '*.csv')))
-    if not csv_files:
-        print(f"No trace CSV files found in {trace_dir}")
-        return 0
+    manifest = _load_manifest(out_dir)
+    jobs = [
+        (src, _output_path(src, out_dir, compression), manifest.get(os.path.basename(src)), force, chunk_size, compression)
+        for src in csv_files
+    ]
+
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(convert_file, *zip(*jobs)))
+    else:
+        results = [convert_file(*job) for job in jobs]
+
     count_total = 0
-    for src in csv_files:
-        try:
-            traces = IchnosTrace.from_nextflow_trace_csv(src)
-        except Exception as e:
-            print(f"[WARN] Failed to parse {os.path.basename(src)}: {e}")
+    for result in results:
+        name = os.path.basename(result.source)
+        if result.status == 'failed':
+            print(f"[WARN] Failed to parse {name}: {result.error}")
+            manifest.pop(name, None)  # convert it again next time, whatever dest holds
+            continue
+        manifest[name] = result.source_hash
+        if result.status == 'skipped':
+            print(f"Skipped {name}: output up to date")
             continue
-        dest = os.path.join(out_dir, os.path.basename(src))
-        IchnosTrace.to_csv(traces, dest)
-        rel_dest = os.path.relpath(dest, os.getcwd())
-        print(f"Converted {os.path.basename(src)}: {len(traces)} rows -> {rel_dest}")
-        count_total += len(traces)
+        rel_dest = os.path.relpath(result.dest, os.getcwd())
+        rows_per_s = result.rows / result.seconds if result.seconds else 0.0
+        mb_per_s = result.size_bytes / 1e6 / result.seconds if result.seconds else 0.0
+        print(f"Converted {name}: {result.rows} rows -> {rel_dest} "
+              f"({result.seconds:.2f}s, {rows_per_s:.0f} rows/s, {mb_per_s:.1f} MB/s)")
+        count_total += result.rows
+
+    _save_manifest(out_dir, manifest)
     return count_total
 
 
-def convert_contains(trace_dir: str, out_dir: str, pattern: str):
-    os.makedirs(out_dir, exist_ok=True)
-    csv_files = sorted(glob.glob(os.path.join(trace_dir, '*.csv')))
+def convert_all(trace_dir: str, out_dir: str, workers: int = 1, force: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE, compression: Optional[str] = None):
+    csv_files = _find_traces(trace_dir)
     if not csv_files:
         print(f"No trace CSV files found in {trace_dir}")
         return 0
-    count_total = 0
-    for src in csv_files:
-        if pattern in src:
-            try:
-                traces = UniversalTrace.from_nextflow_trace_csv(src)
-            except Exception as e:
-                print(f"[WARN] Failed to parse {os.path.basename(src)}: {e}")
-                continue
-            dest = os.path.join(out_dir, os.path.basename(src))
-            UniversalTrace.to_csv(traces, dest)
-            rel_dest = os.path.relpath(dest, os.getcwd())
-            print(f"Converted {os.path.basename(src)}: {len(traces)} rows -> {rel_dest}")
-            count_total += len(traces)
-    return count_total
+    return convert_files(csv_files, out_dir, workers, force, chunk_size, compression)
+
+
+def convert_contains(trace_dir: str, out_dir: str, pattern: str, workers: int = 1, force: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE, compression: Optional[str] = None):
+    csv_files = [src for src in _find_traces(trace_dir) if pattern in src]
+    if not csv_files:
+        print(f"No trace CSV files matching [{pattern}] found in {trace_dir}")
+        return 0
+    return convert_files(csv_files, out_dir, workers, force, chunk_size, compression)
+
+
+def _find_traces(trace_dir: str) -> List[str]:
+    return sorted(src for pattern in TRACE_PATTERNS for src in glob.glob(os.path.join(trace_dir, pattern)))
+
+
+def _output_path(src: str, out_dir: str, compression: Optional[str]) -> str:
+    name = strip_compression_suffix(os.path.basename(src))
+    return with_compression_suffix(os.path.join(out_dir, name), compression)
+
+
+def _load_manifest(out_dir: str) -> Dict[str, str]:
+    try:
+        with open(os.path.join(out_dir, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(out_dir: str, manifest: Dict[str, str]) -> None:
+    with open(os.path.join(out_dir, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
 
 
 if __name__ == '__main__':
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--workers', type=int, default=1, help='Number of conversion processes')
+    ap.add_argument('--force', action='store_true', help='Convert files even if their output is up to date')
+    ap.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Records held in memory per file while converting')
+    ap.add_argument('--compress', choices=sorted(CODECS), default=None, help='Compress the converted traces with this codec')
+    args = ap.parse_args()
     trace_dir = 'data/trace'
     out_dir = 'data/ichnos_traces'
-    total = convert_all(trace_dir, out_dir)
+    total = convert_all(trace_dir, out_dir, workers=args.workers, force=args.force, chunk_size=args.chunk_size, compression=args.compress)
     print(f"Done. Total IchnosTrace rows written: {total}")
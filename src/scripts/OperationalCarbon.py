@@ -1,99 +1,177 @@
-from typing import Callable, Dict, List, Tuple, Union
+from typing import Dict, List, Tuple, Union
 from src.models.IchnosTrace import IchnosTrace
-from src.models.ProcessedTrace import ProcessedTrace
+from src.models.ClippedTask import ClippedTask
+from src.models.ProcessedTraceTable import ProcessedTraceTable
 from src.models.TaskEnergyResult import TaskEnergyResult
+from src.models.StaticEnergyResult import StaticEnergyResult
+from src.models.PowerLookupTable import PowerLookupTable
 from src.models.OperationalCarbonResult import OperationalCarbonResult
 from src.models.TaskExtractionResult import TaskExtractionResult
-from src.utils.TimeUtils import to_timestamp, extract_tasks_by_interval
-from src.utils.PowerModel import get_power_model_for_node
+from src.models.TaskPieces import TaskPieces
+from src.models.IntervalEnergy import IntervalEnergy
+from src.models.CarbonIntensitySeries import CarbonIntensitySeries
+from src.models.IntensityMetric import IntensityMetric
+from src.utils.TimeUtils import extract_tasks_by_interval
+from src.utils.PowerModel import power_model_registry
+from src.utils.MathModels import evaluate_polynomials
+from src.utils.BusyIntervals import merge_busy_intervals, busy_time_per_bucket
+from src.utils.ConcurrentUtilization import attribute_node_power
+from src.utils.IntensityMatrix import intensity_per_interval, intensity_matrix, metric_footprints
 from src.utils.NodeConfigModelReader import get_memory_draw, get_system_cores, get_system_memory
-from src.utils.Parsers import parse_ci_intervals, parse_arguments_with_config
+from src.utils.Parsers import parse_arguments_with_config
+from src.utils.IntensityCatalog import intensity_catalog
 from src.Constants import *
 from datetime import datetime
 
+import numpy as np
 import sys
 
-# find time when tasks are actively running
-def compute_active_time_per_host(tasks: List[IchnosTrace]) -> Dict[str, float]:
-    tasks_by_host: Dict[str, List[Tuple[float, float]]] = {}
+# Estimate Energy Consumption for all task pieces at once
+def estimate_pieces_energy_consumption_ccf(pieces: TaskPieces, coefficients: np.ndarray, model_name: str, memory_coefficients: np.ndarray, system_cores: np.ndarray, lookup_table: PowerLookupTable = None, node_level: bool = False) -> TaskEnergyResult:
+    """
+    Estimate the energy consumptions of all task pieces at once.
 
-    for task in tasks:
-        host: str = task.hostname
-        start_ts: float = float(task.start)
-        end_ts: float = float(task.end)
-        if host in tasks_by_host:
-            tasks_by_host[host].append((start_ts, end_ts))
-        else:
-            tasks_by_host[host] = [(start_ts, end_ts)]
+    The per-host power model coefficients are gathered by host code and
+    evaluated for every piece in a single pass.
 
-    active_time_by_host: Dict[str, float] = {}
+    With node_level set, the utilization of all pieces running concurrently on a
+    host is summed (capped at its cores) and the power model is evaluated on the
+    total, once per segment of constant utilization; each piece gets the share of
+    the segment energy proportional to its utilization (see ConcurrentUtilization).
+    This only differs from the per-piece estimate for non-linear models or when
+    the cores are oversubscribed.
 
-    for host, intervals in tasks_by_host.items():
-        if not intervals:
-            continue
+    :param pieces: TaskPieces to estimate.
+    :param coefficients: Power model coefficients [a_n, ..., a_0] per host, shape (len(pieces.hosts), n + 1).
+    :param model_name: Name of the power model.
+    :param memory_coefficients: Memory power draw (W/GB) per host.
+    :param system_cores: no. of cores per host.
+    :param lookup_table: Optional sampled power models per host, used instead of evaluating the polynomials.
+    :param node_level: Evaluate the power model on the concurrent utilization of each host.
+    :return: TaskEnergyResult holding arrays of core and memory energy consumption in kWh per piece.
+    """
+    host_cores = np.where(system_cores > 0, system_cores, 32)
+    baseline = 'baseline' in model_name
+
+    def power(host_codes: np.ndarray, avg_cpu_usage: np.ndarray) -> np.ndarray:
+        # nextflow reports usage as overall utilisation; the baseline model takes it as is
+        cpu_usage = avg_cpu_usage if baseline else avg_cpu_usage / host_cores[host_codes]
+        if lookup_table is not None:
+            return lookup_table.evaluate(host_codes, cpu_usage)
+        return evaluate_polynomials(coefficients[host_codes], cpu_usage)
+
+    time_h = pieces.duration_h
+    if node_level:
+        energy = attribute_node_power(pieces.start, pieces.end, pieces.avg_cpu_usage, pieces.host_codes, host_cores * 100.0, power)
+        core_consumption = energy / 1000 / 3600 * 0.001  # convert from W*ms to kWh
+    else:
+        core_consumption = time_h * power(pieces.host_codes, pieces.avg_cpu_usage) * 0.001
+    memory = pieces.memory / 1073741824
+    memory_consumption = memory * memory_coefficients[pieces.host_codes] * time_h * 0.001
+    return TaskEnergyResult(core_consumption=core_consumption, memory_consumption=memory_consumption)
 
-        intervals.sort(key=lambda x: x[0])  # sort by start timestamp
-        merged: List[Tuple[float, float]] = []
-        current_start, current_end = intervals[0]
 
-        for start, end in intervals[1:]:
-            if start <= current_end:  # overlap or contiguous
-                current_end = max(current_end, end)
-            else:
-                merged.append((current_start, current_end))
-                current_start, current_end = start, end
-        merged.append((current_start, current_end))
+# Busy time of all hosts and intervals at once
+def busy_hours_per_interval(pieces: TaskPieces) -> np.ndarray:
+    """
+    Time each host is busy (runs at least one task piece) in every interval.
 
-        total_ms: float = sum(end - start for start, end in merged)
-        active_time_by_host[host] = total_ms / 1000 / 3600  # return time in hours
+    The pieces of each host are sorted and merged into busy intervals once, then
+    the busy time is attributed to the accounting intervals (see BusyIntervals).
 
-    return active_time_by_host
+    :param pieces: TaskPieces of the workflow.
+    :return: Busy hours, shape (intervals, hosts).
+    """
+    merged = merge_busy_intervals(pieces.start, pieces.end, pieces.host_codes)
+    busy_ms = busy_time_per_bucket(*merged, _interval_edges(pieces), len(pieces.hosts))
+    return busy_ms / 1000 / 3600
 
 
-# Estimate Energy Consumption (accept IchnosTrace)
-def estimate_task_energy_consumption_ccf(task: IchnosTrace, model: Callable[[float], float], model_name: str, memory_coefficient: float, system_cores: int) -> TaskEnergyResult:
+# Estimate Static Energy Consumption of all hosts and intervals at once
+def estimate_static_energy_consumption(pieces: TaskPieces, static_watts: np.ndarray, memory_coefficients: np.ndarray, node_memory: np.ndarray) -> StaticEnergyResult:
     """
-    Estimate the energy consumptions for a task.
-    
-    :param task: IchnosTrace task record.
-    :param model: Power model function.
-    :param model_name: Name of the power model.
-    :param memory_coefficient: Coefficient for memory power draw.
-    :param system_cores: no. of cores on the system utilised. 
-    :return: TaskEnergyResult object containing core and memory energy consumption in kWh.
+    Estimate the static CPU and node memory energy of every host in every interval.
+
+    A host draws static power while at least one of its task pieces runs
+    (see busy_hours_per_interval).
+
+    :param pieces: TaskPieces of the workflow.
+    :param static_watts: Static CPU power draw per host (W).
+    :param memory_coefficients: Memory power draw (W/GB) per host.
+    :param node_memory: Memory of each host (GB).
+    :return: StaticEnergyResult with (intervals x hosts) arrays in kWh.
     """
-    if not system_cores:
-        system_cores = 32
-
-    # Time (h)
-    time_h: float = (task.end - task.start) / 1000 / 3600  # convert from ms to hours
-    # CPU Usage (%)
-    cpu_usage: float = task.avg_cpu_usage / system_cores  # nextflow reports as overall utilisation
-    # Memory (GB)
-    memory: float = (task.memory or 0.0) / 1073741824  # memory reported in bytes 
-    # Core Energy Consumption (without PUE)
-    core_consumption: float = time_h * model(cpu_usage) * 0.001  # convert from W to kW
-    if 'baseline' in model_name:
-        # model = baseline, model = TDP
-        # https://github.com/nextflow-io/nf-co2footprint/blob/master/src/main/nextflow/co2footprint/CO2FootprintComputer.groovy
-        core_consumption: float = time_h * model(task.avg_cpu_usage) * 0.001 
-    # Memory Power Consumption (without PUE)
-    memory_consumption: float = memory * memory_coefficient * time_h * 0.001  # convert from W to kW
-    # Overall and Memory Consumption (kWh) (without PUE)
-    return TaskEnergyResult(core_consumption=core_consumption, memory_consumption=memory_consumption)
+    busy_hours = busy_hours_per_interval(pieces)
+    return StaticEnergyResult(
+        busy_hours=busy_hours,
+        cpu_energy=busy_hours * static_watts * 0.001,  # convert from Wh to kWh
+        memory_energy=busy_hours * memory_coefficients * node_memory * 0.001  # convert from Wh to kWh
+    )
+
+
+# Estimate Energy per Interval
+def estimate_interval_energy(tasks_grouped_by_interval: Dict[int, List[Union[IchnosTrace, ClippedTask]]], pue: float, model_name: str, lut_resolution: float = None, node_level: bool = False) -> IntervalEnergy:
+    """
+    Estimate the dynamic and static energy of every interval that has tasks.
+
+    With one intensity value per interval (as calculate_carbon_footprint_ccf with
+    time_weighted=False), the carbon emissions are the dot product of the carbon
+    weights with those values, so schedules can be scored without going back to
+    the tasks.
+
+    :param tasks_grouped_by_interval: Dict mapping interval start to list of tasks.
+    :param pue: Power usage effectiveness.
+    :param model_name: Power model name.
+    :param lut_resolution: Evaluate the power models from lookup tables sampled every lut_resolution percent utilization.
+    :param node_level: Apply the power models to the summed utilization of concurrent tasks per host.
+    :return: IntervalEnergy of the active intervals, in interval order.
+    """
+    pieces = TaskPieces.from_tasks_by_interval(tasks_grouped_by_interval)
+    hosts = pieces.hosts
+
+    coefficients, static_watts = power_model_registry.get_many(hosts, model_name)
+    node_memory_coeffs = np.array([get_memory_draw(node, model_name) for node in hosts], dtype=np.float64)
+    node_system_cores = np.array([get_system_cores(node) or 0 for node in hosts], dtype=np.int64)
+    node_memory = np.array([get_system_memory(node) for node in hosts], dtype=np.float64)
+    lookup_table = power_model_registry.get_lookup_table(hosts, model_name, lut_resolution) if lut_resolution else None
+
+    energy_result = estimate_pieces_energy_consumption_ccf(pieces, coefficients, model_name, node_memory_coeffs, node_system_cores, lookup_table, node_level)
+    energy_pue = energy_result.core_consumption * pue + energy_result.memory_consumption * pue
+    n_intervals = len(pieces.interval_starts)
+    dynamic = np.bincount(pieces.interval_index, weights=energy_pue, minlength=n_intervals)
+    static = estimate_static_energy_consumption(pieces, static_watts, node_memory_coeffs, node_memory).cpu_energy.sum(axis=1)
+
+    active = np.bincount(pieces.interval_index, minlength=n_intervals) > 0
+    return IntervalEnergy(pieces.interval_starts[active], dynamic[active], static[active])
 
 
 # Estimate Carbon Footprint 
-def calculate_carbon_footprint_ccf(tasks_grouped_by_interval: Dict[datetime, List[IchnosTrace]], ci: Union[float, Dict[str, float]], pue: float, model_name: str, memory_coefficient: float, unique_nodes: List[str], check_node_memory: bool = False, ewif: Union[float, Dict[str, float]]= None, wue: float = None, elif_: Union[float, Dict[str, float]] = None, lue: float = None ) -> OperationalCarbonResult:
+def calculate_carbon_footprint_ccf(tasks_grouped_by_interval: Union[Dict[datetime, List[Union[IchnosTrace, ClippedTask]]], TaskPieces], ci: Union[float, Dict[str, float], CarbonIntensitySeries], pue: float, model_name: str, memory_coefficient: float, unique_nodes: List[str], check_node_memory: bool = False, ewif: Union[float, Dict[str, float], CarbonIntensitySeries]= None, wue: float = None, elif_: Union[float, Dict[str, float], CarbonIntensitySeries] = None, lue: float = None, time_weighted: bool = True, lut_resolution: float = None, node_level: bool = False, metrics: List[IntensityMetric] = None, lazy_records: bool = False) -> OperationalCarbonResult:
     """
     Calculate the carbon footprint using the CCF methodology.
+
+    The task pieces of all intervals are flattened into arrays and their energy is
+    computed with array operations. Carbon, water, land and any further metrics
+    are resolved into one intensity matrix and applied to the energies in a single
+    pass (see IntensityMatrix).
+
+    Intensities given as a CarbonIntensitySeries are integrated over each task
+    piece (time-weighted mean over [start, end)), so the accounting interval does
+    not need to match the period of the intensity data. Static energy uses the mean
+    over the span of the pieces in its interval. Constants and dicts are looked up
+    by interval start.
     
-    :param tasks_grouped_by_interval: Dict mapping interval to list of tasks.
-    :param ci: Carbon intensity as a float or dict.
+    :param tasks_grouped_by_interval: Dict mapping interval to list of tasks, or their TaskPieces (e.g. shifted with TaskPieces.shift).
+    :param ci: Carbon intensity as a float, a CarbonIntensitySeries or a dict keyed by interval start (ms or 'MM/DD-HH:MM').
     :param pue: Power usage effectiveness.
     :param model_name: Power model name.
     :param memory_coefficient: Memory power draw coefficient.
     :param unique_nodes: List of unique nodes used to execute workflow tasks.
+    :param time_weighted: Set to False to look up series values by interval start as well.
+    :param lut_resolution: Evaluate the power models from lookup tables sampled every lut_resolution percent utilization.
+    :param node_level: Apply the power models to the summed utilization of concurrent tasks per host.
+    :param metrics: Further IntensityMetric objects to evaluate alongside carbon, water and land; totals are in metric_totals.
+    :param lazy_records: Return the records as a ProcessedTraceTable that builds ProcessedTrace rows on demand, e.g. when only totals are needed.
     :return: Tuple containing aggregated metrics and a list of processed tasks.
     """
     # Ensure wue and ewif are both provided together or both None
@@ -102,151 +180,104 @@ def calculate_carbon_footprint_ccf(tasks_grouped_by_interval: Dict[datetime, Lis
     # Ensure lue and elif_ are both provided together or both None
     if (lue is None) != (elif_ is None):
         raise ValueError("Both lue and elif_ must be provided together.")
-    total_energy: float = 0.0
-    total_energy_pue: float = 0.0
-    total_memory_energy: float = 0.0
-    total_memory_energy_pue: float = 0.0
-    total_carbon_emissions: float = 0.0
-    # adding water and land use footprint when available
-    total_water_emissions: float = 0.0 if (wue and ewif) else None
-    total_land_emissions: float = 0.0 if (lue and elif_) else None
-
-    records: List[ProcessedTrace] = []
-    node_power_models: Dict[str, Callable[[float], float]] = {}
-    node_memory_coeffs: Dict[str, float] = {}
-    node_system_cores: Dict[str, int] = {}
-    node_memory: Dict[str, float] = {}
-
-    for node in unique_nodes: 
-        node_power_models[node] = get_power_model_for_node(node, model_name)
-        node_memory_coeffs[node] = get_memory_draw(node, model_name)
-        node_system_cores[node] = get_system_cores(node)
-        node_memory[node] = get_system_memory(node)
-
-    static_energy = {}
-    static_memory_energy = 0.0
-    static_memory_emissions = 0.0
-    total_static_cpu_emissions: float = 0.0
-
-    for group_interval, tasks in tasks_grouped_by_interval.items():
-        if tasks:
-            # determine the intensity key
-            interval_static_energy: float = 0.0 
-            
-            hour_ts = to_timestamp(group_interval)
-            hh: str = str(hour_ts.hour).zfill(2)
-            month: str = str(hour_ts.month).zfill(2)
-            day: str = str(hour_ts.day).zfill(2)
-            mm: str = str(hour_ts.minute).zfill(2)
-            intensity_key: str = f'{month}/{day}-{hh}:{mm}'
-
-            # fetching ci value
-            if isinstance(ci, float):
-                ci_val: float = ci
-            else:
-                ci_val = ci[intensity_key] 
-            
-            ###################
-            # fetching ewif value
-            
-            ewif_val = None
-            if ewif:
-                if isinstance(ewif, float):
-                    ewif_val: float = ewif
-                else:
-                    ewif_val = ewif[intensity_key]
-
-            # fetching elif value
-            elif_val = None
-            if elif_ :
-                if isinstance(elif_, float):
-                    elif_val: float = elif_
-                else:
-                    elif_val = elif_[intensity_key]
-            ###################
-
-            for task in tasks:
-                host = task.hostname
-                power_model = node_power_models[host][0]
-                memory_coefficient = node_memory_coeffs[host]
-                system_cores = node_system_cores[host]
-                energy_result = estimate_task_energy_consumption_ccf(task, power_model, model_name, memory_coefficient, system_cores)
-                energy_core, energy_mem = energy_result.core_consumption, energy_result.memory_consumption
-                energy_core_pue: float = energy_core * pue
-                energy_mem_pue: float = energy_mem * pue
-                task_footprint: float = (energy_core_pue + energy_mem_pue) * ci_val
-                total_energy += energy_core
-                total_energy_pue += energy_core_pue
-                total_memory_energy += energy_mem
-                total_memory_energy_pue += energy_mem_pue
-                total_carbon_emissions += task_footprint
-
-                ###################
-                # adding water footprint when available
-                task_water_footprint = None
-                if wue and ewif:
-                    task_water_footprint_onsite: float = (energy_core + energy_mem) * wue # kWh * (L/kWh) = L
-                    task_water_footprint_offsite: float = (energy_core_pue + energy_mem_pue) * ewif_val # kWh * (L/kWh) = L
-                    task_water_footprint: float = task_water_footprint_onsite + task_water_footprint_offsite # kWh * (L/kWh) = L
-                    total_water_emissions += task_water_footprint
-                # adding land use footprint when available
-                task_land_footprint = None
-                if lue and elif_:
-                    task_land_footprint_onsite: float = (energy_core + energy_mem) * lue  # kWh * (m2/kWh) = m2
-                    task_land_footprint_offsite: float = (energy_core_pue + energy_mem_pue) * elif_val # kWh * (m2/kWh) = m2
-                    task_land_footprint: float = task_land_footprint_onsite + task_land_footprint_offsite # kWh * (m2/kWh) = m2
-                    total_land_emissions += task_land_footprint
-                ###################
-
-                records.append(ProcessedTrace(
-                    ichnos=task,
-                    core_kwh=energy_core,
-                    mem_kwh=energy_mem,
-                    average_co2e=task_footprint,
-                    marginal_co2e=task_footprint,
-                    embodied_co2e=0.0,
-                    avg_ci=ci_val, 
-                    average_water=task_water_footprint, # in Liters
-                    avg_ewif=ewif_val,
-                    average_land=task_land_footprint, # in square meters
-                    avg_elif=elif_val,
-                ))
-
-            # static power consumption over active periods
-            active_time_per_host = compute_active_time_per_host(tasks)
-
-            # compute static cpu power consumption for each host over workflow execution
-            for host in active_time_per_host.keys():
-                energy = active_time_per_host[host] * node_power_models[host][1] * 0.001  # convert from W to kWh
-                interval_static_energy += energy
-
-                if host in static_energy:
-                    static_energy[host] += energy
-                else:
-                    static_energy[host] = energy
-
-                curr_energy = active_time_per_host[host] * node_memory_coeffs[host] * node_memory[host] * 0.001   # convert from Wh to kWh
-                static_memory_energy += curr_energy
-                static_memory_emissions += curr_energy * ci_val
-
-            # static energy --> attribute to carbon emissions:
-            total_static_cpu_emissions += interval_static_energy * ci_val
+
+    if isinstance(tasks_grouped_by_interval, TaskPieces):
+        pieces = tasks_grouped_by_interval
+    else:
+        pieces = TaskPieces.from_tasks_by_interval(tasks_grouped_by_interval)
+    hosts = pieces.hosts
+
+    coefficients, static_watts = power_model_registry.get_many(hosts, model_name)
+    node_memory_coeffs = np.array([get_memory_draw(node, model_name) for node in hosts], dtype=np.float64)
+    node_system_cores = np.array([get_system_cores(node) or 0 for node in hosts], dtype=np.int64)
+    node_memory = np.array([get_system_memory(node) for node in hosts], dtype=np.float64)
+
+    # intensities per interval, only resolved for intervals that have tasks
+    active = np.bincount(pieces.interval_index, minlength=len(pieces.interval_starts)) > 0
+    ci_by_interval = intensity_per_interval(ci, pieces, active, time_weighted)
+
+    # dynamic energy and footprints per piece
+    lookup_table = power_model_registry.get_lookup_table(hosts, model_name, lut_resolution) if lut_resolution else None
+    energy_result = estimate_pieces_energy_consumption_ccf(pieces, coefficients, model_name, node_memory_coeffs, node_system_cores, lookup_table, node_level)
+    energy_core, energy_mem = energy_result.core_consumption, energy_result.memory_consumption
+    energy_core_pue = energy_core * pue
+    energy_mem_pue = energy_mem * pue
+
+    # footprints of all metrics per piece: carbon, then water and land when given (a factor of 0 counts as not given), then any extra metrics
+    all_metrics = [IntensityMetric('carbon', ci)]
+    if ewif:
+        all_metrics.append(IntensityMetric('water', ewif, wue or 0.0))  # kWh * (L/kWh) = L
+    if elif_:
+        all_metrics.append(IntensityMetric('land', elif_, lue or 0.0))  # kWh * (m2/kWh) = m2
+    all_metrics.extend(metrics or [])
+    names = [metric.name for metric in all_metrics]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate metric names: {names}")
+    intensities = intensity_matrix(all_metrics, pieces, active, time_weighted)
+    onsite_factors = np.array([metric.onsite_factor for metric in all_metrics])
+    footprints = metric_footprints(energy_core + energy_mem, energy_core_pue + energy_mem_pue, intensities, onsite_factors)
+    column = {name: k for k, name in enumerate(names)}
+
+    ci_vals = intensities[:, 0]
+    task_footprints = footprints[:, 0]
+    ewif_vals = intensities[:, column['water']] if ewif else None
+    elif_vals = intensities[:, column['land']] if elif_ else None
+    # water and land footprints are only reported with their onsite factor
+    task_water_footprints = footprints[:, column['water']] if wue and ewif else None
+    task_land_footprints = footprints[:, column['land']] if lue and elif_ else None
+    total_water_emissions: float = float(task_water_footprints.sum()) if task_water_footprints is not None else None
+    total_land_emissions: float = float(task_land_footprints.sum()) if task_land_footprints is not None else None
+
+    records = ProcessedTraceTable(pieces.tasks, energy_core, energy_mem, task_footprints, ci_vals, task_water_footprints, ewif_vals, task_land_footprints, elif_vals)
+    if not lazy_records:
+        records = records.to_records()
+
+    # static power consumption over active periods, per interval and host
+    static_result = estimate_static_energy_consumption(pieces, static_watts, node_memory_coeffs, node_memory)
+    static_cpu_by_interval = static_result.cpu_energy[active].sum(axis=1)
+    static_mem_by_interval = static_result.memory_energy[active].sum(axis=1)
+    static_energy = dict(zip(hosts, static_result.cpu_energy.sum(axis=0).tolist()))
+    static_memory_energy = static_mem_by_interval.sum()
+    static_memory_emissions = (static_mem_by_interval * ci_by_interval[active]).sum()
+    # static energy --> attribute to carbon emissions:
+    total_static_cpu_emissions = float((static_cpu_by_interval * ci_by_interval[active]).sum())
 
     return OperationalCarbonResult(
-        cpu_energy=total_energy,
-        cpu_energy_pue=total_energy_pue,
-        memory_energy=total_memory_energy,
-        memory_energy_pue=total_memory_energy_pue,
-        carbon_emissions=total_carbon_emissions + total_static_cpu_emissions, 
+        cpu_energy=float(energy_core.sum()),
+        cpu_energy_pue=float(energy_core_pue.sum()),
+        memory_energy=float(energy_mem.sum()),
+        memory_energy_pue=float(energy_mem_pue.sum()),
+        carbon_emissions=float(task_footprints.sum()) + total_static_cpu_emissions, 
         water_emissions=total_water_emissions, # in Liters
         land_emissions=total_land_emissions, # in square meters
         static_cpu_energy_per_host=static_energy,
-        static_mem_energy=static_memory_energy,
-        static_mem_emissions=static_memory_emissions,
-        records=records
+        static_mem_energy=float(static_memory_energy),
+        static_mem_emissions=float(static_memory_emissions),
+        records=records,
+        power_model_max_error=float(lookup_table.max_error.max(initial=0.0)) if lookup_table is not None else None,
+        metric_totals=dict(zip(names, footprints.sum(axis=0).tolist()))
     )
 
 
+##################################
+# MARK: Private functions
+##################################
+
+def _interval_edges(pieces: TaskPieces) -> np.ndarray:
+    """
+    Boundaries of the accounting intervals: every interval starts where the previous
+    one ends, and the last one ends with its last piece.
+
+    :param pieces: TaskPieces of the intervals.
+    :return: Array of len(pieces.interval_starts) + 1 boundaries in ms.
+    """
+    starts = pieces.interval_starts
+    if len(starts) == 0:
+        return starts
+    last_end = max(int(starts[-1]), int(pieces.end.max()) if len(pieces) else int(starts[-1]))
+    return np.append(starts, last_end)
+
+
 if __name__ == "__main__":
     # Parse Arguments
     args: List[str] = sys.argv[1:]
@@ -266,11 +297,7 @@ if __name__ == "__main__":
     tasks_by_interval = task_extraction_result.tasks_by_interval
     unique_nodes = list({task.hostname for task in task_extraction_result.all_tasks})
 
-    if isinstance(arguments[CI], float):
-        ci = arguments[CI]
-    else:
-        ci_filename: str = f"data/intensity/{arguments[CI]}.{FILE}"
-        ci = parse_ci_intervals(ci_filename)
+    ci = intensity_catalog.resolve(arguments[CI])
 
     check_reserved_memory_flag: bool = RESERVED_MEMORY in arguments
 
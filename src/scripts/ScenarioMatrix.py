@@ -0,0 +1,225 @@
+"""
+Evaluate the operational footprint of one trace under many scenarios, i.e.
+combinations of carbon intensity, PUE and power model, in a single pass.
+
+The trace is parsed, bucketed into intervals and flattened into task pieces
+once. Energies are computed once per distinct power model and intensities once
+per distinct CI, after which the footprint of every (model, CI) pair is a
+matrix product and the PUE is applied to all scenarios by broadcasting, so a
+large sweep costs little more than a single IchnosCF run. Results are written as
+one tidy CSV table with a row per scenario.
+
+Scenarios are given as a grid in a YAML config (every combination of the listed
+values) and/or as an explicit list under 'scenarios':
+
+  trace: mag-3
+  interval: 60
+  ci: [ci, 150.0]
+  pue: [1.0, 1.2, 1.5]
+  model-name: [default_minmax, default_linear]
+  scenarios:
+    - {ci: 200.0, pue: 1.1, model-name: default_quadratic}
+
+Usage:
+  python -m src.scripts.ScenarioMatrix -c matrix.yaml
+  python -m src.scripts.ScenarioMatrix --trace mag-3 --ci ci 150 --pue 1.0 1.2 --model-name default_minmax
+"""
+
+import argparse
+import itertools
+import logging
+from typing import Dict, List, Sequence, Union
+
+import numpy as np
+import yaml
+
+from src.Constants import *
+from src.models.CarbonIntensitySeries import CarbonIntensitySeries
+from src.models.Scenario import Scenario
+from src.models.ScenarioResult import ScenarioResult
+from src.models.TaskPieces import TaskPieces
+from src.scripts.OperationalCarbon import busy_hours_per_interval, estimate_pieces_energy_consumption_ccf
+from src.utils.FileWriters import write_scenario_table
+from src.utils.IntensityMatrix import intensity_per_interval, intensity_per_piece
+from src.utils.NodeConfigModelReader import get_memory_draw, get_system_cores, get_system_memory
+from src.utils.IntensityCatalog import intensity_catalog
+from src.utils.PowerModel import power_model_registry
+from src.utils.TimeUtils import extract_tasks_by_interval
+
+
+def expand_scenarios(config: Dict[str, object]) -> List[Scenario]:
+    """
+    Build the scenarios described by a config: every combination of the ci, pue and
+    model-name values (single values count as one-element lists), followed by the
+    explicit entries under 'scenarios'. Duplicates are dropped, keeping the first.
+
+    :param config: Parsed config dict.
+    :return: List of Scenario objects.
+    """
+    scenarios: List[Scenario] = []
+    if CI in config or MODEL_NAME in config:
+        if CI not in config or MODEL_NAME not in config:
+            raise ValueError(f"A scenario grid needs both '{CI}' and '{MODEL_NAME}'")
+        grid = itertools.product(_as_list(config[CI]), _as_list(config.get(PUE, DEFAULT_PUE_VALUE)), _as_list(config[MODEL_NAME]))
+        scenarios.extend(Scenario(_ci_value(ci), float(pue), str(model_name)) for ci, pue, model_name in grid)
+    for entry in config.get(SCENARIOS) or []:
+        scenarios.append(Scenario(_ci_value(entry[CI]), float(entry.get(PUE, DEFAULT_PUE_VALUE)), str(entry[MODEL_NAME])))
+    if not scenarios:
+        raise ValueError("No scenarios given")
+    return list(dict.fromkeys(scenarios))
+
+
+def load_intensities(scenarios: Sequence[Scenario]) -> Dict[Union[float, str], Union[float, CarbonIntensitySeries]]:
+    """
+    Load every distinct carbon intensity used by the scenarios once, through the intensity catalog.
+
+    :param scenarios: Scenarios to evaluate.
+    :return: Dict mapping Scenario.ci to a constant or a CarbonIntensitySeries read from data/intensity.
+    """
+    intensities: Dict[Union[float, str], Union[float, CarbonIntensitySeries]] = {}
+    for scenario in scenarios:
+        if scenario.ci not in intensities:
+            if isinstance(scenario.ci, float):
+                intensities[scenario.ci] = scenario.ci
+            else:
+                intensities[scenario.ci] = intensity_catalog.get(scenario.ci)
+    return intensities
+
+
+def evaluate_scenarios(tasks_grouped_by_interval: Dict[int, list], scenarios: Sequence[Scenario], intensities: Dict[Union[float, str], Union[float, CarbonIntensitySeries]], trace: str = '', time_weighted: bool = True, lut_resolution: float = None, node_level: bool = False) -> List[ScenarioResult]:
+    """
+    Evaluate the operational footprint of one set of tasks under every scenario.
+
+    Each result matches calculate_carbon_footprint_ccf with the scenario's
+    parameters (up to float rounding). The shared work (task pieces, busy time,
+    node specs) is done once, energies once per model and intensities once per CI.
+
+    :param tasks_grouped_by_interval: Dict mapping interval start to list of tasks.
+    :param scenarios: Scenarios to evaluate.
+    :param intensities: Intensity for every Scenario.ci, e.g. from load_intensities.
+    :param trace: Trace name to record in the results.
+    :param time_weighted: Set to False to look up series values by interval start.
+    :param lut_resolution: Evaluate the power models from lookup tables sampled every lut_resolution percent utilization.
+    :param node_level: Apply the power models to the summed utilization of concurrent tasks per host.
+    :return: One ScenarioResult per scenario, in order.
+    """
+    pieces = TaskPieces.from_tasks_by_interval(tasks_grouped_by_interval)
+    hosts = pieces.hosts
+    model_names = list(dict.fromkeys(scenario.model_name for scenario in scenarios))
+    ci_keys = list(dict.fromkeys(scenario.ci for scenario in scenarios))
+
+    node_system_cores = np.array([get_system_cores(node) or 0 for node in hosts], dtype=np.int64)
+    node_memory = np.array([get_system_memory(node) for node in hosts], dtype=np.float64)
+    active = np.bincount(pieces.interval_index, minlength=len(pieces.interval_starts)) > 0
+    busy_hours = busy_hours_per_interval(pieces)[active]
+
+    # energy per piece and static energy per interval, once per power model (exc. PUE)
+    core = np.empty((len(model_names), len(pieces)))
+    memory = np.empty((len(model_names), len(pieces)))
+    static_cpu = np.empty((len(model_names), len(busy_hours)))
+    static_mem = np.empty((len(model_names), len(busy_hours)))
+    for m, model_name in enumerate(model_names):
+        coefficients, static_watts = power_model_registry.get_many(hosts, model_name)
+        node_memory_coeffs = np.array([get_memory_draw(node, model_name) for node in hosts], dtype=np.float64)
+        lookup_table = power_model_registry.get_lookup_table(hosts, model_name, lut_resolution) if lut_resolution else None
+        energy = estimate_pieces_energy_consumption_ccf(pieces, coefficients, model_name, node_memory_coeffs, node_system_cores, lookup_table, node_level)
+        core[m], memory[m] = energy.core_consumption, energy.memory_consumption
+        static_cpu[m] = busy_hours @ static_watts * 0.001  # convert from Wh to kWh
+        static_mem[m] = busy_hours @ (node_memory_coeffs * node_memory) * 0.001
+
+    # intensity per piece and per active interval, once per CI
+    ci_piece = np.empty((len(ci_keys), len(pieces)))
+    ci_interval = np.empty((len(ci_keys), len(busy_hours)))
+    for k, key in enumerate(ci_keys):
+        by_interval = intensity_per_interval(intensities[key], pieces, active, time_weighted)
+        ci_piece[k] = intensity_per_piece(intensities[key], pieces, by_interval, time_weighted)
+        ci_interval[k] = by_interval[active]
+
+    # emissions of every (model, CI) pair, exc. PUE
+    dynamic_emissions = (core + memory) @ ci_piece.T
+    static_cpu_emissions = static_cpu @ ci_interval.T
+    static_mem_emissions = static_mem @ ci_interval.T
+
+    # broadcast over the scenarios
+    model_index = {model_name: m for m, model_name in enumerate(model_names)}
+    ci_index = {key: k for k, key in enumerate(ci_keys)}
+    m = np.array([model_index[scenario.model_name] for scenario in scenarios], dtype=np.intp)
+    k = np.array([ci_index[scenario.ci] for scenario in scenarios], dtype=np.intp)
+    pue = np.array([scenario.pue for scenario in scenarios], dtype=np.float64)
+    cpu_energy = core.sum(axis=1)[m]
+    memory_energy = memory.sum(axis=1)[m]
+    carbon_emissions = pue * dynamic_emissions[m, k] + static_cpu_emissions[m, k]
+
+    columns = zip(
+        cpu_energy.tolist(), (cpu_energy * pue).tolist(), memory_energy.tolist(), (memory_energy * pue).tolist(),
+        static_cpu.sum(axis=1)[m].tolist(), static_mem.sum(axis=1)[m].tolist(),
+        static_mem_emissions[m, k].tolist(), carbon_emissions.tolist()
+    )
+    return [
+        ScenarioResult(trace, scenario.ci, scenario.pue, scenario.model_name, *values)
+        for scenario, values in zip(scenarios, columns)
+    ]
+
+
+def main(arguments: Dict[str, object]) -> List[ScenarioResult]:
+    """
+    Evaluate the scenarios of a config and write the results table to output/<trace>-scenarios.csv.
+
+    :param arguments: Config dict with the trace, interval and scenario grid and/or list.
+    :return: One ScenarioResult per scenario.
+    """
+    workflow: str = arguments[TRACE]
+    interval: int = int(arguments.get(INTERVAL) or DEFAULT_INTERVAL_VALUE)
+    scenarios = expand_scenarios(arguments)
+    lut_resolution = float(arguments[POWER_LUT_RESOLUTION]) if arguments.get(POWER_LUT_RESOLUTION) else None
+    node_level = bool(arguments.get(NODE_LEVEL_UTILIZATION, False))
+
+    tasks_by_interval = extract_tasks_by_interval(workflow, interval).tasks_by_interval
+    results = evaluate_scenarios(tasks_by_interval, scenarios, load_intensities(scenarios), workflow, lut_resolution=lut_resolution, node_level=node_level)
+    logging.info("Evaluated %d scenarios for %s", len(results), workflow)
+
+    write_scenario_table("output", workflow, results)
+    best = min(results, key=lambda r: r.carbon_emissions)
+    print(f"Evaluated {len(results)} scenarios, lowest Operational Carbon Emissions: {best.carbon_emissions}gCO2e (ci={best.ci}, pue={best.pue}, model={best.model_name})")
+    return results
+
+
+##################################
+# MARK: Private functions
+##################################
+
+def _as_list(value: object) -> list:
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def _ci_value(value: object) -> Union[float, str]:
+    """Constant intensities become floats (as parsed from the CLI), anything else is a CI file name."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    value = str(value)
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate a trace under a matrix of CI / PUE / power model scenarios")
+    parser.add_argument('-c', '--config', type=str, help='YAML config with the trace and the scenario grid and/or list')
+    parser.add_argument('--trace', type=str, help='Trace name (overrides the config)')
+    parser.add_argument('--interval', type=int, help='Interval in minutes (overrides the config)')
+    parser.add_argument('--ci', nargs='+', type=str, help='Carbon intensity values or CI file names')
+    parser.add_argument('--pue', nargs='+', type=float, help='PUE values')
+    parser.add_argument('--model-name', nargs='+', type=str, help='Power model names')
+    args = parser.parse_args()
+
+    config: Dict[str, object] = {}
+    if args.config:
+        with open(args.config, 'r') as f:
+            config = yaml.safe_load(f) or {}
+    for key, value in ((TRACE, args.trace), (INTERVAL, args.interval), (CI, args.ci), (PUE, args.pue), (MODEL_NAME, args.model_name)):
+        if value is not None:
+            config[key] = value
+    if TRACE not in config:
+        parser.error('a trace is required (--trace or in the config)')
+    main(config)
@@ -3,6 +3,7 @@
 # Imports
 from src.utils.Usage import print_usage_exit_SparkEventLogToTrace as print_usage_exit
 from src.utils.NodeConfigModelReader import get_system_cores
+from src.utils.Compression import open_text, resolve_path, strip_compression_suffix
 
 import json
 import csv
@@ -30,7 +31,9 @@ def load_hostname_mapping(input_file_name: str) -> Dict[str, str]:
         Dict[str, str]: Dictionary mapping IP addresses to hostnames.
     """
     # Construct the mapping file path
-    base_name = input_file_name.rsplit('.', 1)[0] if '.' in input_file_name else input_file_name
+    # Event logs may be compressed (e.g. app.json.gz shares app_hosts.csv with app.json)
+    base_name = strip_compression_suffix(input_file_name)
+    base_name = base_name.rsplit('.', 1)[0] if '.' in base_name else base_name
     mapping_file_path = f"data/spark_event_logs/{base_name}_hosts.csv"
 
     ip_to_hostname = {}
@@ -55,6 +58,7 @@ def load_hostname_mapping(input_file_name: str) -> Dict[str, str]:
 def parse_spark_event_log(input_file_name: str, output_path: str) -> None:
     """
     Parse a Spark event log JSON file from the data/spark_event_logs directory and convert it to a CSV trace file.
+    The event log may be gzip, xz or bzip2 compressed; the output is compressed if its path ends in .gz, .xz or .bz2.
 
     Args:
         input_file_name (str): Name of the Spark event log file.
@@ -64,7 +68,7 @@ def parse_spark_event_log(input_file_name: str, output_path: str) -> None:
     ip_to_hostname = load_hostname_mapping(input_file_name)
 
     input_path = f"data/spark_event_logs/{input_file_name}"
-    with open(input_path, 'r') as infile, open(output_path, 'w', newline='') as outfile:
+    with open_text(resolve_path(input_path), 'r') as infile, open_text(output_path, 'w', newline='') as outfile:
         writer = csv.writer(outfile)
         writer.writerow(CSV_HEADERS)
         
@@ -15,6 +15,7 @@
 
 from src.utils.Usage import print_usage_exit_SparkEventLogToTrace as print_usage_exit
 from src.utils.NodeConfigModelReader import get_system_cores
+from src.utils.Compression import open_text, resolve_path, strip_compression_suffix
 
 import json
 import csv
@@ -34,7 +35,9 @@ CSV_HEADERS = [
 
 
 def load_hostname_mapping(input_file_name: str) -> Dict[str, str]:
-    base_name = input_file_name.rsplit('.', 1)[0] if '.' in input_file_name else input_file_name
+    # Event logs may be compressed (e.g. app.json.gz shares app_hosts.csv with app.json)
+    base_name = strip_compression_suffix(input_file_name)
+    base_name = base_name.rsplit('.', 1)[0] if '.' in base_name else base_name
     mapping_file_path = f"data/spark_event_logs/{base_name}_hosts.csv"
 
     ip_to_hostname: Dict[str, str] = {}
@@ -92,7 +95,7 @@ def parse_spark_event_log_interval_node_level(
     # record = (hostname, launch_ms, finish_ms, cpu_time_ns, peak_mem)
     task_records: List[Tuple[str, int, int, int, int]] = []
 
-    with open(input_path, 'r') as infile:
+    with open_text(resolve_path(input_path), 'r') as infile:
         for line in infile:
             try:
                 event = json.loads(line)
@@ -132,7 +135,7 @@ def parse_spark_event_log_interval_node_level(
     if global_min_start_ms is None or global_max_end_ms is None or not task_records:
         print("[SparkEventLogToTrace] No SparkListenerTaskEnd events found; nothing to convert.")
         # Still write an empty CSV with headers for consistency
-        with open(output_path, 'w', newline='') as outfile:
+        with open_text(output_path, 'w', newline='') as outfile:
             writer = csv.writer(outfile)
             writer.writerow(CSV_HEADERS)
         return
@@ -184,7 +187,7 @@ def parse_spark_event_log_interval_node_level(
                 stats["max_task_end_ms"] = finish_ms
 
     # Emit one row per (hostname, window_index) that actually had tasks
-    with open(output_path, 'w', newline='') as outfile:
+    with open_text(output_path, 'w', newline='') as outfile:
         writer = csv.writer(outfile)
         writer.writerow(CSV_HEADERS)
 
@@ -3,6 +3,7 @@
 
 from src.utils.Usage import print_usage_exit_SparkEventLogToTrace as print_usage_exit
 from src.utils.NodeConfigModelReader import get_system_cores
+from src.utils.Compression import open_text, resolve_path, strip_compression_suffix
 
 import json
 import csv
@@ -18,7 +19,9 @@ CSV_HEADERS = [
 
 
 def load_hostname_mapping(input_file_name: str) -> Dict[str, str]:
-    base_name = input_file_name.rsplit('.', 1)[0] if '.' in input_file_name else input_file_name
+    # Event logs may be compressed (e.g. app.json.gz shares app_hosts.csv with app.json)
+    base_name = strip_compression_suffix(input_file_name)
+    base_name = base_name.rsplit('.', 1)[0] if '.' in base_name else base_name
     mapping_file_path = f"data/spark_event_logs/{base_name}_hosts.csv"
 
     ip_to_hostname: Dict[str, str] = {}
@@ -55,7 +58,7 @@ def parse_spark_event_log_stage_node_level(input_file_name: str, output_path: st
     # stage_bounds[stage_id] = {"min_start_ms": int, "max_end_ms": int}
     stage_bounds: Dict[int, Dict[str, int]] = {}
 
-    with open(input_path, 'r') as infile:
+    with open_text(resolve_path(input_path), 'r') as infile:
         for line in infile:
             try:
                 event = json.loads(line)
@@ -151,7 +154,7 @@ def parse_spark_event_log_stage_node_level(input_file_name: str, output_path: st
         print("[SparkEventLogToTrace] No stages found for stage-duration computation (no valid task timings).")
 
     # Write stage+node rows as before
-    with open(output_path, 'w', newline='') as outfile:
+    with open_text(output_path, 'w', newline='') as outfile:
         writer = csv.writer(outfile)
         writer.writerow(CSV_HEADERS)
 
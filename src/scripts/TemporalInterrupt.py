@@ -9,30 +9,45 @@ from src.models.IchnosTrace import IchnosTrace
 from src.models.ProcessedTrace import ProcessedTrace
 from src.models.TaskExtractionResult import TaskExtractionResult
 from src.models.TempShiftResult import TempShiftResult
+from src.models.CarbonIntensitySeries import CarbonIntensitySeries
+from src.models.ContiguousShiftResult import ContiguousShiftResult
+from src.models.RegionIntensity import RegionIntensity
+from src.models.SpatioTemporalShiftResult import SpatioTemporalShiftResult
 from src.WorkflowNameConstants import *
 from src.Constants import CI, TRACE, PUE, MODEL_NAME, MEMORY_COEFFICIENT, INTERVAL
-from src.utils.TimeUtils import to_timestamp, get_intervals, extract_tasks_by_interval
-from src.scripts.OperationalCarbon import calculate_carbon_footprint_ccf
+from src.Constants import SHIFT_MODE, INTERRUPT, OPTIMAL, CONTIGUOUS, SPATIAL, FLEXIBILITY, DEFAULT_FLEXIBILITY, MAX_INTERRUPTIONS, REGIONS, WORKERS
+from src.utils.TimeUtils import get_intervals, extract_tasks_by_interval
+from src.scripts.OperationalCarbon import estimate_interval_energy
 from src.scripts.EmbodiedCarbon import calculate_cpu_embodied_carbon
-from src.utils.Parsers import parse_ci_intervals
+from src.utils.IntensityCatalog import intensity_catalog
 from src.utils.Parsers import parse_arguments_TemporalInterrupt
 from src.utils.NodeConfigModelReader import get_cpu_model
+from src.utils.TemporalShifting import best_contiguous_shift, best_spatio_temporal_shift, optimal_interrupt_schedule
+from src.utils.SharedSeries import SharedSeriesHandle, open_shared_regions, open_shared_series, save_shared_series
 
 import sys
+import tempfile
 import numpy as np
-from typing import Dict, List, Tuple, Callable, Union
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple, Callable, Union
 
-def explore_temporal_shifting_for_workflow(workflow: str, task_extraction_result: TaskExtractionResult, ci: Dict[str, float], model_name: str, pue: float, memory_coefficient: float) -> TempShiftResult:
+def explore_temporal_shifting_for_workflow(workflow: str, task_extraction_result: TaskExtractionResult, ci: CarbonIntensitySeries, model_name: str, pue: float, memory_coefficient: float, flexibility: List[int] = DEFAULT_FLEXIBILITY) -> TempShiftResult:
     """
     Explore shifting of workflow execution times based on minimum carbon intensity.
 
+    The energy of every interval (dynamic and static) is computed once. Operational
+    carbon is linear in the per-interval CI, so the original and every shifted
+    schedule are scored as a dot product of those energies with the CI values
+    assigned to the intervals, without going back to the tasks.
+
     Parameters:
         workflow (str): The workflow identifier.
         task_extraction_result (TaskExtractionResult): The result of task extraction.
-        ci (Dict[str, float]): Carbon intensity values keyed by time.
+        ci (CarbonIntensitySeries): Carbon intensity values over time.
         model_name (str): Model name for utilised resources.
         pue (float): Power usage effectiveness multiplier.
         memory_coefficient (float): Coefficient for memory consumption.
+        flexibility (List[int]): Windows (in CI periods after the original end) to shift within.
 
     Returns:
         str: A comma-separated string output with original and shifted carbon footprint details.
@@ -40,32 +55,19 @@ def explore_temporal_shifting_for_workflow(workflow: str, task_extraction_result
     tasks_by_interval = task_extraction_result.tasks_by_interval
     overhead_intervals = task_extraction_result.overhead_intervals
 
-    # Calculate total time of workflow from trace records
-    trace_records = task_extraction_result.all_tasks  # List[IchnosTrace]
-    cpu_model = trace_records[0].cpu_model if trace_records else ''
-    # Check if all trace records have the same CPU model
-    if trace_records:
-        if not all(record.cpu_model == cpu_model for record in trace_records):
-            raise ValueError("All trace records must have the same CPU model for consistent calculations.")
-    if not cpu_model:
-        cpu_model = get_cpu_model()
+    cpu_model = _get_cpu_model(task_extraction_result.all_tasks)
 
-    # Identify Hours in Order
-    intervals_by_key = {}
+    # Identify Intervals in Order
+    intervals, start_i, end_i = _workflow_window(workflow, tasks_by_interval, ci)
 
-    for interval, tasks in tasks_by_interval.items():  # tasks: List[IchnosTrace]
-        if len(tasks) > 0:
-            hour_ts = to_timestamp(interval)
-            month = str(hour_ts.month).zfill(2)
-            day = str(hour_ts.day).zfill(2)
-            hh = str(hour_ts.hour).zfill(2)
-            mm = str(hour_ts.minute).zfill(2)
-            key = f'{month}/{day}-{hh}:{mm}'
-            intervals_by_key[key] = tasks
+    # Energy per interval, computed once for all schedules
+    interval_energy = estimate_interval_energy(tasks_by_interval, pue, model_name)
+    weights = interval_energy.carbon_weights
 
     # Calculate Original Carbon Footprint
-    orig_carbon_result = calculate_carbon_footprint_ccf(tasks_by_interval, ci, pue, model_name, memory_coefficient, False)
-    orig_carbon_emissions = orig_carbon_result.carbon_emissions
+    # (per-interval CI, like the shifted footprints it is compared against)
+    positions = ci.index_of(np.asarray(intervals, dtype=np.int64))  # CI period of every interval
+    orig_carbon_emissions = float(weights @ ci.values[positions])
 
 
     # Calculate Original Workflow Makespan in seconds
@@ -80,29 +82,16 @@ def explore_temporal_shifting_for_workflow(workflow: str, task_extraction_result
     emb_carb_output = [workflow, str(embodied_carbon_orig), str(makespan)]
     
     # SHIFTING LOGIC
-    for shift in [6, 12, 24, 48, 96]:  # flexibility to run over windows 'shift' hours after the workflow executed
-        keys = list(intervals_by_key.keys())  # keys that the workflow executes over
-        wf_intervals = len(keys)  # hours of workflow execution
-        ci_keys = list(ci.keys())  # all windows that have ci values, as keys
-        start = keys[0]  # workflow start key
-        end = keys[-1]  # workflow end key
-        start_i = ci_keys.index(start)  # workflow start index
-        end_i = ci_keys.index(end)  # workflow end index
-        shift_keys = ci_keys[start_i:end_i + shift + 1]  # all keys within the shift (only forwards)
-        # shift_keys = ci_keys[start_i - shift:end_i + shift + 1]
-
-        dat = np.array([ci[key] for key in shift_keys])  # store corresponding ci values for the potential shifts
-        ind = sorted(np.argpartition(dat, wf_intervals)[:wf_intervals])  # indices of the minimum ci values
+    wf_intervals = len(intervals)  # intervals of workflow execution
+    for shift in flexibility:  # flexibility to run over windows 'shift' hours after the workflow executed
+        dat = _shift_window(workflow, ci, start_i, end_i, shift, wf_intervals)  # ci values for the potential shifts (only forwards)
+        # dat = ci.values[start_i - shift:end_i + shift + 1]
+        ind = np.sort(np.argpartition(dat, min(wf_intervals, len(dat) - 1))[:wf_intervals])  # indices of the minimum ci values
         # the indices are sorted to retain chronological order over time
-        min_keys = [shift_keys[i] for i in ind]  # matching keys for the minimum ci values
-
-        ci_for_shifted_trace = {}
-        for i in range(0, len(min_keys)):
-            ci_for_shifted_trace[keys[i]] = ci[min_keys[i]]
 
         # Report Optimal CI Temporal Shifting Carbon Footprint
-        shifted_carbon_result = calculate_carbon_footprint_ccf(tasks_by_interval, ci_for_shifted_trace, pue, model_name, memory_coefficient, False)
-        operational_carbon = shifted_carbon_result.carbon_emissions
+        # (the i-th interval of the workflow runs in the i-th selected slot)
+        operational_carbon = float(weights @ dat[ind])
 
         # Report Overhead of Interrupting Temporal Shifting
         oh_interval_inds = get_intervals(ind)
@@ -129,57 +118,326 @@ def explore_temporal_shifting_for_workflow(workflow: str, task_extraction_result
         emb_carbon_results=','.join(emb_carb_output)
     )
 
-def main(workflows: List[str], ci: Dict[str, float], arguments: Dict[str, Union[str, float, int]], outfilename: str) -> None:
+def explore_contiguous_shifting_for_workflow(workflow: str, task_extraction_result: TaskExtractionResult, ci: CarbonIntensitySeries, model_name: str, pue: float, memory_coefficient: float, flexibility: List[int] = DEFAULT_FLEXIBILITY) -> Tuple[TempShiftResult, ContiguousShiftResult]:
+    """
+    Explore delaying the whole workflow without interrupting it.
+
+    The energy of every interval is computed once; the footprints of all start
+    offsets up to the largest flexibility window are then scored in one sliding
+    dot product with the CI values (see TemporalShifting). Each window reports the
+    best offset within it. Without interruptions there is no overhead, so the
+    embodied carbon stays that of the original run.
+
+    Parameters:
+        workflow (str): The workflow identifier.
+        task_extraction_result (TaskExtractionResult): The result of task extraction.
+        ci (CarbonIntensitySeries): Carbon intensity values over time.
+        model_name (str): Model name for utilised resources.
+        pue (float): Power usage effectiveness multiplier.
+        memory_coefficient (float): Coefficient for memory consumption.
+        flexibility (List[int]): Windows (in CI periods) to delay the start within.
+
+    Returns:
+        Tuple[TempShiftResult, ContiguousShiftResult]: The report lines (best offset per window) and the shift result over the largest window, with its savings curve.
+    """
+    cpu_model = _get_cpu_model(task_extraction_result.all_tasks)
+    makespan = (task_extraction_result.workflow_end - task_extraction_result.workflow_start) / 1000
+    embodied_carbon = calculate_cpu_embodied_carbon(cpu_model, makespan / 3600)
+
+    interval_energy = estimate_interval_energy(task_extraction_result.tasks_by_interval, pue, model_name)
+    result = best_contiguous_shift(interval_energy, ci, max(flexibility))
+    savings = result.savings
+
+    op_carb_output = [workflow, str(result.original_emissions), str(makespan)]
+    emb_carb_output = [workflow, str(embodied_carbon), str(makespan)]
+    for shift in flexibility:
+        offset = int(np.nanargmin(result.emissions[:shift + 1]))
+        offset_s = offset * ci.period / 1000
+        op_carb_output.append(f'{savings[offset]:.1f}%:{result.emissions[offset]}:+{offset_s}s')  # reports the start offset in seconds
+        emb_carb_output.append(f'0.0%:{embodied_carbon}:0.0|0.0%')
+
+    return TempShiftResult(
+        op_carbon_results=','.join(op_carb_output),
+        emb_carbon_results=','.join(emb_carb_output)
+    ), result
+
+def explore_spatio_temporal_shifting_for_workflow(workflow: str, task_extraction_result: TaskExtractionResult, regions: RegionIntensity, model_name: str, pue: float, memory_coefficient: float, flexibility: List[int] = DEFAULT_FLEXIBILITY) -> Tuple[TempShiftResult, SpatioTemporalShiftResult]:
+    """
+    Explore moving the whole workflow to another region and/or delaying it.
+
+    The energy of every interval is computed once and scored against all regions
+    and start offsets up to the largest flexibility window in one sweep (see
+    TemporalShifting.best_spatio_temporal_shift). Each window reports the best
+    region and offset within it. The workflow is assumed to run on the same
+    hardware and without interruption everywhere, so the embodied carbon stays
+    that of the original run.
+
+    Parameters:
+        workflow (str): The workflow identifier.
+        task_extraction_result (TaskExtractionResult): The result of task extraction.
+        regions (RegionIntensity): Carbon intensity of the candidate regions, the original region first.
+        model_name (str): Model name for utilised resources.
+        pue (float): Power usage effectiveness multiplier.
+        memory_coefficient (float): Coefficient for memory consumption.
+        flexibility (List[int]): Windows (in periods of the shared CI timeline) to delay the start within.
+
+    Returns:
+        Tuple[TempShiftResult, SpatioTemporalShiftResult]: The report lines (best region and offset per window) and the footprints of every region and offset over the largest window.
+    """
+    cpu_model = _get_cpu_model(task_extraction_result.all_tasks)
+    makespan = (task_extraction_result.workflow_end - task_extraction_result.workflow_start) / 1000
+    embodied_carbon = calculate_cpu_embodied_carbon(cpu_model, makespan / 3600)
+
+    interval_energy = estimate_interval_energy(task_extraction_result.tasks_by_interval, pue, model_name)
+    result = best_spatio_temporal_shift(interval_energy, regions, max(flexibility))
+    savings = result.savings
+
+    op_carb_output = [workflow, str(result.original_emissions), str(makespan)]
+    emb_carb_output = [workflow, str(embodied_carbon), str(makespan)]
+    for shift in flexibility:
+        region, offset = result.best(shift)
+        offset_s = offset * regions.period / 1000
+        op_carb_output.append(f'{savings[region, offset]:.1f}%:{result.emissions[region, offset]}:{regions.regions[region]}+{offset_s}s')  # reports the region and start offset in seconds
+        emb_carb_output.append(f'0.0%:{embodied_carbon}:0.0|0.0%')
+
+    return TempShiftResult(
+        op_carbon_results=','.join(op_carb_output),
+        emb_carbon_results=','.join(emb_carb_output)
+    ), result
+
+def explore_optimal_interrupting_for_workflow(workflow: str, task_extraction_result: TaskExtractionResult, ci: CarbonIntensitySeries, model_name: str, pue: float, memory_coefficient: float, flexibility: List[int] = DEFAULT_FLEXIBILITY, max_interruptions: int = None) -> TempShiftResult:
+    """
+    Explore interrupting the workflow where it pays off, overhead included.
+
+    Unlike explore_temporal_shifting_for_workflow, which takes the lowest CI
+    slots and only then charges the overhead of the resulting gaps, every window
+    is searched for the schedule with the lowest operational carbon plus embodied
+    carbon of the overhead (see TemporalShifting.optimal_interrupt_schedule).
+    Interrupting after an interval redoes the longest task cut at its end
+    (overhead_intervals); the redone work draws that interval's average power.
+
+    Parameters:
+        workflow (str): The workflow identifier.
+        task_extraction_result (TaskExtractionResult): The result of task extraction.
+        ci (CarbonIntensitySeries): Carbon intensity values over time.
+        model_name (str): Model name for utilised resources.
+        pue (float): Power usage effectiveness multiplier.
+        memory_coefficient (float): Coefficient for memory consumption.
+        flexibility (List[int]): Windows (in CI periods after the original end) to shift within.
+        max_interruptions (int): Optional cap on the number of interruptions.
+
+    Returns:
+        TempShiftResult: Report lines in the format of explore_temporal_shifting_for_workflow.
+    """
+    tasks_by_interval = task_extraction_result.tasks_by_interval
+    cpu_model = _get_cpu_model(task_extraction_result.all_tasks)
+    intervals, start_i, end_i = _workflow_window(workflow, tasks_by_interval, ci)
+
+    interval_energy = estimate_interval_energy(tasks_by_interval, pue, model_name)
+    weights = interval_energy.carbon_weights
+    orig_carbon_emissions = float(weights @ ci.values[ci.index_of(np.asarray(intervals, dtype=np.int64))])
+
+    # overhead of interrupting after each interval, taken from its bucket
+    buckets = list(tasks_by_interval)
+    bucket_index = {bucket: k for k, bucket in enumerate(buckets)}
+    step = buckets[1] - buckets[0] if len(buckets) > 1 else ci.period
+    overhead_ms = np.array([task_extraction_result.overhead_intervals[bucket_index[interval]] for interval in intervals[:-1]], dtype=np.float64)
+    overhead_energy = weights[:-1] * overhead_ms / step
+
+    makespan = (task_extraction_result.workflow_end - task_extraction_result.workflow_start) / 1000
+    embodied_carbon_orig = calculate_cpu_embodied_carbon(cpu_model, makespan / 3600)
+    embodied_per_ms = calculate_cpu_embodied_carbon(cpu_model, 1.0) / 3600000  # embodied carbon is linear in time
+
+    op_carb_output = [workflow, str(orig_carbon_emissions), str(makespan)]
+    emb_carb_output = [workflow, str(embodied_carbon_orig), str(makespan)]
+    for shift in flexibility:
+        dat = _shift_window(workflow, ci, start_i, end_i, shift, len(intervals))
+        schedule = optimal_interrupt_schedule(weights, dat, overhead_energy, overhead_ms, embodied_per_ms, max_interruptions)
+        operational_carbon = schedule.operational_emissions
+        op_saving = ((orig_carbon_emissions - operational_carbon) / orig_carbon_emissions) * 100
+
+        overhead_s = schedule.overhead_ms / 1000
+        overhead_perc = (overhead_s / makespan) * 100
+        embodied_carbon = calculate_cpu_embodied_carbon(cpu_model, (makespan + overhead_s) / 3600)
+        emb_saving = ((embodied_carbon_orig - embodied_carbon) / embodied_carbon_orig) * 100
+
+        op_carb_output.append(f'{op_saving:.1f}%:{operational_carbon}:{overhead_s}|{overhead_perc:.1f}%')  # reports overhead in seconds
+        emb_carb_output.append(f'{emb_saving:.1f}%:{embodied_carbon}:{overhead_s}|{overhead_perc:.1f}%')
+
+    return TempShiftResult(
+        op_carbon_results=','.join(op_carb_output),
+        emb_carbon_results=','.join(emb_carb_output)
+    )
+
+def main(workflows: List[str], ci: CarbonIntensitySeries, arguments: Dict[str, Union[str, float, int]], outfilename: str, mode: str = INTERRUPT, flexibility: List[int] = DEFAULT_FLEXIBILITY, max_interruptions: int = None, workers: int = 1, regions: RegionIntensity = None) -> None:
     """
     Main function to process workflows and write the temporal shifting report.
 
     Parameters:
         workflows (List[str]): List of workflow identifiers.
-        ci (Dict[str, float]): Carbon intensity values.
+        ci (CarbonIntensitySeries): Carbon intensity values.
         arguments (Dict[str, Union[str, float, int]]): Argument dictionary parsed from command line.
         outfilename (str): Filename for results
+        mode (str): INTERRUPT (lowest CI slots), OPTIMAL (overhead-aware interruptions), CONTIGUOUS
+            (delay whole workflows; also writes the savings curves to <outfilename>-curve.csv) or SPATIAL
+            (move and delay whole workflows across regions; writes one curve per region).
+        flexibility (List[int]): Windows (in CI periods) to shift within, one report column each.
+        max_interruptions (int): Optional cap on the number of interruptions in OPTIMAL mode.
+        workers (int): Number of processes to explore the workflows with. The CI values are
+            memory-mapped by the workers rather than copied to each; rows keep the order of workflows.
+        regions (RegionIntensity): Carbon intensity of the candidate regions in SPATIAL mode, the region of ci first.
 
     Returns:
         None
     """
-    # Data
-    pue: float = arguments[PUE]
-    interval: int = arguments[INTERVAL]
-    model_name: str = arguments[MODEL_NAME]
-    memory_coefficient: float = arguments[MEMORY_COEFFICIENT]
-    results = []
-
     emb_outfilename = outfilename.replace('.csv', '-emb.csv')
+    settings = (arguments, mode, flexibility, max_interruptions)
 
-    for workflow in workflows:
-        task_extraction_result = extract_tasks_by_interval(workflow, interval)
+    if mode == SPATIAL and regions is None:
+        raise ValueError("Spatio-temporal shifting requires the carbon intensity of the candidate regions")
 
-        result = explore_temporal_shifting_for_workflow(workflow, task_extraction_result, ci, model_name, pue, memory_coefficient)
-        results.append(result)
+    if workers > 1 and len(workflows) > 1:
+        with tempfile.TemporaryDirectory() as folder:
+            handle = save_shared_series(ci, folder)
+            shared_regions = (save_shared_series(regions, folder, 'regions'), regions.regions) if regions is not None else None
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(handle, shared_regions)) as pool:
+                explored = list(pool.map(_explore_in_worker, workflows, *([setting] * len(workflows) for setting in settings)))
+    else:
+        explored = [_explore_workflow(workflow, ci, *settings, regions) for workflow in workflows]
+
+    results = [result for result, _ in explored]
+    curves: List[Tuple[str, Union[ContiguousShiftResult, SpatioTemporalShiftResult]]] = [
+        (workflow, shift_result) for workflow, (_, shift_result) in zip(workflows, explored) if shift_result is not None
+    ]
 
+    windows = ','.join(f'flexible-{shift}h' for shift in flexibility)
     with open(outfilename, 'w') as op_file, open(emb_outfilename, 'w') as emb_file:
-        op_file.write('workflow,footprint,makespan,flexible-6h,flexible-12h,flexible-24h,flexible-48h,flexible-96h\n')
-        emb_file.write('workflow,embodied-carbon,makespan,flexible-6h,flexible-12h,flexible-24h,flexible-48h,flexible-96h\n')
+        op_file.write(f'workflow,footprint,makespan,{windows}\n')
+        emb_file.write(f'workflow,embodied-carbon,makespan,{windows}\n')
         
         for result in results:
             op_file.write(f'{result.op_carbon_results}\n')
             emb_file.write(f'{result.emb_carbon_results}\n')
 
+    if curves and mode == SPATIAL:
+        with open(outfilename.replace('.csv', '-curve.csv'), 'w') as curve_file:
+            curve_file.write('workflow,region,offset-s,footprint,saving\n')
+            for workflow, shift_result in curves:
+                for region, region_emissions, region_savings in zip(shift_result.regions, shift_result.emissions.tolist(), shift_result.savings.tolist()):
+                    for offset, (emissions, saving) in enumerate(zip(region_emissions, region_savings)):
+                        curve_file.write(f'{workflow},{region},{offset * shift_result.period / 1000},{emissions},{saving:.2f}%\n')
+    elif curves:
+        with open(outfilename.replace('.csv', '-curve.csv'), 'w') as curve_file:
+            curve_file.write('workflow,offset-s,footprint,saving\n')
+            for workflow, shift_result in curves:
+                for offset, (emissions, saving) in enumerate(zip(shift_result.emissions.tolist(), shift_result.savings.tolist())):
+                    curve_file.write(f'{workflow},{offset * ci.period / 1000},{emissions},{saving:.2f}%\n')
+
+
+##################################
+# MARK: Private functions
+##################################
+
+def _explore_workflow(workflow: str, ci: CarbonIntensitySeries, arguments: Dict[str, Union[str, float, int]], mode: str, flexibility: List[int], max_interruptions: int, regions: RegionIntensity = None) -> Tuple[TempShiftResult, Optional[Union[ContiguousShiftResult, SpatioTemporalShiftResult]]]:
+    """
+    Extract the tasks of one workflow and explore it in the given mode.
+
+    The shift result is only set in CONTIGUOUS and SPATIAL mode.
+    """
+    pue: float = arguments[PUE]
+    model_name: str = arguments[MODEL_NAME]
+    memory_coefficient: float = arguments[MEMORY_COEFFICIENT]
+    task_extraction_result = extract_tasks_by_interval(workflow, arguments[INTERVAL])
+
+    if mode == SPATIAL:
+        return explore_spatio_temporal_shifting_for_workflow(workflow, task_extraction_result, regions, model_name, pue, memory_coefficient, flexibility)
+    if mode == CONTIGUOUS:
+        return explore_contiguous_shifting_for_workflow(workflow, task_extraction_result, ci, model_name, pue, memory_coefficient, flexibility)
+    if mode == OPTIMAL:
+        return explore_optimal_interrupting_for_workflow(workflow, task_extraction_result, ci, model_name, pue, memory_coefficient, flexibility, max_interruptions), None
+    return explore_temporal_shifting_for_workflow(workflow, task_extraction_result, ci, model_name, pue, memory_coefficient, flexibility), None
+
+
+# CI series (and candidate regions) of a worker process, memory-mapped once by _init_worker
+_worker_ci: Optional[CarbonIntensitySeries] = None
+_worker_regions: Optional[RegionIntensity] = None
+
+
+def _init_worker(handle: SharedSeriesHandle, shared_regions: Optional[Tuple[SharedSeriesHandle, List[str]]] = None) -> None:
+    global _worker_ci, _worker_regions
+    _worker_ci = open_shared_series(handle)
+    _worker_regions = open_shared_regions(*shared_regions) if shared_regions is not None else None
+
+
+def _explore_in_worker(workflow: str, arguments: Dict[str, Union[str, float, int]], mode: str, flexibility: List[int], max_interruptions: int) -> Tuple[TempShiftResult, Optional[Union[ContiguousShiftResult, SpatioTemporalShiftResult]]]:
+    return _explore_workflow(workflow, _worker_ci, arguments, mode, flexibility, max_interruptions, _worker_regions)
+
+
+def _get_cpu_model(trace_records: List[IchnosTrace]) -> str:
+    """
+    CPU model of the workflow, from its trace records or else the node config.
+
+    All trace records must share the same CPU model.
+    """
+    cpu_model = trace_records[0].cpu_model if trace_records else ''
+    # Check if all trace records have the same CPU model
+    if trace_records:
+        if not all(record.cpu_model == cpu_model for record in trace_records):
+            raise ValueError("All trace records must have the same CPU model for consistent calculations.")
+    if not cpu_model:
+        cpu_model = get_cpu_model()
+    return cpu_model
+
+
+def _workflow_window(workflow: str, tasks_by_interval: Dict[int, list], ci: CarbonIntensitySeries) -> Tuple[List[int], int, int]:
+    """
+    Active intervals of the workflow in order, and the CI periods of the first and last.
+
+    Raises a ValueError if the CI data does not cover the execution.
+    """
+    intervals = [interval for interval, tasks in tasks_by_interval.items() if len(tasks) > 0]
+    start_i = ci.index_of(intervals[0]) if intervals else -1  # workflow start index
+    end_i = ci.index_of(intervals[-1]) if intervals else -1  # workflow end index
+    if start_i < 0 or end_i >= len(ci):
+        raise ValueError(f"Carbon intensity data does not cover the execution of {workflow}")
+    return intervals, start_i, end_i
+
+
+def _shift_window(workflow: str, ci: CarbonIntensitySeries, start_i: int, end_i: int, shift: int, slots: int) -> np.ndarray:
+    """
+    CI values from the workflow start to 'shift' periods after its end.
+
+    Raises a ValueError if the CI data does not reach the end of the window or
+    has fewer than 'slots' periods with data in it.
+    """
+    if end_i + shift >= len(ci):
+        raise ValueError(f"Carbon intensity data does not cover the {shift}-period flexibility window of {workflow}")
+    dat = ci.values[start_i:end_i + shift + 1]
+    if np.count_nonzero(~np.isnan(dat)) < slots:
+        raise ValueError(f"Carbon intensity data has too many gaps in the {shift}-period flexibility window of {workflow}")
+    return dat
+
+
 # Main Script
 if __name__ == '__main__':
     arguments = sys.argv[1:]
     settings = parse_arguments_TemporalInterrupt(arguments)
     workflow = settings[TRACE]
-    ci_source_file = f"data/intensity/{settings[CI]}.csv"
-    ci = parse_ci_intervals(ci_source_file)
+    mode = settings[SHIFT_MODE]
+    ci = intensity_catalog.get(settings[CI])
+    regions = None
+    if mode == SPATIAL:
+        # the workflow ran in the region of the CI file, which goes first
+        regions = intensity_catalog.get_regions([settings[CI]] + [name for name in settings[REGIONS] if name != settings[CI]])
 
     workflows = []
     for i in range(1, 4):
         workflows.append(f'{workflow}-{i}')
 
+    suffix = '' if mode == INTERRUPT else f'-{mode}'
     if 'marg' in settings[CI]:
-        outfilename = f'output/{workflow}-marg-ts.csv'
+        outfilename = f'output/{workflow}-marg-ts{suffix}.csv'
     else:
-        outfilename = f'output/{workflow}-avg-ts.csv'
+        outfilename = f'output/{workflow}-avg-ts{suffix}.csv'
 
-    main(workflows, ci, settings, outfilename)
+    main(workflows, ci, settings, outfilename, mode, settings[FLEXIBILITY], settings[MAX_INTERRUPTIONS], settings[WORKERS], regions)
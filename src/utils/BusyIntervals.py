@@ -0,0 +1,117 @@
+"""
+Module: BusyIntervals
+This module computes when hosts are busy, i.e. the union of the time spans of
+the tasks running on them, and how much of that busy time falls into each
+accounting interval (used for static energy).
+
+All tasks are sorted once by (host, start) and merged into disjoint busy
+intervals for the whole run. Busy time inside any [a, b) span is then read off
+a prefix sum of the merged interval lengths with a binary search, so attributing
+busy time to I intervals for H hosts costs O(n log n + I * H * log n) instead of
+re-sorting every interval's tasks.
+
+No file I/O is performed in this module.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+def merge_busy_intervals(starts: np.ndarray, ends: np.ndarray, groups: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Merge the [start, end] spans of each group (e.g. host) into disjoint busy intervals.
+
+    Overlapping and contiguous spans (one ending where the next starts) are merged.
+
+    :param starts: Span starts in ms.
+    :param ends: Span ends in ms (clamped to be at least the start).
+    :param groups: Group code of each span.
+    :return: Tuple of (group, start, end) arrays of the merged intervals, sorted by group and start.
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.maximum(np.asarray(ends, dtype=np.int64), starts)
+    groups = np.asarray(groups, dtype=np.int64)
+    if len(starts) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+
+    order = np.lexsort((starts, groups))
+    starts, ends, groups = starts[order], ends[order], groups[order]
+
+    # running end within each group; a new busy interval opens whenever a span
+    # starts after everything before it (in the same group) has finished
+    base, span = group_offsets(groups, starts.min(), ends.max())
+    running_end = np.maximum.accumulate(ends + base) - base
+    opens = np.empty(len(starts), dtype=bool)
+    opens[0] = True
+    opens[1:] = (groups[1:] != groups[:-1]) | (starts[1:] > running_end[:-1])
+
+    first = np.flatnonzero(opens)
+    last = np.append(first[1:] - 1, len(starts) - 1)
+    return groups[first], starts[first], running_end[last]
+
+
+def busy_time_per_bucket(merged_groups: np.ndarray, merged_starts: np.ndarray, merged_ends: np.ndarray, bucket_edges: np.ndarray, n_groups: int) -> np.ndarray:
+    """
+    Attribute merged busy time to consecutive buckets.
+
+    :param merged_groups: Group of each merged interval (from merge_busy_intervals).
+    :param merged_starts: Start of each merged interval in ms.
+    :param merged_ends: End of each merged interval in ms.
+    :param bucket_edges: Increasing bucket boundaries in ms; bucket i is [edges[i], edges[i + 1]).
+    :param n_groups: Number of groups (rows of the result are indexed by group code).
+    :return: Busy time in ms, shape (len(bucket_edges) - 1, n_groups).
+    """
+    bucket_edges = np.asarray(bucket_edges, dtype=np.int64)
+    n_buckets = max(0, len(bucket_edges) - 1)
+    if len(merged_starts) == 0 or n_buckets == 0:
+        return np.zeros((n_buckets, n_groups))
+
+    # place every group on its own stretch of one timeline so that a single
+    # sorted array and prefix sum serve all of them
+    lo = min(int(merged_starts.min()), int(bucket_edges[0]))
+    hi = max(int(merged_ends.max()), int(bucket_edges[-1]))
+    base, span = group_offsets(merged_groups, lo, hi)
+    keyed_starts = merged_starts + base
+    keyed_ends = merged_ends + base
+    lengths = keyed_ends - keyed_starts
+    prefix = np.concatenate(([0], np.cumsum(lengths)))
+
+    query = np.arange(n_groups, dtype=np.int64)[None, :] * span + (bucket_edges - lo)[:, None]
+    covered = _covered_until(query, keyed_starts, keyed_ends, prefix)
+    return (covered[1:] - covered[:-1]).astype(np.float64)
+
+
+def group_offsets(groups: np.ndarray, lo: int, hi: int) -> Tuple[np.ndarray, int]:
+    """
+    Offsets that shift each group's times onto a disjoint stretch [g * span, (g + 1) * span).
+
+    Adding the offsets to times in [lo, hi] lays all groups out on one timeline,
+    so one sort, cumulative sum or binary search serves every group.
+
+    :param groups: Group code per element.
+    :param lo: Smallest time to represent.
+    :param hi: Largest time to represent.
+    :return: Tuple of the offset per element and the stretch length.
+    """
+    span = int(hi) - int(lo) + 1
+    return groups * span - int(lo), span
+
+##################################
+# MARK: Private functions
+##################################
+
+def _covered_until(keys: np.ndarray, starts: np.ndarray, ends: np.ndarray, prefix: np.ndarray) -> np.ndarray:
+    """
+    Total length of the (sorted, disjoint) intervals that lies before each key.
+
+    :param keys: Query positions.
+    :param starts: Interval starts.
+    :param ends: Interval ends.
+    :param prefix: prefix[j] is the total length of intervals 0..j-1.
+    :return: Covered length before each key.
+    """
+    j = np.searchsorted(starts, keys, side='right') - 1
+    jc = np.maximum(j, 0)
+    partial = np.clip(keys - starts[jc], 0, ends[jc] - starts[jc])
+    return np.where(j >= 0, prefix[jc] + partial, 0)
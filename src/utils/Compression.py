@@ -0,0 +1,114 @@
+"""
+Module: Compression
+This module provides transparent access to compressed input and output files.
+Traces, carbon intensity files and Spark event logs may be stored as gzip, xz or
+bzip2; the codec is detected from the file extension or, for reading, from the
+magic bytes at the start of the file, and data is (de)compressed while streaming.
+"""
+
+import bz2
+import gzip
+import lzma
+import os
+from typing import IO, Optional
+
+CODECS = {
+    "gz": gzip,
+    "xz": lzma,
+    "bz2": bz2,
+}
+EXTENSIONS = {
+    ".gz": "gz",
+    ".gzip": "gz",
+    ".xz": "xz",
+    ".lzma": "xz",
+    ".bz2": "bz2",
+}
+MAGIC_BYTES = [
+    (b"\x1f\x8b", "gz"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"BZh", "bz2"),
+]
+
+
+def detect_compression(path: str, check_magic: bool = True) -> Optional[str]:
+    """
+    Detect the compression codec of a file.
+
+    :param path: Path to the file.
+    :param check_magic: Whether to inspect the leading bytes when the extension is not conclusive.
+    :return: 'gz', 'xz', 'bz2' or None for uncompressed files.
+    """
+    codec = EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if codec or not check_magic or not os.path.isfile(path):
+        return codec
+    with open(path, "rb") as f:
+        head = f.read(6)
+    for magic, magic_codec in MAGIC_BYTES:
+        if head.startswith(magic):
+            return magic_codec
+    return None
+
+
+def open_text(path: str, mode: str = "r", newline: Optional[str] = None, compression: Optional[str] = None) -> IO[str]:
+    """
+    Open a possibly compressed file in text mode.
+
+    :param path: Path to the file.
+    :param mode: 'r', 'w' or 'a'.
+    :param newline: Passed through to the text wrapper (use '' for csv).
+    :param compression: Codec to use ('gz', 'xz', 'bz2'); detected from the path when None.
+    :return: A text file object.
+    """
+    if compression is None:
+        compression = detect_compression(path, check_magic="r" in mode)
+    if compression is None:
+        return open(path, mode, newline=newline)
+    if compression not in CODECS:
+        raise ValueError(f"Unsupported compression '{compression}'. Supported: {', '.join(sorted(CODECS))}")
+    return CODECS[compression].open(path, mode + "t", newline=newline)
+
+
+def with_compression_suffix(path: str, compression: Optional[str]) -> str:
+    """
+    Append the file extension of a codec to a path, unless it is already present.
+
+    :param path: Output path.
+    :param compression: Codec ('gz', 'xz', 'bz2') or None.
+    :return: The path with the codec extension.
+    """
+    if compression is None or detect_compression(path, check_magic=False) == compression:
+        return path
+    if compression not in CODECS:
+        raise ValueError(f"Unsupported compression '{compression}'. Supported: {', '.join(sorted(CODECS))}")
+    return f"{path}.{compression}"
+
+
+def strip_compression_suffix(path: str) -> str:
+    """
+    Remove a compression extension from a path, e.g. 'trace.csv.gz' -> 'trace.csv'.
+
+    :param path: Path to strip.
+    :return: The path without compression extension.
+    """
+    root, ext = os.path.splitext(path)
+    return root if ext.lower() in EXTENSIONS else path
+
+
+def resolve_path(path: str) -> str:
+    """
+    Resolve a path to an existing plain or compressed file.
+
+    If path does not exist but a compressed sibling does (path + '.gz', '.xz' or
+    '.bz2'), that sibling is returned; otherwise path is returned unchanged.
+
+    :param path: Path to resolve.
+    :return: The path of the existing file.
+    """
+    if os.path.exists(path):
+        return path
+    for codec in CODECS:
+        candidate = f"{path}.{codec}"
+        if os.path.exists(candidate):
+            return candidate
+    return path
@@ -6,19 +6,22 @@ detailed trace reports, and any other file-based outputs required by the project
 
 import os
 import logging
-from typing import Iterable, List
+from typing import Iterable, List, Optional
 from src.models.ProcessedTrace import ProcessedTrace
+from src.models.ScenarioResult import ScenarioResult
+from src.utils.Compression import open_text, with_compression_suffix
 
-def write_trace_file(folder: str, trace_file: str, records: Iterable[ProcessedTrace]) -> None:
+def write_trace_file(folder: str, trace_file: str, records: Iterable[ProcessedTrace], compression: Optional[str] = None) -> None:
     """Write processed trace records (ProcessedTrace) to CSV.
 
-    Always writes the ProcessedTrace header schema.
+    Always writes the ProcessedTrace header schema. With compression set to
+    'gz', 'xz' or 'bz2' the file is compressed and gets the matching extension.
     """
     _create_folder(folder)
-    output_file_name = f"{folder}/{trace_file}-trace.csv"
+    output_file_name = with_compression_suffix(f"{folder}/{trace_file}-trace.csv", compression)
     rec_list: List[ProcessedTrace] = list(records)
     try:
-        with open(output_file_name, "w") as file:
+        with open_text(output_file_name, "w", compression=compression) as file:
             fns = ProcessedTrace.fieldnames()
             file.write(','.join(fns) + '\n')
             for r in rec_list:
@@ -28,31 +31,33 @@ def write_trace_file(folder: str, trace_file: str, records: Iterable[ProcessedTr
         logging.error("Failed to write trace file %s: %s", output_file_name, e)
         raise
 
-def write_summary_file(folder: str, trace_file: str, content: str) -> None:
+def write_summary_file(folder: str, trace_file: str, content: str, compression: Optional[str] = None) -> None:
     """
     Write a summary report to a text file.
     
     :param folder: Directory where the file will be saved.
     :param trace_file: Base name for the summary file.
     :param content: Text content of the summary.
+    :param compression: Optional codec ('gz', 'xz', 'bz2') to compress the file with.
     """
     _create_folder(folder)
-    output_file_name = f"{folder}/{trace_file}-summary.txt"
+    output_file_name = with_compression_suffix(f"{folder}/{trace_file}-summary.txt", compression)
     try:
-        with open(output_file_name, "w") as file:
+        with open_text(output_file_name, "w", compression=compression) as file:
             file.write(content)
     except Exception as e:
         logging.error("Failed to write summary file %s: %s", output_file_name, e)
         raise
 
-def write_trace_and_detailed_report(folder: str, trace_file: str, records: Iterable[ProcessedTrace], content: str) -> None:
+def write_trace_and_detailed_report(folder: str, trace_file: str, records: Iterable[ProcessedTrace], content: str, compression: Optional[str] = None) -> None:
     """Write processed traces plus a human-readable ranking summary.
 
     Aggregates duplicate task ids (summing footprint metrics) then ranks tasks
     by average_co2e (primary) and runtime (secondary). A second list ranks by
     marginal_co2e. Embodied emissions included only for informational tie-breaks.
+    Both files are compressed when compression ('gz', 'xz', 'bz2') is given.
     """
-    output_file_name = f"{folder}/{trace_file}-detailed-summary.txt"
+    output_file_name = with_compression_suffix(f"{folder}/{trace_file}-detailed-summary.txt", compression)
     # Aggregate duplicates
     aggregated: dict[str, ProcessedTrace] = {}
     for r in records:
@@ -68,14 +73,14 @@ def write_trace_and_detailed_report(folder: str, trace_file: str, records: Itera
             aggregated[tid] = r
     rec_list: List[ProcessedTrace] = list(aggregated.values())
     # Persist CSV
-    write_trace_file(folder, trace_file, rec_list)
+    write_trace_file(folder, trace_file, rec_list, compression)
     # Sorting helpers
     def runtime(pr: ProcessedTrace) -> float:
         return (pr.ichnos.end - pr.ichnos.start) / 1000.0
     rec_sorted_footprint = sorted(rec_list, key=lambda x: (-x.average_co2e, -runtime(x)))
     rec_sorted_marginal = sorted(rec_list, key=lambda x: (-x.marginal_co2e, -runtime(x)))
     try:
-        with open(output_file_name, "w") as file:
+        with open_text(output_file_name, "w", compression=compression) as file:
             file.write(f"Detailed Report for {trace_file}\n")
             file.write(f"{content}\n\n" if content else "")
             file.write("Top 10 Tasks - ranked by average CO2e then runtime:\n")
@@ -97,6 +102,28 @@ def write_trace_and_detailed_report(folder: str, trace_file: str, records: Itera
         logging.error("Failed to write detailed report file %s: %s", output_file_name, e)
         raise
 
+def write_scenario_table(folder: str, trace_file: str, results: Iterable[ScenarioResult], compression: Optional[str] = None) -> None:
+    """
+    Write scenario results to a tidy CSV table, one row per scenario.
+
+    :param folder: Directory where the file will be saved.
+    :param trace_file: Base name for the table file.
+    :param results: ScenarioResult rows.
+    :param compression: Optional codec ('gz', 'xz', 'bz2') to compress the file with.
+    """
+    _create_folder(folder)
+    output_file_name = with_compression_suffix(f"{folder}/{trace_file}-scenarios.csv", compression)
+    try:
+        with open_text(output_file_name, "w", compression=compression) as file:
+            fns = ScenarioResult.fieldnames()
+            file.write(','.join(fns) + '\n')
+            for r in results:
+                row = r.to_dict()
+                file.write(','.join(str(row[h]) for h in fns) + '\n')
+    except Exception as e:
+        logging.error("Failed to write scenario table %s: %s", output_file_name, e)
+        raise
+
 def write_task_trace_and_rank_report(folder: str, trace_file: str, records: Iterable[ProcessedTrace]) -> None:
     """Deprecated: prefer write_trace_and_detailed_report. Kept for API stability."""
     write_trace_and_detailed_report(folder, trace_file, records, content="")
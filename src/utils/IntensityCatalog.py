@@ -0,0 +1,181 @@
+"""
+Module: IntensityCatalog
+This module resolves intensity sources (CI, EWIF, ELIF or any other per-kWh
+intensity) by name, the way the scripts refer to `data/intensity/<name>.csv`.
+
+The catalog indexes the intensity folder once (compressed files included, see
+Compression) and parses a file only when it is first asked for. Parsed series
+are kept in a least recently used cache bounded by the memory of their arrays,
+so analyses over many regions only hold the files they are currently using.
+A cached series is reloaded if its file changed on disk. Hit, miss and
+eviction counters show how well the cache fits a workload.
+
+Cached series are shared between callers and their values are read-only.
+"""
+
+import logging
+import os
+from collections import OrderedDict
+from typing import Dict, List, Sequence, Tuple, Union
+
+from src.models.CarbonIntensitySeries import CarbonIntensitySeries
+from src.models.RegionIntensity import RegionIntensity
+from src.utils.Compression import EXTENSIONS, resolve_path
+from src.utils.Parsers import parse_ci_series
+
+INTENSITY_DIR = "data/intensity"
+INTENSITY_EXTENSION = ".csv"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class IntensityCatalog:
+    """Process-wide, memory-bounded cache of intensity series, loaded by name.
+
+    A name is the file name in the folder without `.csv` and without a
+    compression extension, e.g. 'ci' for `ci.csv` or `ci.csv.gz`.
+    """
+
+    def __init__(self, folder: str = INTENSITY_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._paths: Dict[str, str] = None
+        self._series: 'OrderedDict[str, Tuple[Tuple[int, int], CarbonIntensitySeries]]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index()
+
+    @property
+    def names(self) -> List[str]:
+        """Names of all intensity files in the folder."""
+        return sorted(self._index())
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the cached series (values and any prefix sums built on them)."""
+        return sum(series.nbytes for _, series in self._series.values())
+
+    def get(self, name: str) -> CarbonIntensitySeries:
+        """
+        Return the intensity series of a file, parsing it on first use.
+
+        Series grow after they are cached when their prefix sums are built, so
+        the memory budget is checked again on every call, hits included.
+
+        :param name: Name of the intensity file.
+        :return: The CarbonIntensitySeries, shared with other callers.
+        """
+        path = self.path_of(name)
+        stat = os.stat(path)
+        version = (stat.st_size, stat.st_mtime_ns)
+        cached = self._series.get(name)
+        if cached is not None and cached[0] == version:
+            self._series.move_to_end(name)
+            self.hits += 1
+            self._evict(keep=name)
+            return cached[1]
+
+        self.misses += 1
+        series = parse_ci_series(path)
+        series.values.setflags(write=False)
+        self._series[name] = (version, series)
+        self._series.move_to_end(name)
+        logging.debug("Loaded intensity %s (%d periods)", name, len(series))
+        self._evict(keep=name)
+        return series
+
+    def resolve(self, source: Union[float, str]) -> Union[float, CarbonIntensitySeries]:
+        """
+        Resolve an intensity argument: constants are returned as they are, names are loaded.
+
+        :param source: Constant intensity or name of an intensity file.
+        :return: The constant or the CarbonIntensitySeries.
+        """
+        if isinstance(source, (int, float)):
+            return source
+        return self.get(source)
+
+    def get_regions(self, names: Sequence[str]) -> RegionIntensity:
+        """
+        Lay the intensity files of several regions out on one timeline.
+
+        :param names: Names of the intensity files, one per region.
+        :return: RegionIntensity with one row per region, in the order given.
+        """
+        return RegionIntensity.from_series(names, [self.get(name) for name in names])
+
+    def path_of(self, name: str) -> str:
+        """
+        Path of an intensity file.
+
+        Names missing from the index (files created since, or in a subfolder such
+        as 'marg/ci') are looked up on disk and added to it.
+
+        :param name: Name of the intensity file.
+        :return: Path to the (possibly compressed) file.
+        """
+        paths = self._index()
+        path = paths.get(name)
+        if path is None:
+            path = resolve_path(os.path.join(self.folder, f"{name}{INTENSITY_EXTENSION}"))
+            if not os.path.isfile(path):
+                raise FileNotFoundError(f"No intensity file {name}{INTENSITY_EXTENSION} in {self.folder}")
+            paths[name] = path
+        return path
+
+    def clear(self) -> None:
+        """Drop all cached series and the index, e.g. after files were added or removed."""
+        self._series.clear()
+        self._paths = None
+
+    def _index(self) -> Dict[str, str]:
+        if self._paths is None:
+            self._paths = _index_folder(self.folder)
+        return self._paths
+
+    def _evict(self, keep: str) -> None:
+        """Drop least recently used series until the cache fits max_bytes (keep is never dropped)."""
+        total = self.nbytes
+        while total > self.max_bytes and len(self._series) > 1:
+            name, (_, series) = next(iter(self._series.items()))
+            if name == keep:
+                break
+            del self._series[name]
+            total -= series.nbytes
+            self.evictions += 1
+            logging.debug("Evicted intensity %s", name)
+
+
+intensity_catalog = IntensityCatalog()
+
+##################################
+# MARK: Private functions
+##################################
+
+def _index_folder(folder: str) -> Dict[str, str]:
+    """
+    Map the names of the intensity files in a folder to their paths.
+
+    A plain file takes precedence over a compressed copy of the same name.
+
+    :param folder: Folder to index.
+    :return: Dict mapping names to paths.
+    """
+    paths: Dict[str, str] = {}
+    if not os.path.isdir(folder):
+        return paths
+    for entry in sorted(os.listdir(folder)):
+        stem, extension = os.path.splitext(entry)
+        compressed = extension.lower() in EXTENSIONS
+        if compressed:
+            stem, extension = os.path.splitext(stem)
+        if extension != INTENSITY_EXTENSION:
+            continue
+        if stem not in paths or not compressed:
+            paths[stem] = os.path.join(folder, entry)
+    return paths
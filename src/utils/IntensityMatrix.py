@@ -0,0 +1,119 @@
+"""
+Module: IntensityMatrix
+This module resolves per-kWh intensities (carbon, water, land use or any other
+metric) for task pieces and applies them to the piece energies.
+
+All metrics of a calculation are resolved into one (pieces x metrics) intensity
+matrix, so their footprints come from a single pass over the pieces:
+
+  footprints = energy[:, None] * onsite_factors + energy_pue[:, None] * intensities
+
+Intensities can be constants, CarbonIntensitySeries (integrated over each piece)
+or dicts keyed by interval start. No file I/O is performed in this module.
+"""
+
+from typing import Dict, Sequence, Union
+
+import numpy as np
+
+from src.models.CarbonIntensitySeries import CarbonIntensitySeries
+from src.models.IntensityMetric import IntensityMetric
+from src.models.TaskPieces import TaskPieces
+from src.utils.TimeUtils import to_timestamp
+
+def intensity_per_interval(intensity: Union[float, Dict[Union[int, str], float], CarbonIntensitySeries], pieces: TaskPieces, active: np.ndarray, time_weighted: bool) -> np.ndarray:
+    """
+    Resolve an intensity (constant, series or keyed by interval) for every interval.
+
+    :param intensity: Intensity as a float, a CarbonIntensitySeries, or a dict keyed by interval start in ms or by 'MM/DD-HH:MM'.
+    :param pieces: TaskPieces of the intervals.
+    :param active: Mask of the intervals that need a value; others are left as NaN.
+    :param time_weighted: Average a series over the span of each interval's pieces instead of taking the value at the interval start.
+    :return: Array of intensity values per interval.
+    """
+    interval_starts = pieces.interval_starts
+    if isinstance(intensity, (int, float)):
+        return np.full(len(interval_starts), float(intensity))
+    values = np.full(len(interval_starts), np.nan)
+    if isinstance(intensity, CarbonIntensitySeries):
+        if time_weighted:
+            span_start = np.full(len(interval_starts), np.iinfo(np.int64).max)
+            span_end = np.full(len(interval_starts), np.iinfo(np.int64).min)
+            np.minimum.at(span_start, pieces.interval_index, pieces.start)
+            np.maximum.at(span_end, pieces.interval_index, pieces.end)
+            values[active] = intensity.mean_between(span_start[active], span_end[active])
+        else:
+            values[active] = intensity.values_at(interval_starts[active])
+        return values
+    for i in np.flatnonzero(active):
+        interval_start = int(interval_starts[i])
+        if interval_start in intensity:
+            values[i] = intensity[interval_start]
+        else:
+            values[i] = intensity[_intensity_key(interval_start)]
+    return values
+
+
+def intensity_per_piece(intensity: Union[float, Dict[Union[int, str], float], CarbonIntensitySeries], pieces: TaskPieces, by_interval: np.ndarray, time_weighted: bool) -> np.ndarray:
+    """
+    Resolve the intensity of every task piece.
+
+    :param intensity: Intensity as given to calculate_carbon_footprint_ccf.
+    :param pieces: TaskPieces to resolve.
+    :param by_interval: Intensity per interval from intensity_per_interval.
+    :param time_weighted: Integrate a series over each piece instead of using its interval's value.
+    :return: Array of intensity values per piece.
+    """
+    if time_weighted and isinstance(intensity, CarbonIntensitySeries):
+        return intensity.mean_between(pieces.start, pieces.end)
+    return by_interval[pieces.interval_index]
+
+
+def intensity_matrix(metrics: Sequence[IntensityMetric], pieces: TaskPieces, active: np.ndarray, time_weighted: bool) -> np.ndarray:
+    """
+    Resolve the intensity of every metric for every task piece.
+
+    :param metrics: Metrics to resolve.
+    :param pieces: TaskPieces to resolve.
+    :param active: Mask of the intervals that have pieces.
+    :param time_weighted: Integrate series over each piece instead of using the value at the interval start.
+    :return: Intensities, shape (pieces, metrics).
+    """
+    matrix = np.empty((len(pieces), len(metrics)))
+    for k, metric in enumerate(metrics):
+        if time_weighted and isinstance(metric.intensity, CarbonIntensitySeries):
+            matrix[:, k] = metric.intensity.mean_between(pieces.start, pieces.end)
+        else:
+            matrix[:, k] = intensity_per_interval(metric.intensity, pieces, active, False)[pieces.interval_index]
+    return matrix
+
+
+def metric_footprints(energy: np.ndarray, energy_pue: np.ndarray, intensities: np.ndarray, onsite_factors: np.ndarray) -> np.ndarray:
+    """
+    Footprint of every piece for every metric.
+
+    :param energy: Energy per piece exc. PUE (kWh).
+    :param energy_pue: Energy per piece inc. PUE (kWh).
+    :param intensities: Supply intensities, shape (pieces, metrics), from intensity_matrix.
+    :param onsite_factors: Onsite intensity per metric (per kWh exc. PUE).
+    :return: Footprints, shape (pieces, metrics).
+    """
+    return energy[:, None] * np.asarray(onsite_factors, dtype=np.float64) + energy_pue[:, None] * intensities
+
+##################################
+# MARK: Private functions
+##################################
+
+def _intensity_key(interval_start: int) -> str:
+    """
+    Build the 'MM/DD-HH:MM' key used by parse_ci_intervals for an interval start.
+
+    :param interval_start: Interval start in ms.
+    :return: Intensity key.
+    """
+    hour_ts = to_timestamp(interval_start)
+    hh: str = str(hour_ts.hour).zfill(2)
+    month: str = str(hour_ts.month).zfill(2)
+    day: str = str(hour_ts.day).zfill(2)
+    mm: str = str(hour_ts.minute).zfill(2)
+    return f'{month}/{day}-{hh}:{mm}'
@@ -13,7 +13,9 @@ Polynomial model function:
 No file I/O is performed in this module. Exception handling is not required for the polynomial computations.
 """
 
-from typing import List, Callable
+from typing import List, Callable, Union
+
+import numpy as np
 
 def polynomial_model(coefficients: List[float]) -> Callable[[float], float]:
     """
@@ -61,3 +63,35 @@ def fitted_linear_power_model(coefficient, intercept) -> Callable[[float], float
     :return the fitted linear function reflecting the power range.
     """
     return linear_model(coefficient, 0)
+
+def evaluate_polynomial(coefficients: np.ndarray, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+    """
+    Evaluate a single polynomial for a value or an array of values using Horner's method.
+
+    :param coefficients: Coefficients [a_n, ..., a_0].
+    :param x: Input value or array of input values.
+    :return: Polynomial value(s), a float for a scalar input.
+    """
+    if np.ndim(x) == 0:
+        result = 0.0
+        for coeff in coefficients:
+            result = result * x + float(coeff)
+        return result
+    x = np.asarray(x, dtype=np.float64)
+    result = np.zeros(x.shape, dtype=np.float64)
+    for coeff in coefficients:
+        result = result * x + coeff
+    return result
+
+def evaluate_polynomials(coefficients: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """
+    Evaluate one polynomial per element of x using Horner's method.
+
+    :param coefficients: Array of shape (len(x), n + 1) holding [a_n, ..., a_0] for each element.
+    :param x: Array of input values.
+    :return: Array of polynomial values, one per element of x.
+    """
+    result = np.zeros(len(x), dtype=np.float64)
+    for j in range(coefficients.shape[1]):
+        result = result * x + coefficients[:, j]
+    return result
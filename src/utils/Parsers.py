@@ -6,10 +6,15 @@ trace files, and for validating input values.
 """
 
 import logging
-from typing import Tuple, List, Dict, Union
+from typing import Callable, Tuple, List, Dict, Optional, Union
+import numpy as np
 import yaml
 from src.Constants import *
 from src.models.IchnosTrace import IchnosTrace
+from src.models.CarbonIntensitySeries import CarbonIntensitySeries
+from src.models.TraceTable import TraceTable
+from src.utils.TraceCache import load_trace_table
+from src.utils.Compression import open_text, resolve_path
 from src.utils.Usage import print_usage_exit_TemporalInterrupt
 
 """
@@ -143,7 +148,7 @@ def parse_arguments_with_config(args: List[str]) -> Dict[str, Union[float, int,
 """
 This parses arguments for the TemporalInterrupt script.
 """
-def parse_arguments_TemporalInterrupt(args: List[str]) -> Dict[str, Union[float, int, str]]:
+def parse_arguments_TemporalInterrupt(args: List[str]) -> Dict[str, Union[float, int, str, List]]:
     """
     Parse command-line arguments for the TemporalInterrupt script.
 
@@ -155,12 +160,39 @@ def parse_arguments_TemporalInterrupt(args: List[str]) -> Dict[str, Union[float,
       - [3]: interval (int)
       - Given 6 arguments, [4] is PUE and [5] is memory coefficient.
       Defaults are used when only 3 arguments are provided.
+    Flags, anywhere in args:
+      - --contiguous, --optimal or --regions a,b,c: shifting mode (interrupting by default);
+        --regions lists the CI files of the candidate regions for spatio-temporal shifting
+      - --flexibility 6,12,24 or 1-168: flexibility windows (CI periods, at least 1)
+      - --max-interruptions n: cap on the interruptions in optimal mode
+      - --workers n: number of processes
+    Invalid or incomplete arguments print the usage and exit.
     
     :param args: List of argument strings.
     :return: Dictionary mapping argument names to their parsed values.
     """
+    args = list(args)
+    modes = [mode for flag, mode in (('--contiguous', CONTIGUOUS), ('--optimal', OPTIMAL)) if flag in args]
+    for flag in ('--contiguous', '--optimal'):
+        if flag in args:
+            args.remove(flag)
+    try:
+        flexibility = pop_flag_value(args, '--flexibility', print_usage_exit_TemporalInterrupt)
+        flexibility = _parse_flexibility(flexibility) if flexibility is not None else DEFAULT_FLEXIBILITY
+        max_interruptions = pop_flag_value(args, '--max-interruptions', print_usage_exit_TemporalInterrupt)
+        max_interruptions = int(max_interruptions) if max_interruptions is not None else None
+        workers = int(pop_flag_value(args, '--workers', print_usage_exit_TemporalInterrupt) or 1)
+    except ValueError:
+        print_usage_exit_TemporalInterrupt()
+    regions = pop_flag_value(args, '--regions', print_usage_exit_TemporalInterrupt)
+    if regions is not None:
+        modes.append(SPATIAL)
+
     if len(args) != 3 and len(args) != 6:
         print_usage_exit_TemporalInterrupt()
+    if len(modes) > 1 or not flexibility or min(flexibility) < 1 or workers < 1 \
+            or (max_interruptions is not None and max_interruptions < 0) or regions == '':
+        print_usage_exit_TemporalInterrupt()
 
     arguments: Dict[str, Union[float, int, str]] = {}
     arguments[TRACE] = args[0]
@@ -176,11 +208,20 @@ def parse_arguments_TemporalInterrupt(args: List[str]) -> Dict[str, Union[float,
         arguments[PUE] = DEFAULT_PUE_VALUE
         arguments[MEMORY_COEFFICIENT] = DEFAULT_MEMORY_POWER_DRAW
 
+    arguments[SHIFT_MODE] = modes[0] if modes else INTERRUPT
+    arguments[FLEXIBILITY] = flexibility
+    arguments[MAX_INTERRUPTIONS] = max_interruptions
+    arguments[WORKERS] = workers
+    arguments[REGIONS] = regions.split(',') if regions is not None else None
+
     return arguments
 
 def parse_ci_intervals(filename: str) -> Dict[str, float]:
     """
     Parse a carbon intensity intervals file.
+
+    Compressed files (.gz, .xz, .bz2) are decompressed while reading, and a
+    missing plain path falls back to its compressed sibling.
     
     :param filename: Path to the CI file.
     :return: Dictionary mapping time keys to carbon intensity values.
@@ -208,15 +249,90 @@ def parse_ci_intervals(filename: str) -> Dict[str, float]:
     return ci_map
 
 
-def parse_ichnos_trace_file(filepath: str) -> List[IchnosTrace]:
-    """Parse an IchnosTrace CSV (produced by IchnosTrace.to_csv)."""
+def parse_ci_series(filename: str) -> CarbonIntensitySeries:
+    """
+    Parse a carbon intensity intervals file into a CarbonIntensitySeries.
+
+    Unlike parse_ci_intervals, rows are addressed by their full UTC timestamp
+    (date + start), so files spanning several years do not collide. The period
+    is taken from the start/end columns of the first row when present. Files
+    written by ExportCarbonIntensity (date, hour, ..., ci) are read as well.
+
+    :param filename: Path to the CI file (optionally compressed).
+    :return: CarbonIntensitySeries with one value per period (NaN for gaps).
+    """
+    (header, data) = _get_ci_file_data(filename)
+
+    date_i = header.index("date")
+    start_i = header.index("start" if "start" in header else "hour")
+    end_i = header.index("end") if "end" in header else None
+    value_i = header.index("actual" if "actual" in header else "ci")
+
+    stamps: List[str] = []
+    values: List[float] = []
+    period_minutes = None
+
+    for row in data:
+        parts = row.strip().split(",")
+        if len(parts) <= value_i:
+            continue
+        try:
+            value = float(parts[value_i])
+        except ValueError:
+            logging.error("Invalid carbon intensity value in file %s", filename)
+            continue
+        stamps.append(f"{parts[date_i]}T{parts[start_i].zfill(5)}")
+        values.append(value)
+        if period_minutes is None and end_i is not None:
+            period_minutes = _minutes_between(parts[start_i], parts[end_i])
+
+    timestamps = np.array(stamps, dtype='datetime64[m]').astype('datetime64[ms]').astype(np.int64)
+    period = period_minutes * 60000 if period_minutes else None
+    return CarbonIntensitySeries.from_timestamps(timestamps, np.array(values), period)
+
+
+def parse_ichnos_trace_file(filepath: str, use_cache: bool = True) -> List[IchnosTrace]:
+    """Parse an IchnosTrace CSV (produced by IchnosTrace.to_csv).
+
+    The file is loaded through the binary trace cache (see TraceCache), which is
+    rebuilt transparently whenever the CSV changes.
+    """
     try:
-        traces = IchnosTrace.from_csv(filepath)
+        traces = load_trace_table(resolve_path(filepath), use_cache).to_traces()
     except Exception as e:
         logging.error("Error parsing ichnos trace file %s: %s", filepath, e)
         raise
     return traces
 
+
+def parse_ichnos_trace_table(filepath: str, use_cache: bool = True) -> TraceTable:
+    """Parse an IchnosTrace CSV into a columnar TraceTable, through the binary trace cache."""
+    try:
+        table = load_trace_table(resolve_path(filepath), use_cache)
+    except Exception as e:
+        logging.error("Error parsing ichnos trace file %s: %s", filepath, e)
+        raise
+    return table
+
+
+def pop_flag_value(args: List[str], flag: str, print_usage_exit: Callable[[], None]) -> Optional[str]:
+    """
+    Remove a flag and its value from args.
+
+    :param args: Argument list, modified in place.
+    :param flag: Flag to look for, e.g. '--workers'.
+    :param print_usage_exit: Usage function of the script, called if the value is missing.
+    :return: The value of the flag, or None if it is not given. Prints usage and exits if the value is missing.
+    """
+    if flag not in args:
+        return None
+    index = args.index(flag)
+    if index + 1 >= len(args) or args[index + 1].startswith('--'):
+        print_usage_exit()
+    value = args[index + 1]
+    del args[index:index + 2]
+    return value
+
 ##################################
 # MARK: Private functions
 ##################################
@@ -229,7 +345,7 @@ def _get_ci_file_data(filename: str) -> Tuple[List[str], List[str]]:
     :return: Tuple containing the header list and a list of data lines.
     """
     try:
-        with open(filename, 'r') as file:
+        with open_text(resolve_path(filename), 'r') as file:
             raw = file.readlines()
     except Exception as e:
         logging.error("Error reading file %s: %s", filename, e)
@@ -239,6 +355,37 @@ def _get_ci_file_data(filename: str) -> Tuple[List[str], List[str]]:
     return (header, data)
 
 
+def _parse_flexibility(value: str) -> List[int]:
+    """
+    Parse flexibility windows given as a comma separated list of windows and
+    inclusive ranges, e.g. '6,12,24' or '1-168'.
+
+    :param value: Windows as given on the command line.
+    :return: List of windows; raises ValueError if a window is not an integer.
+    """
+    windows: List[int] = []
+    for part in value.split(','):
+        if '-' in part:
+            first, last = part.split('-')
+            windows.extend(range(int(first), int(last) + 1))
+        else:
+            windows.append(int(part))
+    return windows
+
+
+def _minutes_between(start: str, end: str) -> int:
+    """
+    Minutes from an 'HH:MM' start to an 'HH:MM' end, wrapping over midnight.
+
+    :param start: Start time of day.
+    :param end: End time of day.
+    :return: Length of the period in minutes (a full day if start equals end).
+    """
+    (start_h, start_m), (end_h, end_m) = (map(int, start.split(":")), map(int, end.split(":")))
+    minutes = ((end_h * 60 + end_m) - (start_h * 60 + start_m)) % 1440
+    return minutes or 1440
+
+
 def _print_usage_exit_CarbonFootprint() -> None:
     """
     Print usage information for the CarbonFootprint script and exit.
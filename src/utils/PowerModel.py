@@ -1,10 +1,25 @@
-from typing import Callable
-import src.utils.MathModels as MathModels
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from src.models.CompiledPowerModel import CompiledPowerModel
+from src.models.PowerLookupTable import PowerLookupTable
 from src.utils.NodeConfigModelReader import load_node_config
 
+# host sets (and resolutions) whose coefficient matrices and lookup tables stay cached
+MAX_CACHED_HOST_SETS = 32
+
+
+def get_power_model_coefficients_for_node(node_id: str, model_name: str) -> Tuple[List[float], float]:
+    """
+    Resolve the dynamic power model of a node as polynomial coefficients.
 
-def get_power_model_for_node(node_id: str, model_name: str) -> Callable[[float], float]:
-    print(f'Node {node_id} with power model {model_name} selected')
+    :param node_id: Node identifier in the node config.
+    :param model_name: Power model name, e.g. 'default_minmax'.
+    :return: Tuple of coefficients [a_n, ..., a_0] of the dynamic power model and the static watts.
+    """
     node_config = load_node_config()
 
     # Get the model data
@@ -15,14 +30,142 @@ def get_power_model_for_node(node_id: str, model_name: str) -> Callable[[float],
     if model_type == 'minmax':
         min_watts = node_config[node_id][governor]['min_watts']
         max_watts = node_config[node_id][governor]['max_watts']
-        return (MathModels.min_max_linear_power_model(min_watts, max_watts), min_watts)
+        return ([(max_watts - min_watts) / 100, 0], min_watts)
     elif model_type == 'baseline':
         tdp_per_core = node_config[node_id]['tdp_per_core']
-        return (MathModels.baseline_linear_power_model(tdp_per_core), 0)
+        return ([tdp_per_core / 100, 0], 0)
     elif model_type == 'linear':
         linear_vals = node_config[node_id][governor]['linear']
         coeff = linear_vals[0]
         inter = linear_vals[1]
-        return (MathModels.fitted_linear_power_model(coeff, inter), inter)
+        return ([coeff, 0], inter)
+
+    # fitted polynomial: the intercept is the static draw, the remaining terms the dynamic draw
+    coefficients = node_config[node_id][governor][model_type]
+    return (list(coefficients[:-1]) + [0], coefficients[-1])
+
+
+class PowerModelRegistry:
+    """Process-wide cache of compiled power models.
+
+    Every (node, model name) pair is resolved from the node config and compiled
+    into a CompiledPowerModel once. Coefficient matrices and lookup tables for a
+    list of hosts, as used by the vectorized energy estimation, are cached as
+    well; as sweeps may ask for many host lists or resolutions, only the
+    max_host_sets most recently used of each are kept. Cached arrays are read-only.
+    """
+
+    def __init__(self, max_host_sets: int = MAX_CACHED_HOST_SETS):
+        self.max_host_sets = max_host_sets
+        self._models: Dict[Tuple[str, str], CompiledPowerModel] = {}
+        self._matrices: 'OrderedDict[Tuple[Tuple[str, ...], str], Tuple[np.ndarray, np.ndarray]]' = OrderedDict()
+        self._tables: 'OrderedDict[Tuple[Tuple[str, ...], str, float, float], PowerLookupTable]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def get(self, node_id: str, model_name: str) -> CompiledPowerModel:
+        """
+        Return the compiled power model of a node, compiling it on first use.
+
+        :param node_id: Node identifier in the node config.
+        :param model_name: Power model name, e.g. 'default_minmax'.
+        :return: The CompiledPowerModel.
+        """
+        key = (node_id, model_name)
+        model = self._models.get(key)
+        if model is None:
+            coefficients, static_watts = get_power_model_coefficients_for_node(node_id, model_name)
+            coefficients = np.array(coefficients, dtype=np.float64)
+            coefficients.setflags(write=False)
+            model = CompiledPowerModel(node_id, model_name, coefficients, float(static_watts))
+            self._models[key] = model
+            logging.debug("Compiled power model %s for node %s", model_name, node_id)
+        return model
+
+    def get_many(self, node_ids: Sequence[str], model_name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gather the power models of several nodes into arrays indexed like node_ids.
+
+        :param node_ids: Node identifiers.
+        :param model_name: Power model name.
+        :return: Tuple of the coefficient matrix (nodes x degree + 1, zero padded on the left) and the static watts per node.
+        """
+        key = (tuple(node_ids), model_name)
+        cached = self._matrices.get(key)
+        if cached is not None:
+            self._matrices.move_to_end(key)
+        else:
+            models = [self.get(node_id, model_name) for node_id in key[0]]
+            width = max((len(model.coefficients) for model in models), default=1)
+            coefficients = np.zeros((len(models), width), dtype=np.float64)
+            for i, model in enumerate(models):
+                coefficients[i, width - len(model.coefficients):] = model.coefficients
+            static_watts = np.array([model.static_watts for model in models], dtype=np.float64)
+            coefficients.setflags(write=False)
+            static_watts.setflags(write=False)
+            cached = (coefficients, static_watts)
+            self._remember(self._matrices, key, cached)
+        return cached
+
+    def get_lookup_table(self, node_ids: Sequence[str], model_name: str, resolution: float = 1.0, max_utilization: float = 100.0) -> PowerLookupTable:
+        """
+        Sample the power models of several nodes into a lookup table (rows indexed like node_ids).
+
+        :param node_ids: Node identifiers.
+        :param model_name: Power model name.
+        :param resolution: Sampling step in utilization percent.
+        :param max_utilization: Utilization the table must cover (%); larger values use the analytic model.
+        :return: The PowerLookupTable, including the max interpolation error per node.
+        """
+        key = (tuple(node_ids), model_name, float(resolution), float(max_utilization))
+        table = self._tables.get(key)
+        if table is not None:
+            self._tables.move_to_end(key)
+        else:
+            coefficients, _ = self.get_many(key[0], model_name)
+            table = PowerLookupTable.from_coefficients(coefficients, resolution, max_utilization)
+            table.watts.setflags(write=False)
+            self._remember(self._tables, key, table)
+            logging.debug("Sampled %s for %d nodes every %s%%, max error %sW", model_name, len(key[0]), resolution, table.max_error.max(initial=0.0))
+        return table
+
+    def clear(self) -> None:
+        """Drop all compiled models, e.g. after the node config changed."""
+        self._models.clear()
+        self._matrices.clear()
+        self._tables.clear()
+
+    def _remember(self, cache: OrderedDict, key: tuple, value) -> None:
+        """Cache a per-host-set result, dropping the least recently used beyond max_host_sets."""
+        cache[key] = value
+        while len(cache) > self.max_host_sets:
+            cache.popitem(last=False)
+
+
+power_model_registry = PowerModelRegistry()
+
+
+def get_power_model(node_id: str, model_name: str) -> CompiledPowerModel:
+    """
+    Return the compiled power model of a node from the process-wide registry.
+
+    :param node_id: Node identifier in the node config.
+    :param model_name: Power model name, e.g. 'default_minmax'.
+    :return: The CompiledPowerModel.
+    """
+    return power_model_registry.get(node_id, model_name)
+
+
+def get_power_model_for_node(node_id: str, model_name: str) -> Tuple[CompiledPowerModel, float]:
+    """
+    Return the power model of a node and its static watts, from the process-wide registry.
+
+    The compiled model is called with a CPU utilisation and returns watts.
 
-    return (MathModels.polynomial_model(node_config[node_id][governor][model_type]), inter)  # this should not be used...
+    :param node_id: Node identifier in the node config.
+    :param model_name: Power model name, e.g. 'default_minmax'.
+    :return: Tuple of the CompiledPowerModel and the static watts.
+    """
+    model = get_power_model(node_id, model_name)
+    return (model, model.static_watts)
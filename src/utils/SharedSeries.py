@@ -0,0 +1,59 @@
+"""
+Module: SharedSeries
+This module shares a CarbonIntensitySeries with worker processes without
+pickling its values to every one of them.
+
+The values are written once to a `.npy` file that every worker memory-maps
+read-only, so all processes read the same pages of the OS page cache. Workers
+receive only the (path, period, start timestamp) triple, e.g. through a pool
+initializer, and rebuild the series with open_shared_series. The intensity of
+several regions (RegionIntensity) is shared the same way and rebuilt with
+open_shared_regions.
+"""
+
+import os
+from typing import List, Tuple, Union
+
+import numpy as np
+
+from src.models.CarbonIntensitySeries import CarbonIntensitySeries
+from src.models.RegionIntensity import RegionIntensity
+
+SharedSeriesHandle = Tuple[str, int, int]  # (path of the .npy file, period, start timestamp)
+
+
+def save_shared_series(ci: Union[CarbonIntensitySeries, RegionIntensity], folder: str, name: str = 'ci') -> SharedSeriesHandle:
+    """
+    Write the values of a series to folder/<name>.npy for workers to memory-map.
+
+    :param ci: Series (or regions) to share.
+    :param folder: Existing folder to write to, e.g. a temporary directory owned by the caller.
+    :param name: File name without extension.
+    :return: Handle to pass to open_shared_series.
+    """
+    path = os.path.join(folder, f"{name}.npy")
+    np.save(path, ci.values)
+    return path, ci.period, ci.start_timestamp
+
+
+def open_shared_series(handle: SharedSeriesHandle) -> CarbonIntensitySeries:
+    """
+    Rebuild a shared series on top of a read-only memory map of its values.
+
+    :param handle: Handle returned by save_shared_series.
+    :return: CarbonIntensitySeries whose values are not copied into the process.
+    """
+    path, period, start_timestamp = handle
+    return CarbonIntensitySeries(period, start_timestamp, np.load(path, mmap_mode='r'))
+
+
+def open_shared_regions(handle: SharedSeriesHandle, regions: List[str]) -> RegionIntensity:
+    """
+    Rebuild shared region intensities on top of a read-only memory map of their values.
+
+    :param handle: Handle returned by save_shared_series for a RegionIntensity.
+    :param regions: Region names, in the order of the rows.
+    :return: RegionIntensity whose values are not copied into the process.
+    """
+    path, period, start_timestamp = handle
+    return RegionIntensity(list(regions), period, start_timestamp, np.load(path, mmap_mode='r'))
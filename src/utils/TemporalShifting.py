@@ -0,0 +1,235 @@
+"""
+Module: TemporalShifting
+This module scores alternative schedules of a workflow against a carbon
+intensity series, using the per-interval energy of the workflow (IntervalEnergy)
+instead of recomputing the footprint from the tasks for every schedule.
+
+A contiguous shift keeps the shape of the workflow and only moves its start by
+a whole number of CI periods. With the interval energies laid out on the CI
+periods as a weight vector w, the footprint at offset s is sum_j w[j] * ci[first + j + s],
+so the footprints of all offsets in a window are one sliding dot product
+(np.correlate) of the CI values with w.
+
+An interrupting schedule places the intervals in increasing slots of the window.
+Every interruption costs the energy and time of the work it loses, so the best
+schedule trades CI savings against overhead: optimal_interrupt_schedule finds it
+with a dynamic program over (interval, slot), in O(intervals x window) time
+(times the number of allowed interruptions when those are capped).
+
+Spatio-temporal shifting moves the whole workflow to another region as well.
+With the intensity of all regions laid out as one region x period array, the
+footprints of every (region, offset) pair are a single product of the sliding
+windows of that array with w, so adding regions does not repeat the energy
+estimation or the per-region setup.
+
+No file I/O is performed in this module.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.models.CarbonIntensitySeries import CarbonIntensitySeries
+from src.models.ContiguousShiftResult import ContiguousShiftResult
+from src.models.IntervalEnergy import IntervalEnergy
+from src.models.InterruptSchedule import InterruptSchedule
+from src.models.RegionIntensity import RegionIntensity
+from src.models.SpatioTemporalShiftResult import SpatioTemporalShiftResult
+
+def period_weights(interval_energy: IntervalEnergy, ci: CarbonIntensitySeries) -> Tuple[int, np.ndarray]:
+    """
+    Lay the carbon weights of the intervals out on the periods of a CI series.
+
+    Each interval is charged the intensity of the period containing its start, as
+    calculate_carbon_footprint_ccf does with time_weighted=False.
+
+    :param interval_energy: Per-interval energy of the workflow.
+    :param ci: Carbon intensity series.
+    :return: Tuple of the index of the first period and the weight (kWh) of every period from there on.
+    """
+    if len(interval_energy) == 0:
+        return 0, np.zeros(0)
+    positions = ci.index_of(np.asarray(interval_energy.interval_starts, dtype=np.int64))
+    first = int(positions.min())
+    return first, np.bincount(positions - first, weights=interval_energy.carbon_weights)
+
+
+def contiguous_shift_emissions(weights: np.ndarray, values: np.ndarray, first: int, max_offset: int) -> np.ndarray:
+    """
+    Footprint of the workflow for every start offset 0..max_offset.
+
+    :param weights: Weight (kWh) per period, from period_weights.
+    :param values: Intensity per period (e.g. CarbonIntensitySeries.values).
+    :param first: Index of the period of weights[0] in values.
+    :param max_offset: Largest offset (periods) to score.
+    :return: Emissions per offset, NaN where the shifted workflow meets a gap in the data.
+    """
+    if first < 0 or first + len(weights) + max_offset > len(values):
+        raise ValueError("Carbon intensity data does not cover the shifting window")
+    window = values[first:first + len(weights) + max_offset]
+    return np.correlate(window, weights, mode='valid')
+
+
+def best_contiguous_shift(interval_energy: IntervalEnergy, ci: CarbonIntensitySeries, max_offset: int) -> ContiguousShiftResult:
+    """
+    Find the start offset within max_offset periods with the lowest operational carbon.
+
+    :param interval_energy: Per-interval energy of the workflow.
+    :param ci: Carbon intensity series.
+    :param max_offset: Largest offset (periods) the workflow may be delayed by.
+    :return: ContiguousShiftResult with the best offset and the footprint of every offset.
+    """
+    first, weights = period_weights(interval_energy, ci)
+    emissions = contiguous_shift_emissions(weights, ci.values, first, max_offset)
+    if np.isnan(emissions[0]):
+        raise ValueError("Carbon intensity data has gaps during the original execution")
+    best = int(np.nanargmin(emissions))
+    return ContiguousShiftResult(
+        best_offset=best,
+        best_offset_ms=best * ci.period,
+        best_emissions=float(emissions[best]),
+        original_emissions=float(emissions[0]),
+        emissions=emissions
+    )
+
+
+def spatio_temporal_shift_emissions(weights: np.ndarray, values: np.ndarray, first: int, max_offset: int) -> np.ndarray:
+    """
+    Footprint of the workflow in every region for every start offset 0..max_offset.
+
+    :param weights: Weight (kWh) per period, from period_weights.
+    :param values: Intensity per region and period (e.g. RegionIntensity.values).
+    :param first: Index of the period of weights[0] in values.
+    :param max_offset: Largest offset (periods) to score.
+    :return: Emissions per region and offset, NaN where the shifted workflow meets a gap in the data.
+    """
+    if first < 0 or first + len(weights) + max_offset > values.shape[1]:
+        raise ValueError("Carbon intensity data does not cover the shifting window")
+    window = values[:, first:first + len(weights) + max_offset]
+    return np.lib.stride_tricks.sliding_window_view(window, len(weights), axis=1) @ weights
+
+
+def best_spatio_temporal_shift(interval_energy: IntervalEnergy, regions: RegionIntensity, max_offset: int) -> SpatioTemporalShiftResult:
+    """
+    Score moving the workflow to every region and start offset within max_offset periods.
+
+    The first region is the one the workflow originally ran in; its offset 0 is
+    the original footprint.
+
+    :param interval_energy: Per-interval energy of the workflow.
+    :param regions: Carbon intensity of the candidate regions on one timeline.
+    :param max_offset: Largest offset (periods) the workflow may be delayed by.
+    :return: SpatioTemporalShiftResult with the footprint of every region and offset.
+    """
+    first, weights = period_weights(interval_energy, regions.series(0))
+    emissions = spatio_temporal_shift_emissions(weights, regions.values, first, max_offset)
+    if np.isnan(emissions[0, 0]):
+        raise ValueError("Carbon intensity data has gaps during the original execution")
+    return SpatioTemporalShiftResult(
+        regions=regions.regions,
+        period=regions.period,
+        original_emissions=float(emissions[0, 0]),
+        emissions=emissions
+    )
+
+
+def optimal_interrupt_schedule(weights: np.ndarray, values: np.ndarray, overhead_energy: np.ndarray, overhead_ms: np.ndarray, embodied_per_ms: float = 0.0, max_interruptions: Optional[int] = None) -> InterruptSchedule:
+    """
+    Find the interrupting schedule with the lowest operational plus overhead embodied carbon.
+
+    Interval i runs in slot s_i of the window, with s_0 < s_1 < ... . Running it
+    costs weights[i] * values[s_i]. Leaving a gap after interval i (s_{i+1} > s_i + 1)
+    costs overhead_energy[i] * values[s_{i+1}] for the redone work plus
+    overhead_ms[i] * embodied_per_ms. Slots without data (NaN) are never used.
+
+    The dynamic program keeps, for every slot, the cheapest placement of the
+    intervals so far that ends in that slot. A gap may follow any earlier slot, so
+    its best predecessor is a running minimum, and each interval costs O(window).
+
+    :param weights: Energy (kWh) multiplying the intensity of each interval's slot, in interval order.
+    :param values: Intensity of every slot of the window.
+    :param overhead_energy: Energy (kWh) redone when interrupting after interval i, length len(weights) - 1.
+    :param overhead_ms: Time (ms) redone when interrupting after interval i, length len(weights) - 1.
+    :param embodied_per_ms: Embodied carbon per ms of overhead (gCO2e/ms).
+    :param max_interruptions: Optional cap on the number of interruptions.
+    :return: The optimal InterruptSchedule.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    n, window = len(weights), len(values)
+    if n == 0:
+        return InterruptSchedule(np.zeros(0, dtype=np.int64), 0.0, 0.0, 0.0, 0)
+    if window < n:
+        raise ValueError("The window has fewer slots than the workflow has intervals")
+    values = np.where(np.isnan(values), np.inf, np.asarray(values, dtype=np.float64))
+    overhead_energy = np.asarray(overhead_energy, dtype=np.float64)
+    overhead_penalty = np.asarray(overhead_ms, dtype=np.float64) * embodied_per_ms
+    layers = 1 if max_interruptions is None else int(max_interruptions) + 1
+    slots = np.arange(window)
+
+    # cost[j, t]: cheapest placement of intervals 0..i with interval i in slot t after j interruptions
+    cost = np.full((layers, window), np.inf)
+    cost[0] = weights[0] * values
+    cost[:, window - n + 1:] = np.inf  # the remaining intervals must still fit
+    previous = np.empty((n, layers, window), dtype=np.int32)
+    for i in range(1, n):
+        # run straight on from slot t - 1
+        contiguous = np.full((layers, window), np.inf)
+        contiguous[:, 1:] = cost[:, :-1]
+        # or resume after a gap, from the cheapest slot before t - 1
+        best, best_slot = _running_min(cost)
+        resumed = np.full((layers, window), np.inf)
+        resumed[:, 2:] = best[:, :-2] + overhead_energy[i - 1] * values[2:] + overhead_penalty[i - 1]
+        resumed_from = np.zeros((layers, window), dtype=np.int32)
+        resumed_from[:, 2:] = best_slot[:, :-2]
+        if max_interruptions is not None:
+            # with a cap, a gap moves to the next layer
+            resumed[1:] = resumed[:-1].copy()
+            resumed[0] = np.inf
+            resumed_from[1:] = resumed_from[:-1].copy()
+
+        jump = resumed < contiguous
+        previous[i] = np.where(jump, resumed_from, slots - 1)
+        cost = np.where(jump, resumed, contiguous) + weights[i] * values
+        cost[:, :i] = np.inf
+        cost[:, window - n + i + 1:] = np.inf
+
+    layer, slot = np.unravel_index(np.argmin(cost), cost.shape)
+    if not np.isfinite(cost[layer, slot]):
+        raise ValueError("No schedule fits the carbon intensity data of the window")
+
+    # walk the choices back from the last interval
+    schedule = np.empty(n, dtype=np.int64)
+    schedule[n - 1] = slot
+    for i in range(n - 1, 0, -1):
+        slot_before = int(previous[i, layer, slot])
+        if max_interruptions is not None and slot_before != slot - 1:
+            layer -= 1
+        slot = slot_before
+        schedule[i - 1] = slot
+
+    gaps = np.flatnonzero(np.diff(schedule) > 1)
+    overhead = float(np.asarray(overhead_ms, dtype=np.float64)[gaps].sum())
+    operational = float(weights @ values[schedule] + overhead_energy[gaps] @ values[schedule[gaps + 1]])
+    return InterruptSchedule(
+        slots=schedule,
+        operational_emissions=operational,
+        overhead_embodied_emissions=float(overhead_penalty[gaps].sum()),
+        overhead_ms=overhead,
+        interruptions=len(gaps)
+    )
+
+##################################
+# MARK: Private functions
+##################################
+
+def _running_min(cost: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Running minimum along the last axis and the slot that attains it.
+
+    :param cost: Costs, shape (layers, window).
+    :return: Tuple of the running minimum and its (latest) arg-minimum, both shaped like cost.
+    """
+    best = np.minimum.accumulate(cost, axis=1)
+    slots = np.broadcast_to(np.arange(cost.shape[1], dtype=np.int32), cost.shape)
+    best_slot = np.maximum.accumulate(np.where(cost == best, slots, 0), axis=1)
+    return best, best_slot
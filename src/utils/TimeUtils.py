@@ -2,19 +2,22 @@
 Module: TimeUtils
 This module provides functions for time conversion and manipulation used in the 
 carbon footprint calculations. It includes utilities to convert timestamps and 
-extract tasks over specified time intervals.
+extract tasks over specified time intervals, and to shift an extracted trace in
+time without writing and re-parsing a shifted trace file.
 """
 
 import datetime as time
-import copy
 import logging
-from typing import List
+from typing import List, Union
 
 from src.models.TaskExtractionResult import TaskExtractionResult
 from src.models.IchnosTrace import IchnosTrace
+from src.models.ClippedTask import ClippedTask
 from src.models.TasksByTimeResult import TasksByTimeResult
+from src.models.TraceTable import TraceRow
 from src.Constants import FILE, DAY, MONTH, YEAR, HOUR, MINS
 from datetime import datetime
+import numpy as np
 
 # TODO: timezone conversion for non-utc times
 def to_timestamp(ms: float) -> time.datetime:
@@ -54,49 +57,9 @@ def get_tasks_by_hour_with_overhead(start_hour: int, end_hour: int, tasks: List[
     :param tasks: List of task objects.
     :return: A TasksByTimeResult object containing tasks grouped by hour and overheads.
     """
-    tasks_by_hour = {}
-    overheads = []
-    runtimes = []
-
     step = 60 * 60 * 1000  # 60 minutes in ms
-    i = start_hour - step  # start an hour before to be safe
-
-    while i <= end_hour:
-        data = []
-        hour_overhead = 0
-
-        for task in tasks:
-            start = int(task.start)
-            complete = int(task.end)
-            if start >= i and complete <= i + step:
-                data.append(task)
-                runtimes.append(complete - start)
-            elif complete > i and complete < i + step and start < i:
-                partial_task = copy.deepcopy(task)
-                partial_task.start = i
-                # emulate realtime like legacy
-                partial_task.end = complete
-                data.append(partial_task)
-                runtimes.append(complete - i)
-            elif start > i and start < i + step and complete > i + step:
-                partial_task = copy.deepcopy(task)
-                partial_task.end = i + step
-                data.append(partial_task)
-                if (i + step - start) > hour_overhead:
-                    hour_overhead = i + step - start
-                runtimes.append(i + step - start)
-            elif start < i and complete > i + step:
-                partial_task = copy.deepcopy(task)
-                partial_task.start = i
-                partial_task.end = i + step
-                data.append(partial_task)
-                runtimes.append(step)
-
-        tasks_by_hour[i] = data
-        overheads.append(hour_overhead)
-        i += step
-
-    return TasksByTimeResult(tasks_by_time=tasks_by_hour, overheads=overheads)
+    # start an hour before to be safe
+    return _bucket_tasks_with_overhead(start_hour - step, end_hour, step, tasks)
 
 def get_tasks_by_interval_with_overhead(start_interval: int, end_interval: int, tasks: List[IchnosTrace], interval: int) -> TasksByTimeResult:
     """
@@ -108,49 +71,8 @@ def get_tasks_by_interval_with_overhead(start_interval: int, end_interval: int,
     :param interval: Interval in minutes.
     :return: A TasksByTimeResult object containing tasks grouped by interval and overheads.
     """
-    tasks_by_hour = {}
-    overheads = []
-    runtimes = []
-
     step = interval * 60 * 1000  # interval minutes in ms
-    i = start_interval - step
-    end_interval = end_interval + step
-
-    while i <= end_interval:
-        data = []
-        hour_overhead = 0
-
-        for task in tasks:
-            start = int(task.start)
-            complete = int(task.end)
-            if start >= i and complete <= i + step:
-                data.append(task)
-                runtimes.append(complete - start)
-            elif complete > i and complete < i + step and start < i:
-                partial_task = copy.deepcopy(task)
-                partial_task.start = i
-                partial_task.end = complete
-                data.append(partial_task)
-                runtimes.append(complete - i)
-            elif start > i and start < i + step and complete > i + step:
-                partial_task = copy.deepcopy(task)
-                partial_task.end = i + step
-                data.append(partial_task)
-                if (i + step - start) > hour_overhead:
-                    hour_overhead = i + step - start
-                runtimes.append(i + step - start)
-            elif start < i and complete > i + step:
-                partial_task = copy.deepcopy(task)
-                partial_task.start = i
-                partial_task.end = i + step
-                data.append(partial_task)
-                runtimes.append(step)
-
-        tasks_by_hour[i] = data
-        overheads.append(hour_overhead)
-        i += step
-
-    return TasksByTimeResult(tasks_by_time=tasks_by_hour, overheads=overheads)
+    return _bucket_tasks_with_overhead(start_interval - step, end_interval + step, step, tasks)
 
 
 def to_closest_interval_ms(original: float, interval: int) -> int:
@@ -213,6 +135,53 @@ def extract_tasks_by_interval(filename: str, interval: int) -> TaskExtractionRes
         trace_records = []
     return get_tasks_by_interval(trace_records, interval)
 
+def shift_tasks_by_interval(extraction: TaskExtractionResult, offset: int, interval: int) -> TaskExtractionResult:
+    """
+    Shift an extracted trace in time by offset ms, as if the trace file had been shifted and re-extracted.
+
+    Every task is represented by a ClippedTask view over its original record with
+    the start and end moved by offset, so no record is copied. When the offset is a
+    whole number of intervals (and the interval divides an hour, so buckets stay
+    aligned) every task falls into the same buckets as before, so the grouping of
+    the extraction is reused with its buckets and pieces moved by offset. Otherwise
+    the shifted tasks are bucketed again.
+
+    :param extraction: Result of get_tasks_by_interval / extract_tasks_by_interval with the same interval.
+    :param offset: Shift in ms (negative to shift backwards).
+    :param interval: Interval in minutes.
+    :return: A TaskExtractionResult over the shifted tasks.
+    """
+    tasks = extraction.all_tasks
+    shifted = [
+        ClippedTask(task.task if isinstance(task, ClippedTask) else task, index, int(task.start) + offset, int(task.end) + offset)
+        for index, task in enumerate(tasks)
+    ]
+    step = interval * 60 * 1000
+    if offset % step or 60 % interval or not shifted:
+        return get_tasks_by_interval(shifted, interval)
+
+    # whole tasks in a bucket are the task objects (or TraceRow views) themselves,
+    # clipped pieces are ClippedTask views referring to them by index
+    positions = {id(task): index for index, task in enumerate(tasks)} if isinstance(tasks, list) else {}
+    tasks_by_interval = {}
+    for bucket, bucket_tasks in extraction.tasks_by_interval.items():
+        shifted_tasks: List[ClippedTask] = []
+        for task in bucket_tasks:
+            index = task.index if isinstance(task, TraceRow) else positions.get(id(task))
+            if index is not None:
+                shifted_tasks.append(shifted[index])
+            else:
+                shifted_tasks.append(ClippedTask(shifted[task.index].task, task.index, task.start + offset, task.end + offset))
+        tasks_by_interval[bucket + offset] = shifted_tasks
+
+    return TaskExtractionResult(
+        tasks_by_interval=tasks_by_interval,
+        all_tasks=shifted,
+        overhead_intervals=list(extraction.overhead_intervals),
+        workflow_start=extraction.workflow_start + offset,
+        workflow_end=extraction.workflow_end + offset
+    )
+
 def get_intervals(arr: List[int]) -> List[int]:
     """
     Identify discontinuities in a list of interval timestamps to detect overhead periods.
@@ -220,14 +189,57 @@ def get_intervals(arr: List[int]) -> List[int]:
     :param arr: List of consecutive hour timestamps.
     :return: List of indices where discontinuities (gaps) occur.
     """
-    intervals = []
-    prev = arr[0]
-    i = 1
-    
-    while i < len(arr):
-        if not (prev + 1 == arr[i]):
-            intervals.append(i - 1)
-        prev = arr[i]
-        i += 1
-    
-    return intervals
+    return np.flatnonzero(np.diff(np.asarray(arr)) != 1).tolist()
+
+
+##################################
+# MARK: Private functions
+##################################
+
+def _bucket_tasks_with_overhead(first_bucket: int, last_bucket: int, step: int, tasks: List[IchnosTrace]) -> TasksByTimeResult:
+    """
+    Sweep the tasks once and assign each of them to the buckets it overlaps.
+
+    Buckets start at first_bucket and advance by step while they start at or before
+    last_bucket. Rather than testing every task against every bucket, the range of
+    candidate buckets is derived from the task's start and end, so each task is only
+    visited for the buckets it can actually fall into. Within those buckets the
+    classification (whole, clipped at the start, clipped at the end, spanning) is
+    identical to the original per-bucket scan, including its boundary behaviour.
+    Tasks that are cut at a bucket boundary are represented by ClippedTask views
+    instead of copies of the record.
+
+    :param first_bucket: Start of the first bucket in ms.
+    :param last_bucket: Start of the last bucket in ms (inclusive).
+    :param step: Bucket width in ms.
+    :param tasks: List of task objects.
+    :return: A TasksByTimeResult object containing tasks grouped by bucket and overheads.
+    """
+    n_buckets = max(0, (last_bucket - first_bucket) // step + 1)
+    buckets: List[List[Union[IchnosTrace, ClippedTask]]] = [[] for _ in range(n_buckets)]
+    overheads: List[int] = [0] * n_buckets
+
+    for index, task in enumerate(tasks):
+        start = int(task.start)
+        complete = int(task.end)
+        # every bucket the task may be classified into starts within [lo - step, hi]
+        lo = min(start, complete)
+        hi = max(start, complete)
+        k_first = max(0, -((first_bucket + step - lo) // step))
+        k_last = min(n_buckets - 1, (hi - first_bucket) // step)
+
+        for k in range(k_first, k_last + 1):
+            i = first_bucket + k * step
+            if start >= i and complete <= i + step:
+                buckets[k].append(task)
+            elif complete > i and complete < i + step and start < i:
+                buckets[k].append(ClippedTask(task, index, i, complete))
+            elif start > i and start < i + step and complete > i + step:
+                buckets[k].append(ClippedTask(task, index, start, i + step))
+                if (i + step - start) > overheads[k]:
+                    overheads[k] = i + step - start
+            elif start < i and complete > i + step:
+                buckets[k].append(ClippedTask(task, index, i, i + step))
+
+    tasks_by_time = {first_bucket + k * step: buckets[k] for k in range(n_buckets)}
+    return TasksByTimeResult(tasks_by_time=tasks_by_time, overheads=overheads)
@@ -0,0 +1,198 @@
+"""
+Module: TraceCache
+This module keeps a binary cache of parsed IchnosTrace CSV files next to the
+trace files themselves, so repeated runs over the same trace skip CSV parsing.
+
+For a trace `data/ichnos_traces/<name>.csv` the cache lives in
+`data/ichnos_traces/.cache/<name>.csv/` and holds:
+  - one `.npy` file per numeric column (memory-mapped on load)
+  - one `<column>_codes.npy` file per dictionary-encoded string column
+  - `strings.json` with the task ids and the string dictionaries
+  - `meta.json` with the source size, mtime and content hash
+
+A cache entry is used as long as the source size and mtime are unchanged. If
+they differ but the content hash still matches (e.g. the file was touched or
+copied) the metadata is refreshed; otherwise the entry is rebuilt.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from typing import Optional
+
+import numpy as np
+
+from src.models.TraceTable import EncodedStrings, TraceTable
+
+CACHE_DIR_NAME = ".cache"
+CACHE_VERSION = 1
+NUMERIC_COLUMNS = ["start", "end", "cpu_count", "avg_cpu_usage", "memory"]
+ENCODED_COLUMNS = ["name", "cpu_model", "hostname", "rapl_timeseries", "cpu_usage_timeseries"]
+META_FILE = "meta.json"
+STRINGS_FILE = "strings.json"
+
+
+def load_trace_table(filepath: str, use_cache: bool = True) -> TraceTable:
+    """
+    Load an IchnosTrace CSV as a TraceTable, going through the binary cache.
+
+    :param filepath: Path to the IchnosTrace CSV.
+    :param use_cache: Set to False to always parse the CSV and leave the cache untouched.
+    :return: The parsed TraceTable.
+    """
+    if not use_cache:
+        return TraceTable.from_csv(filepath)
+
+    cache_dir = get_cache_dir(filepath)
+    stat = os.stat(filepath)
+    meta = _read_meta(cache_dir)
+
+    if meta is not None and meta.get("size") == stat.st_size:
+        fresh = meta.get("mtime_ns") == stat.st_mtime_ns
+        if not fresh and meta.get("hash") == file_hash(filepath):
+            fresh = True
+            meta["mtime_ns"] = stat.st_mtime_ns
+            try:
+                _write_meta(cache_dir, meta)
+            except OSError as e:
+                # the content still matches, so the entry is used as it is
+                logging.warning("Could not update trace cache metadata for %s: %s", filepath, e)
+        if fresh:
+            try:
+                return _read_table(cache_dir, meta.get("rows"))
+            except (OSError, ValueError, KeyError, EOFError) as e:
+                logging.warning("Trace cache for %s is unreadable, rebuilding it: %s", filepath, e)
+
+    table = TraceTable.from_csv(filepath)
+    try:
+        write_trace_cache(filepath, table)
+    except OSError as e:
+        logging.warning("Could not write trace cache for %s: %s", filepath, e)
+    return table
+
+
+def write_trace_cache(filepath: str, table: TraceTable) -> str:
+    """
+    Write the cache entry of a trace file, replacing any existing entry.
+
+    :param filepath: Path to the IchnosTrace CSV the table was parsed from.
+    :param table: The parsed TraceTable.
+    :return: Path of the cache directory.
+    """
+    cache_dir = get_cache_dir(filepath)
+    stat = os.stat(filepath)
+    parent = os.path.dirname(cache_dir)
+    os.makedirs(parent, exist_ok=True)
+
+    tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=parent)
+    try:
+        for column in NUMERIC_COLUMNS:
+            np.save(os.path.join(tmp_dir, f"{column}.npy"), getattr(table, column))
+        strings = {"id": table.id}
+        for column in ENCODED_COLUMNS:
+            encoded: EncodedStrings = getattr(table, column)
+            np.save(os.path.join(tmp_dir, f"{column}_codes.npy"), encoded.codes)
+            strings[column] = encoded.values
+        with open(os.path.join(tmp_dir, STRINGS_FILE), "w") as f:
+            json.dump(strings, f)
+        _write_meta(tmp_dir, {
+            "version": CACHE_VERSION,
+            "source": os.path.abspath(filepath),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash": file_hash(filepath),
+            "rows": len(table)
+        })
+        if os.path.isdir(cache_dir):
+            shutil.rmtree(cache_dir)
+        os.replace(tmp_dir, cache_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return cache_dir
+
+
+def get_cache_dir(filepath: str) -> str:
+    """
+    Return the cache directory used for a trace file.
+
+    :param filepath: Path to the IchnosTrace CSV.
+    :return: Path of its cache directory.
+    """
+    folder, name = os.path.split(os.path.abspath(filepath))
+    return os.path.join(folder, CACHE_DIR_NAME, name)
+
+
+def file_hash(filepath: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Compute the SHA-256 content hash of a file.
+
+    :param filepath: Path to the file.
+    :param chunk_size: Read size in bytes.
+    :return: Hex digest of the file content.
+    """
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+##################################
+# MARK: Private functions
+##################################
+
+def _read_meta(cache_dir: str) -> Optional[dict]:
+    """
+    Read the metadata of a cache entry.
+
+    :param cache_dir: Cache directory of the trace.
+    :return: The metadata, or None if the entry is missing, unreadable or of another version.
+    """
+    try:
+        with open(os.path.join(cache_dir, META_FILE)) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get("version") != CACHE_VERSION:
+        return None
+    return meta
+
+
+def _write_meta(cache_dir: str, meta: dict) -> None:
+    """
+    Write the metadata of a cache entry.
+
+    :param cache_dir: Cache directory of the trace.
+    :param meta: Metadata to write.
+    """
+    with open(os.path.join(cache_dir, META_FILE), "w") as f:
+        json.dump(meta, f)
+
+
+def _read_table(cache_dir: str, rows: Optional[int] = None) -> TraceTable:
+    """
+    Load a TraceTable from a cache entry, memory-mapping the column files.
+
+    :param cache_dir: Cache directory of the trace.
+    :param rows: Expected number of rows; a ValueError is raised if a column has another length.
+    :return: The cached TraceTable.
+    """
+    with open(os.path.join(cache_dir, STRINGS_FILE)) as f:
+        strings = json.load(f)
+    columns = {
+        column: np.load(os.path.join(cache_dir, f"{column}.npy"), mmap_mode="r")
+        for column in NUMERIC_COLUMNS
+    }
+    for column in ENCODED_COLUMNS:
+        columns[column] = EncodedStrings(
+            codes=np.load(os.path.join(cache_dir, f"{column}_codes.npy"), mmap_mode="r"),
+            values=strings[column]
+        )
+    if rows is not None:
+        lengths = [len(strings["id"])] + [len(columns[column]) for column in NUMERIC_COLUMNS] + [len(columns[column].codes) for column in ENCODED_COLUMNS]
+        if any(length != rows for length in lengths):
+            raise ValueError(f"Expected {rows} rows in every column, found {sorted(set(lengths))}")
+    return TraceTable(id=strings["id"], **columns)
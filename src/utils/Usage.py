@@ -11,7 +11,7 @@ def print_usage_exit_TemporalInterrupt() -> None:
     """
     Print usage information for the TemporalInterrupt script and exit.
     """
-    usage = "$ python -m src.scripts.TemporalInterrupt <trace> <ci-file-name> <power_model> <? interval=60> <? pue=1.0> <? memory-coeff=0.392>"
+    usage = "$ python -m src.scripts.TemporalInterrupt <trace> <ci-file-name> <power_model> <? interval=60> <? pue=1.0> <? memory-coeff=0.392> <? --contiguous | --optimal | --regions ci-file-a,ci-file-b> <? --max-interruptions n> <? --workers n> <? --flexibility 6,12,24,48,96>"
     example = "$ python -m src.scripts.TemporalInterrupt nanoseq ci gpg14_performance_minmax 60 1.0 0.392"
     logging.error(usage)
     logging.error(example)
@@ -57,7 +57,7 @@ def print_usage_exit_Explorer() -> None:
     """
     Print usage information for the Explorer script and exit.
     """
-    usage = "[Explorer] Expected Usage: py explorer.py <trace-file> <ci-file> <shift> <model-name> <interval> <pue> <memory-coefficient>"
+    usage = "[Explorer] Expected Usage: py explorer.py <trace-file> <ci-file> <shift> <model-name> <interval> <pue> <memory-coefficient> <memory> <nodes> <? --both-directions> <? --workers n>"
     example = "[Explorer] Example Use: py explorer.py test ci-20240218 6 gpg14_performance 60 1.0 0.392"
     logging.error(usage)
     logging.error(example)
@@ -0,0 +1,152 @@
+"""Regression tests for the single-sweep task bucketing in TimeUtils.
+
+_bucket_tasks_with_overhead must put every task into the same buckets, with the
+same clipped start/end and the same per-bucket overhead, as the per-bucket scan
+it replaced. That scan is kept here verbatim (as _baseline_buckets) as the
+reference.
+"""
+
+import copy
+import random
+from typing import Dict, List, Tuple
+
+import pytest
+
+from src.models.ClippedTask import ClippedTask
+from src.models.IchnosTrace import IchnosTrace
+from src.utils.TimeUtils import get_tasks_by_hour_with_overhead, get_tasks_by_interval_with_overhead
+
+MINUTE = 60 * 1000
+T0 = 1_700_000_000_000 - 1_700_000_000_000 % (60 * MINUTE)  # an hour boundary
+
+
+def _baseline_buckets(start_interval: int, end_interval: int, tasks: List[IchnosTrace], step: int) -> Tuple[Dict[int, list], List[int]]:
+    """The per-bucket scan of get_tasks_by_interval_with_overhead before the single sweep."""
+    tasks_by_hour = {}
+    overheads = []
+
+    i = start_interval - step
+    end_interval = end_interval + step
+
+    while i <= end_interval:
+        data = []
+        hour_overhead = 0
+
+        for task in tasks:
+            start = int(task.start)
+            complete = int(task.end)
+            if start >= i and complete <= i + step:
+                data.append(task)
+            elif complete > i and complete < i + step and start < i:
+                partial_task = copy.deepcopy(task)
+                partial_task.start = i
+                partial_task.end = complete
+                data.append(partial_task)
+            elif start > i and start < i + step and complete > i + step:
+                partial_task = copy.deepcopy(task)
+                partial_task.end = i + step
+                data.append(partial_task)
+                if (i + step - start) > hour_overhead:
+                    hour_overhead = i + step - start
+            elif start < i and complete > i + step:
+                partial_task = copy.deepcopy(task)
+                partial_task.start = i
+                partial_task.end = i + step
+                data.append(partial_task)
+
+        tasks_by_hour[i] = data
+        overheads.append(hour_overhead)
+        i += step
+
+    return tasks_by_hour, overheads
+
+
+def _task(task_id: int, start: int, end: int) -> IchnosTrace:
+    return IchnosTrace(str(task_id), f"task-{task_id}", start, end, 1, 50.0, "cpu", 1.0, "host")
+
+
+def _membership(tasks_by_time: Dict[int, list]) -> Dict[int, List[Tuple[str, int, int]]]:
+    """Per bucket: the task id and clipped start/end of every piece, in order."""
+    return {
+        bucket: [(piece.id, int(piece.start), int(piece.end)) for piece in pieces]
+        for bucket, pieces in tasks_by_time.items()
+    }
+
+
+def _assert_same_buckets(tasks: List[IchnosTrace], interval: int) -> None:
+    step = interval * MINUTE
+    first = min(int(task.start) for task in tasks) // step * step
+    last = max(int(task.end) for task in tasks) // step * step
+
+    expected, expected_overheads = _baseline_buckets(first, last, tasks, step)
+    result = get_tasks_by_interval_with_overhead(first, last, tasks, interval)
+
+    assert list(result.tasks_by_time) == list(expected)
+    assert _membership(result.tasks_by_time) == _membership(expected)
+    assert result.overheads == expected_overheads
+    for pieces in result.tasks_by_time.values():
+        for piece in pieces:
+            # whole tasks are the original records, cut ones are views of them
+            assert isinstance(piece, ClippedTask) or piece in tasks
+
+
+@pytest.mark.parametrize("interval", [1, 5, 30, 60])
+@pytest.mark.parametrize("seed", range(10))
+def test_random_traces_match_baseline(seed: int, interval: int):
+    rng = random.Random(seed)
+    tasks = []
+    for task_id in range(60):
+        start = T0 + rng.randrange(0, 6 * 60 * MINUTE)
+        tasks.append(_task(task_id, start, start + rng.choice([0, rng.randrange(1, 10 * MINUTE), rng.randrange(1, 300 * MINUTE)])))
+    _assert_same_buckets(tasks, interval)
+
+
+def test_tasks_on_bucket_edges_match_baseline():
+    step = 30 * MINUTE
+    tasks = [
+        _task(0, T0, T0 + step),  # exactly one bucket
+        _task(1, T0 + step, T0 + 2 * step + 1),  # starts on an edge, ends just past the next
+        _task(2, T0 + step - 1, T0 + step),  # ends on an edge
+        _task(3, T0 + 2 * step, T0 + 4 * step),  # edge to edge over two buckets
+        _task(4, T0 + 1, T0 + 3 * step - 1),  # just inside the edges
+    ]
+    _assert_same_buckets(tasks, 30)
+
+
+def test_zero_length_tasks_match_baseline():
+    step = 30 * MINUTE
+    tasks = [
+        _task(0, T0, T0),  # on a bucket edge
+        _task(1, T0 + step // 2, T0 + step // 2),  # inside a bucket
+        _task(2, T0 + step, T0 + step),
+        _task(3, T0, T0 + 2 * step),
+    ]
+    _assert_same_buckets(tasks, 30)
+
+
+def test_tasks_spanning_many_buckets_match_baseline():
+    tasks = [
+        _task(0, T0 + 7 * MINUTE, T0 + 50 * 60 * MINUTE + 3 * MINUTE),
+        _task(1, T0, T0 + 24 * 60 * MINUTE),
+        _task(2, T0 + 59 * MINUTE, T0 + 61 * MINUTE),
+    ]
+    for interval in (1, 15, 60):
+        _assert_same_buckets(tasks, interval)
+
+
+def test_hourly_bucketing_matches_baseline():
+    rng = random.Random(42)
+    tasks = []
+    for task_id in range(40):
+        start = T0 + rng.randrange(0, 12 * 60 * MINUTE)
+        tasks.append(_task(task_id, start, start + rng.randrange(0, 180 * MINUTE)))
+    step = 60 * MINUTE
+    first = min(task.start for task in tasks) // step * step
+    last = max(task.end for task in tasks) // step * step
+
+    # the hourly variant starts an hour early but does not add a trailing bucket
+    expected, expected_overheads = _baseline_buckets(first, last - step, tasks, step)
+    result = get_tasks_by_hour_with_overhead(first, last, tasks)
+
+    assert _membership(result.tasks_by_time) == _membership(expected)
+    assert result.overheads == expected_overheads